@@ -0,0 +1,101 @@
+"""
+Measure the throughput and tail latency of ``get_many`` under injected faults.
+
+Pages come from a synthetic in-process store, so no network or credentials
+are needed:
+
+    python benchmarks/faults.py --pages 200 --reset-rate 0.01 --server-error-rate 0.01
+"""
+
+import argparse
+import json
+import statistics
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from bigc import BigCommerceAPI
+from bigc.exceptions import BigCommerceException
+from bigc.faults import FaultInjectionTransport
+
+PAGE_SIZE = 250
+
+
+class SyntheticStore(BaseAdapter):
+    """Serves ``num_pages`` full pages of v2 orders"""
+
+    def __init__(self, num_pages: int):
+        super().__init__()
+        self.num_pages = num_pages
+        self.page = json.dumps([{'id': i} for i in range(PAGE_SIZE)]).encode()
+
+    def send(self, request, **kwargs):
+        page = int(parse_qs(urlsplit(request.url).query)['page'][0])
+        response = requests.Response()
+        response.status_code = 200 if page <= self.num_pages else 204
+        response._content = self.page if page <= self.num_pages else b''
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.02, help='median seconds')
+    parser.add_argument('--reset-rate', type=float, default=0.01)
+    parser.add_argument('--server-error-rate', type=float, default=0.01)
+    parser.add_argument('--server-error-burst', type=int, default=3)
+    parser.add_argument('--slow-body-rate', type=float, default=0.005)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    transport = FaultInjectionTransport(
+        SyntheticStore(args.pages),
+        latency=lambda r: r.lognormvariate(0, 0.5) * args.latency,
+        reset_rate=args.reset_rate,
+        server_error_rate=args.server_error_rate,
+        server_error_burst=args.server_error_burst,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_delay=args.timeout * 2,
+        seed=args.seed,
+    )
+
+    page_times = []
+    num_records = 0
+    with BigCommerceAPI('store_hash', 'token', transport=transport) as bigcommerce:
+        started_at = last_at = time.perf_counter()
+        try:
+            for num_records, _ in enumerate(
+                bigcommerce.api_v2.get_many(
+                    '/orders', timeout=args.timeout, retries=args.retries
+                ),
+                start=1,
+            ):
+                if num_records % PAGE_SIZE == 0:
+                    now = time.perf_counter()
+                    page_times.append(now - last_at)
+                    last_at = now
+        except BigCommerceException as exc:
+            print(f'Failed after {num_records} records: {exc!r}')
+        elapsed = time.perf_counter() - started_at
+
+    page_times.sort()
+    print(f'{num_records} records in {elapsed:.2f} s, {num_records / elapsed:,.0f}/s')
+    if page_times:
+        p99 = page_times[min(len(page_times) - 1, int(len(page_times) * 0.99))]
+        print(
+            f'page latency: median {statistics.median(page_times) * 1000:.1f} ms,'
+            f' p99 {p99 * 1000:.1f} ms, max {page_times[-1] * 1000:.1f} ms'
+        )
+    print('faults injected:', dict(transport.faults))
+
+
+if __name__ == '__main__':
+    main()
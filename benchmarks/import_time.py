@@ -0,0 +1,78 @@
+"""
+Measure the cold-start cost of bigc: importing it, creating a client, and
+making a first call.
+
+Each measurement runs in a fresh interpreter, so nothing is already imported.
+The call is answered by a stub instead of the network, so only the client's
+own overhead is measured. Run it on two revisions to compare them:
+
+    python benchmarks/import_time.py --runs 30
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STAGES = {
+    'import': """
+from bigc import BigCommerceAPI
+""",
+    'import + client': """
+from bigc import BigCommerceAPI
+api = BigCommerceAPI('store_hash', 'access_token')
+api.products_v3
+""",
+    'import + client + call': """
+from types import SimpleNamespace
+
+from bigc import BigCommerceAPI
+api = BigCommerceAPI('store_hash', 'access_token')
+
+import requests
+response = SimpleNamespace(
+    ok=True, text='{}', content=b'{}', headers={}, json=lambda: {'data': {'id': 1}}
+)
+requests.Session.request = lambda *args, **kwargs: response
+
+api.products_v3.get(1)
+""",
+}
+
+TEMPLATE = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code: str, runs: int) -> list[float]:
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, '-c', TEMPLATE.format(code=code)],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    for name, code in STAGES.items():
+        timings = measure(code, args.runs)
+        print(
+            f'{name:<24} median {statistics.median(timings) * 1000:7.1f} ms'
+            f'   min {min(timings) * 1000:7.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
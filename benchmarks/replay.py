@@ -0,0 +1,64 @@
+"""
+Benchmark ``get_many`` offline by replaying a recorded cassette.
+
+Record a cassette once against a real store, then replay it as often as
+needed, at the recorded speed or faster:
+
+    python benchmarks/replay.py record cassette.jsonl.gz /orders --store-hash abc123 --access-token ...
+    python benchmarks/replay.py replay cassette.jsonl.gz /orders --speed 10
+"""
+
+import argparse
+import statistics
+import time
+
+from bigc import BigCommerceAPI
+from bigc.cassettes import RecordingTransport, ReplayTransport
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('mode', choices=('record', 'replay'))
+    parser.add_argument('cassette')
+    parser.add_argument('path', help='e.g. /orders or /catalog/products')
+    parser.add_argument('--version', choices=('v2', 'v3'), default='v2')
+    parser.add_argument('--store-hash', default='store_hash')
+    parser.add_argument('--access-token', default='access_token')
+    parser.add_argument(
+        '--speed', type=float, default=None, help='default: as fast as possible'
+    )
+    args = parser.parse_args()
+
+    if args.mode == 'record':
+        transport = RecordingTransport(args.cassette)
+    else:
+        transport = ReplayTransport(args.cassette, speed=args.speed)
+
+    with BigCommerceAPI(
+        args.store_hash, args.access_token, transport=transport
+    ) as bigcommerce:
+        client = bigcommerce.api_v2 if args.version == 'v2' else bigcommerce.api_v3
+
+        latencies = []
+        num_records = 0
+        started_at = last_at = time.perf_counter()
+        for _ in client.get_many(args.path):
+            num_records += 1
+            now = time.perf_counter()
+            latencies.append(now - last_at)
+            last_at = now
+        elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    print(f'{num_records} records in {elapsed:.3f} s')
+    print(f'{num_records / elapsed:,.0f} records/s')
+    if latencies:
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f'time between records: median {statistics.median(latencies) * 1e6:.1f} µs,'
+            f' p99 {p99 * 1e6:.1f} µs, max {latencies[-1] * 1000:.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
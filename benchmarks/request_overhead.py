@@ -0,0 +1,75 @@
+"""
+Measure the client's own overhead per request, and per page of ``get_many``.
+
+Requests are answered by a stub instead of the network, so the timings are
+only the time spent preparing requests and handling responses:
+
+    python benchmarks/request_overhead.py --requests 20000
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+
+import requests
+
+from bigc import BigCommerceAPI
+
+PAGE_SIZE = 250
+
+
+def stub_transport(num_pages: int) -> None:
+    """Answer every request instantly, with pages of v3 products"""
+    single = SimpleNamespace(
+        ok=True,
+        text='{}',
+        content=b'{}',
+        headers={},
+        json=lambda: {'data': {'id': 1}},
+    )
+    page = {
+        'data': [{'id': i} for i in range(PAGE_SIZE)],
+        'meta': {'pagination': {'total_pages': num_pages}},
+    }
+    paged = SimpleNamespace(
+        ok=True, text='{}', content=b'{}', headers={}, json=lambda: page
+    )
+
+    def request(session, method, url, *, params=None, **kwargs):
+        return paged if params and 'limit' in params else single
+
+    requests.Session.request = request
+
+
+def per_call(func, n: int) -> float:
+    """The best of several runs, in microseconds per call"""
+    return min(timeit.repeat(func, number=n, repeat=7)) / n * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=10_000)
+    args = parser.parse_args()
+
+    num_pages = 40
+    stub_transport(num_pages)
+    api = BigCommerceAPI('store_hash', 'access_token')
+
+    def get():
+        api.api_v3.get('/catalog/products/1', params={'include': ['variants']})
+
+    def get_many():
+        for _ in api.api_v3.get_many(
+            '/catalog/products', params={'is_visible': True, 'include': ['variants']}
+        ):
+            pass
+
+    print(f'request        {per_call(get, args.requests):8.2f} µs per call')
+    print(
+        f'get_many page  {per_call(get_many, args.requests // num_pages) / num_pages:8.2f}'
+        ' µs per page'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,17 @@
-from .api import BigCommerceAPI
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .api import BigCommerceAPI
+
+__all__ = ('BigCommerceAPI',)
+
+
+def __getattr__(name: str):
+    # Imported when first used, so that importing a submodule such as
+    # bigc.exceptions doesn't import the whole client
+    if name == 'BigCommerceAPI':
+        from .api import BigCommerceAPI
+
+        return BigCommerceAPI
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
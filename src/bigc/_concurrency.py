@@ -0,0 +1,47 @@
+"""
+Helpers shared by the bulk operation modules.
+"""
+
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from bigc.api_client import RateLimitStatus
+from bigc.deadlines import current_deadline
+from bigc.exceptions import DeadlineExceededError, TooManyRequestsError
+
+T = TypeVar('T')
+
+# Wait this long after a 429 that didn't say when the rate limit resets
+DEFAULT_RATE_LIMIT_WAIT = 1.0
+
+
+def call_within_rate_limit(
+    rate_limit: RateLimitStatus, func: Callable[[], T], *, max_attempts: int = 5
+) -> T:
+    """Call ``func``, waiting for the rate limit window to reset when it runs out
+
+    Requests rejected with a 429 weren't processed, so they're always safe to
+    repeat, regardless of method. Inside a ``deadline()`` block, waiting past
+    the deadline raises ``DeadlineExceededError`` instead.
+    """
+    attempt = 1
+    while True:
+        rate_limit.wait_for_headroom()
+
+        try:
+            return func()
+        except TooManyRequestsError as exc:
+            if attempt >= max_attempts:
+                raise
+
+            retry_after = exc.retry_after
+            if retry_after is None:
+                retry_after = rate_limit.time_until_reset or DEFAULT_RATE_LIMIT_WAIT
+
+            deadline = current_deadline()
+            if deadline is not None and deadline.remaining() < retry_after:
+                raise DeadlineExceededError() from exc
+
+            time.sleep(retry_after)
+            attempt += 1
@@ -0,0 +1,19 @@
+"""
+Helpers for finding records created by a failed request, so that it can be
+retried safely.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+# Allowance for differences between our clock and BigCommerce's (whose dates
+# are also truncated to the second)
+CLOCK_SKEW = timedelta(minutes=1)
+
+
+def first_attempt_cutoff() -> datetime:
+    """The earliest creation date of a record made by a request about to be sent
+
+    Call this just before the first attempt, not when retrying, so that only
+    records the request could have created are considered.
+    """
+    return datetime.now(timezone.utc) - CLOCK_SKEW
@@ -1,10 +1,89 @@
-import threading
+from __future__ import annotations
 
-from bigc.api_client import BigCommerceV2APIClient, BigCommerceV3APIClient
-from bigc.resources import *
+import functools
+import importlib
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
+
+from bigc.api_client import (
+    BigCommerceV2APIClient,
+    BigCommerceV3APIClient,
+    HedgePolicy,
+    RateLimitStatus,
+)
+from bigc.pool import SessionPool
+from bigc.priority import RequestScheduler
+
+if TYPE_CHECKING:
+    from requests.adapters import BaseAdapter
+
+    from bigc.resources import *
+
+R = TypeVar('R')
+
+
+class _Resource(Generic[R]):
+    """A resource that's only imported and created when first used"""
+
+    def __init__(self, class_name: str):
+        self.class_name = class_name
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        # Named after its module, e.g. ``orders_v2``
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> _Resource[R]: ...
+
+    @overload
+    def __get__(self, instance: Any, owner: type | None = None) -> R: ...
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+
+        module = importlib.import_module(f'bigc.resources.{self.name}')
+        api = instance.api_v2 if self.name.endswith('_v2') else instance.api_v3
+        resource = getattr(module, self.class_name)(api)
+
+        # Found before the descriptor from now on. Threads racing here create
+        # separate but identical resources, which is harmless.
+        instance.__dict__[self.name] = resource
+        return resource
 
 
 class BigCommerceAPI:
+    carts_v3: _Resource[BigCommerceCartsV3API] = _Resource('BigCommerceCartsV3API')
+    categories_v3: _Resource[BigCommerceCategoriesV3API] = _Resource(
+        'BigCommerceCategoriesV3API'
+    )
+    checkouts_v3: _Resource[BigCommerceCheckoutsV3API] = _Resource(
+        'BigCommerceCheckoutsV3API'
+    )
+    currencies_v2: _Resource[BigCommerceCurrenciesV2API] = _Resource(
+        'BigCommerceCurrenciesV2API'
+    )
+    customer_groups_v2: _Resource[BigCommerceCustomerGroupsV2API] = _Resource(
+        'BigCommerceCustomerGroupsV2API'
+    )
+    customers_v3: _Resource[BigCommerceCustomersV3API] = _Resource(
+        'BigCommerceCustomersV3API'
+    )
+    orders_v2: _Resource[BigCommerceOrdersV2API] = _Resource('BigCommerceOrdersV2API')
+    orders_v3: _Resource[BigCommerceOrdersV3API] = _Resource('BigCommerceOrdersV3API')
+    pricing_v3: _Resource[BigCommercePricingV3API] = _Resource(
+        'BigCommercePricingV3API'
+    )
+    product_variants_v3: _Resource[BigCommerceProductVariantsV3API] = _Resource(
+        'BigCommerceProductVariantsV3API'
+    )
+    products_v3: _Resource[BigCommerceProductsV3API] = _Resource(
+        'BigCommerceProductsV3API'
+    )
+    webhooks_v3: _Resource[BigCommerceWebhooksV3API] = _Resource(
+        'BigCommerceWebhooksV3API'
+    )
+
     def __init__(
         self,
         store_hash: str,
@@ -12,45 +91,113 @@ class BigCommerceAPI:
         *,
         timeout: float | None = None,
         get_retries: int | None = None,
+        max_connections: int = 16,
+        pool_timeout: float | None = 10.0,
+        transport: BaseAdapter | None = None,
     ):
-        # Shared so that both API versions use the same pool within a thread
-        thread_local = threading.local()
+        """
+        :param max_connections: The most connections to the API open at once,
+            and so the most requests in progress at once.
+        :param pool_timeout: How long, in seconds, a request waits for a free
+            connection when all of them are busy, before failing with a
+            ``PoolTimeoutError``, which isn't retried. This is separate from
+            ``timeout``.
+        :param transport: A ``requests`` transport adapter to send requests
+            through instead of the network, such as a
+            ``bigc.cassettes.ReplayTransport``.
+        """
+        # Shared so that both API versions use the same connections
+        pool = SessionPool(
+            max_connections, acquire_timeout=pool_timeout, transport=transport
+        )
+        # Both API versions count against the same store-wide quota
+        rate_limit = RateLimitStatus()
+        # Hedges are budgeted across the whole store, too
+        hedge_policy = HedgePolicy()
+        # So that batch requests through either version make way for urgent ones
+        scheduler = RequestScheduler(rate_limit)
 
         api_v2 = BigCommerceV2APIClient(
             store_hash,
             access_token,
             timeout=timeout,
             get_retries=get_retries,
-            _thread_local=thread_local,
+            _pool=pool,
+            _rate_limit=rate_limit,
+            _hedge_policy=hedge_policy,
+            _scheduler=scheduler,
         )
         api_v3 = BigCommerceV3APIClient(
             store_hash,
             access_token,
             timeout=timeout,
             get_retries=get_retries,
-            _thread_local=thread_local,
+            _pool=pool,
+            _rate_limit=rate_limit,
+            _hedge_policy=hedge_policy,
+            _scheduler=scheduler,
         )
 
         self.api_v2 = api_v2
         self.api_v3 = api_v3
+        self.pool = pool
+        self.rate_limit = rate_limit
+        self.hedge_policy = hedge_policy
+        self.scheduler = scheduler
 
-        self.carts_v3: BigCommerceCartsV3API = BigCommerceCartsV3API(api_v3)
-        self.categories_v3: BigCommerceCategoriesV3API = BigCommerceCategoriesV3API(
-            api_v3
-        )
-        self.checkouts_v3: BigCommerceCheckoutsV3API = BigCommerceCheckoutsV3API(api_v3)
-        self.currencies_v2: BigCommerceCurrenciesV2API = BigCommerceCurrenciesV2API(
-            api_v2
-        )
-        self.customer_groups_v2: BigCommerceCustomerGroupsV2API = (
-            BigCommerceCustomerGroupsV2API(api_v2)
+    # typing.Self needs Python 3.11
+    def __enter__(self) -> BigCommerceAPI:  # noqa: PYI034
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def warmup(self, connections: int = 4, *, timeout: float | None = None) -> None:
+        """Open connections to the API ahead of time
+
+        Opening a connection takes a DNS lookup and a TLS handshake, which can
+        slow down the first requests, e.g. after a deploy. This opens (or
+        checks) ``connections`` pooled connections at once, with a lightweight
+        request through each, and raises if any of them fails.
+        """
+        self.pool.warmup(
+            functools.partial(self.api_v2.probe, path='/time', timeout=timeout),
+            connections,
+            timeout=timeout,
         )
-        self.customers_v3: BigCommerceCustomersV3API = BigCommerceCustomersV3API(api_v3)
-        self.orders_v2: BigCommerceOrdersV2API = BigCommerceOrdersV2API(api_v2)
-        self.orders_v3: BigCommerceOrdersV3API = BigCommerceOrdersV3API(api_v3)
-        self.pricing_v3: BigCommercePricingV3API = BigCommercePricingV3API(api_v3)
-        self.product_variants_v3: BigCommerceProductVariantsV3API = (
-            BigCommerceProductVariantsV3API(api_v3)
+
+    def start_keep_alive(self, interval: float = 30.0, *, timeout: float = 5.0) -> None:
+        """Keep idle connections open by checking them in the background
+
+        Each connection idle for ``interval`` seconds makes a request, which
+        counts against the rate limit, and is closed if it takes longer than
+        ``timeout`` seconds. Keep-alive stops when the instance is closed.
+        """
+        self.pool.start_keep_alive(
+            functools.partial(self.api_v2.probe, path='/time', timeout=timeout),
+            interval,
+            timeout=timeout,
         )
-        self.products_v3: BigCommerceProductsV3API = BigCommerceProductsV3API(api_v3)
-        self.webhooks_v3: BigCommerceWebhooksV3API = BigCommerceWebhooksV3API(api_v3)
+
+    def close(self) -> None:
+        """Close every connection to the API
+
+        Requests made after closing raise ``RuntimeError``.
+        """
+        self.pool.close()
+        self.hedge_policy.close()
+
+
+def __getattr__(name: str):
+    # The resources were importable from here before they were made lazy
+    import bigc.resources
+
+    if name in bigc.resources.__all__:
+        return getattr(bigc.resources, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,23 +1,326 @@
-import itertools
+from __future__ import annotations
+
+import functools
+import math
 import threading
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
-from typing import Any, NoReturn
-
-import requests
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple, NoReturn, TypeVar
 
+from bigc.deadlines import Deadline
 from bigc.exceptions import (
     BadGatewayError,
     BigCommerceException,
     BigCommerceNetworkError,
+    DeadlineExceededError,
     GatewayTimeoutError,
     InternalServerError,
+    PoolTimeoutError,
     ServiceUnavailableError,
 )
+from bigc.pool import SessionPool
+from bigc.priority import Priority, RequestScheduler
+
+# These are imported where they're used, as they're slow to import and
+# often not needed
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    import requests
 
 MAX_V2_PAGE_SIZE = 250
 MAX_V3_PAGE_SIZE = 250
 
+T = TypeVar('T')
+
+# Parameters that change from page to page within get_many
+_PAGINATION_PARAMS = ('limit', 'page', 'after')
+
+
+class AdaptivePageSize:
+    """A page size for ``get_many`` that adapts to how quickly pages arrive
+
+    Pass an instance as ``page_size``. Pages that are slower or larger than
+    the targets make the next page smaller, and full pages that are well
+    under both targets make it bigger. A page that times out is requested
+    again with half as many records, until ``minimum`` is reached.
+
+    For endpoints paginated by page number, the page size always divides the
+    number of records already read, so that no records are skipped or
+    repeated when it changes.
+    """
+
+    # Aim this far under the targets, so that normal variation doesn't cross them
+    SAFETY_FACTOR = 0.8
+
+    def __init__(
+        self,
+        *,
+        initial: int | None = None,
+        minimum: int = 10,
+        maximum: int = MAX_V3_PAGE_SIZE,
+        target_latency: float = 5.0,
+        max_page_bytes: int = 4_000_000,
+    ):
+        """
+        :param initial: The size of the first page, by default ``maximum``.
+        :param minimum: The smallest page size to use.
+        :param maximum: The largest page size to use.
+        :param target_latency: How long, in seconds, each page should take.
+        :param max_page_bytes: How large each page's response should be.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.max_page_bytes = max_page_bytes
+        self.page_size = self._clamp(maximum if initial is None else initial)
+        self._desired_size = float(self.page_size)
+
+    def page_size_at(self, offset: int | None) -> int:
+        """Choose the size of the next page
+
+        :param offset: The number of records already read, for endpoints
+            paginated by page number, or ``None`` for cursor pagination.
+        """
+        desired_size = self._clamp(int(self._desired_size))
+
+        if not offset:
+            self.page_size = desired_size
+            return self.page_size
+
+        # The current size always divides the offset, so this finds one
+        for size in range(desired_size, self.minimum - 1, -1):
+            if offset % size == 0:
+                self.page_size = size
+                break
+
+        return self.page_size
+
+    def record_page(self, latency: float, num_bytes: int, num_records: int) -> None:
+        """Adjust the next page's size after receiving a page"""
+        load = max(latency / self.target_latency, num_bytes / self.max_page_bytes)
+
+        if load > self.SAFETY_FACTOR:
+            self._desired_size = self.page_size * self.SAFETY_FACTOR / load
+        elif num_records >= self.page_size:
+            # Only full pages show whether a bigger page would be filled
+            growth = self.SAFETY_FACTOR / load if load else 2.0
+            self._desired_size = self.page_size * min(growth, 2.0)
+
+    def shrink(self) -> None:
+        """Halve the next page's size, after a page timed out"""
+        self._desired_size = self.page_size / 2
+
+    def _clamp(self, size: int) -> int:
+        return max(self.minimum, min(size, self.maximum))
+
+
+class RateLimitStatus:
+    """The latest rate limit information that BigCommerce reported for a store
+
+    Values are ``None`` until a response with rate limit headers is received.
+    """
+
+    def __init__(self):
+        self.requests_left: int | None = None
+        self.requests_quota: int | None = None
+        self.window: float | None = None
+        self._reset_at: float | None = None
+        self._lock = threading.Lock()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the rate limit headers from a response"""
+        try:
+            requests_left = int(headers['X-Rate-Limit-Requests-Left'])
+            requests_quota = int(headers['X-Rate-Limit-Requests-Quota'])
+            time_reset_ms = int(headers['X-Rate-Limit-Time-Reset-Ms'])
+            time_window_ms = int(headers['X-Rate-Limit-Time-Window-Ms'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            self.requests_left = requests_left
+            self.requests_quota = requests_quota
+            self.window = time_window_ms / 1000
+            self._reset_at = time.monotonic() + time_reset_ms / 1000
+
+    @property
+    def time_until_reset(self) -> float:
+        """Seconds until the current rate limit window resets"""
+        if self._reset_at is None:
+            return 0.0
+
+        return max(self._reset_at - time.monotonic(), 0.0)
+
+    @property
+    def headroom(self) -> float | None:
+        """The fraction of the quota left in the current window"""
+        if self.requests_left is None or not self.requests_quota:
+            return None
+        if self.time_until_reset == 0:
+            return 1.0
+
+        return self.requests_left / self.requests_quota
+
+    def wait_for_headroom(self, min_requests_left: int = 1) -> None:
+        """Sleep until the window resets if fewer requests than this are left"""
+        if self.requests_left is not None and self.requests_left < min_requests_left:
+            time.sleep(self.time_until_reset)
+
+
+class HedgePolicy:
+    """When to send a second copy of a slow ``GET`` request
+
+    A hedged request is sent again, on another connection, if it hasn't
+    finished after most requests would have (the ``percentile`` of recent
+    latencies), and whichever copy finishes first is used. Hedges are limited
+    by a budget: each request earns ``budget`` of a hedge, so ``budget=0.05``
+    allows about one hedge per 20 requests. No hedges are sent while the
+    store's rate limit is running low.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 95.0,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        budget: float = 0.05,
+        max_burst: float = 10.0,
+        min_headroom: float = 0.2,
+        window: int = 1000,
+        max_workers: int = 32,
+    ):
+        """
+        :param percentile: The percentile of recent latencies to wait before
+            hedging.
+        :param initial_delay: The wait, in seconds, until enough latencies
+            have been recorded.
+        :param min_delay: The shortest wait, in seconds, before hedging.
+        :param budget: The fraction of requests that may be hedged.
+        :param max_burst: The most unused hedges that can be saved up.
+        :param min_headroom: Don't hedge when less of the rate limit quota
+            than this fraction is left.
+        :param window: The number of recent latencies to keep.
+        :param max_workers: The most hedges (second copies) in progress at
+            once.
+        """
+        if not 0 < percentile < 100:
+            raise ValueError('percentile must be between 0 and 100')
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.budget = budget
+        self.max_burst = max_burst
+        self.min_headroom = min_headroom
+        self.max_workers = max_workers
+        self.num_hedged = 0
+
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._tokens = 0.0
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self) -> float:
+        """How long, in seconds, to wait for a request before hedging it"""
+        latencies = sorted(self._latencies)
+        # Too few latencies for the percentile to mean anything
+        if len(latencies) < 100 / (100 - self.percentile):
+            return self.initial_delay
+
+        index = math.ceil(len(latencies) * self.percentile / 100) - 1
+        return max(latencies[index], self.min_delay)
+
+    def record_latency(self, latency: float) -> None:
+        self._latencies.append(latency)
+
+    def close(self) -> None:
+        """Stop the threads sending hedged requests, until the next one"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+    def run(self, func: Callable[[], T], rate_limit: RateLimitStatus) -> T:
+        from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+
+        with self._lock:
+            self._tokens = min(self._tokens + self.budget, self.max_burst)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='bigc-hedge'
+                )
+
+        started_at = time.perf_counter()
+
+        def record_latency(future: Future) -> None:
+            # Failures are often fast, and would make hedging too eager
+            if future.exception() is None:
+                self.record_latency(time.perf_counter() - started_at)
+
+        # The first copy gets a thread of its own rather than one from the
+        # pool, so it never queues behind other requests or hedges
+        primary: Future = Future()
+        primary.add_done_callback(record_latency)
+        threading.Thread(
+            target=_run_into_future,
+            args=(func, primary),
+            name='bigc-hedged-request',
+            daemon=True,
+        ).start()
+
+        try:
+            return primary.result(timeout=self.delay)
+        except FutureTimeoutError:
+            pass
+
+        if not self._take_hedge(rate_limit):
+            return primary.result()
+
+        hedge = self._executor.submit(func)
+        for future in as_completed((primary, hedge)):
+            if future.exception() is None:
+                return future.result()
+
+        # Both failed, so report the original error
+        return primary.result()
+
+    def _take_hedge(self, rate_limit: RateLimitStatus) -> bool:
+        headroom = rate_limit.headroom
+        if headroom is not None and headroom < self.min_headroom:
+            return False
+
+        with self._lock:
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            self.num_hedged += 1
+            return True
+
+
+def _run_into_future(func: Callable[[], T], future: Future) -> None:
+    try:
+        result = func()
+    except BaseException as exc:  # noqa: BLE001 - raised by future.result()
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+class _PreparedRequest(NamedTuple):
+    """The parts of a request that are the same for every attempt and page"""
+
+    url: str
+    headers: dict[str, str]
+    params: dict[str, str] | None
+
 
 class BigCommerceRequestClient(ABC):
     def __init__(
@@ -27,26 +330,26 @@ class BigCommerceRequestClient(ABC):
         *,
         timeout: float | None = None,
         get_retries: int | None = None,
-        _thread_local: threading.local | None = None,
+        _pool: SessionPool | None = None,
+        _rate_limit: RateLimitStatus | None = None,
+        _hedge_policy: HedgePolicy | None = None,
+        _scheduler: RequestScheduler | None = None,
     ):
         self.store_hash = store_hash
         self.access_token = access_token
         self.timeout = timeout
         self.get_retries = get_retries
-        self._thread_local = _thread_local or threading.local()
-
-    @property
-    def _session(self) -> requests.Session:
-        """A session for the current thread
-
-        Sessions pool connections, but aren't thread-safe, so each thread gets
-        its own. Clients sharing a thread-local share a pool.
-        """
-        try:
-            return self._thread_local.session
-        except AttributeError:
-            self._thread_local.session = requests.Session()
-            return self._thread_local.session
+        self.rate_limit = _rate_limit or RateLimitStatus()
+        self.hedge_policy = _hedge_policy or HedgePolicy()
+        self.scheduler = _scheduler or RequestScheduler(self.rate_limit)
+        self.pool = _pool or SessionPool()
+        self._thread_local = threading.local()
+        self._standard_headers: tuple[str, dict[str, str]] | None = None
+
+    def close(self) -> None:
+        """Close the client's connections"""
+        self.pool.close()
+        self.hedge_policy.close()
 
     def request(
         self,
@@ -58,11 +361,74 @@ class BigCommerceRequestClient(ABC):
         headers: dict[str, str] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        find_existing: Callable[[], Any] | None = None,
+        hedge: bool = False,
+        deadline: Deadline | float | None = None,
+        priority: Priority | None = None,
+    ) -> Any:
+        """Make a request to the BigCommerce API
+
+        :param find_existing: Makes it safe to retry requests that aren't
+            idempotent, such as ``POST``. Before each retry, this is called to
+            check whether the failed attempt actually went through. If it
+            returns anything other than ``None``, that is returned instead of
+            retrying.
+        :param hedge: Send a ``GET`` request again if it's slow, and use
+            whichever response arrives first. See ``HedgePolicy``.
+        :param deadline: A time budget in seconds (or a ``Deadline``) for
+            every attempt together, by default the one set by an enclosing
+            ``bigc.deadlines.deadline()`` block. Each attempt's timeout is
+            shortened to end by the deadline, and ``DeadlineExceededError``
+            is raised instead of starting an attempt after it.
+        :param priority: Whether the request is urgent, by default the
+            priority set by an enclosing ``bigc.priority.priority()`` block.
+            Low priority attempts wait for high priority ones. See
+            ``RequestScheduler``.
+        """
+        return self._send(
+            method.upper(),
+            self._prepare(path, params, headers),
+            data=data,
+            timeout=timeout,
+            retries=retries,
+            find_existing=find_existing,
+            hedge=hedge,
+            deadline=deadline,
+            priority=priority,
+        )
+
+    def _prepare(
+        self,
+        path: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None = None,
+    ) -> _PreparedRequest:
+        self._validate_path(path)
+
+        standard_headers = self._get_cached_standard_request_headers()
+        return _PreparedRequest(
+            self._prepare_url(path),
+            standard_headers | headers if headers else standard_headers,
+            self._process_params(params),
+        )
+
+    def _send(
+        self,
+        method: str,
+        prepared: _PreparedRequest,
+        *,
+        data: Any = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        find_existing: Callable[[], Any] | None = None,
+        hedge: bool = False,
+        deadline: Deadline | float | None = None,
+        priority: Priority | None = None,
     ) -> Any:
-        method = method.upper()
+        """Send a prepared request, retrying it if needed"""
+        if hedge and method != 'GET':
+            raise ValueError('only GET requests can be hedged')
 
-        if headers is None:
-            headers = {}
         if timeout is None:
             timeout = self.timeout
         if retries is None:
@@ -71,28 +437,47 @@ class BigCommerceRequestClient(ABC):
 
             retries = retries or 0
 
-        self._validate_path(path)
-        self._validate_retries(method, retries)
+        self._validate_retries(method, retries, find_existing is not None)
+
+        url, headers, params = prepared
+
+        deadline = Deadline.resolve(deadline)
+        priority = self.scheduler.resolve(priority)
 
-        url = self._prepare_url(path)
-        params = self._process_params(params)
-        headers = self._get_standard_request_headers() | headers
+        def perform_request(timeout: float | None) -> Any:
+            import requests
 
-        def perform_request() -> Any:
             try:
-                response = self._session.request(
-                    method,
-                    url,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                    timeout=timeout,
-                )
+                # Waiting for a connection has its own bound, within the deadline
+                acquire_timeout = self.pool.acquire_timeout
+                if deadline is not None:
+                    acquire_timeout = deadline.cap_timeout(acquire_timeout)
+
+                with self.pool.session(acquire_timeout) as session:
+                    if deadline is not None:
+                        # Less is left after waiting for the connection
+                        timeout = deadline.cap_timeout(timeout)
+
+                    response = session.request(
+                        method,
+                        url,
+                        json=data,
+                        params=params,
+                        headers=headers,
+                        timeout=timeout,
+                    )
+            except TimeoutError as exc:
+                # Raised by the pool, before the request was sent
+                raise PoolTimeoutError() from exc
             except requests.Timeout as exc:
                 raise GatewayTimeoutError() from exc
             except requests.RequestException as exc:
                 raise BigCommerceNetworkError() from exc
 
+            self.rate_limit.update(response.headers)
+            # For adaptive page sizes, which can't see the response
+            self._thread_local.last_response_size = len(response.content)
+
             if response.ok:
                 # Return None for empty responses instead of raising
                 return response.json() if response.text else None
@@ -100,9 +485,33 @@ class BigCommerceRequestClient(ABC):
                 self._handle_error_response(response)
 
         last_exc: Exception | None = None
-        for _ in range(retries + 1):
+        for attempt in range(retries + 1):
+            if attempt and find_existing is not None:
+                try:
+                    existing = find_existing()
+                except BigCommerceException:
+                    # It's unknown whether the write went through
+                    raise last_exc from None
+
+                if existing is not None:
+                    return existing
+
             try:
-                return perform_request()
+                with self.scheduler.slot(priority, deadline=deadline):
+                    # Capped after waiting for a turn, which uses up the deadline
+                    attempt_timeout = timeout
+                    if deadline is not None:
+                        try:
+                            attempt_timeout = deadline.cap_timeout(timeout)
+                        except DeadlineExceededError as exc:
+                            raise exc from last_exc
+
+                    if hedge:
+                        return self.hedge_policy.run(
+                            functools.partial(perform_request, attempt_timeout),
+                            self.rate_limit,
+                        )
+                    return perform_request(attempt_timeout)
             except (
                 InternalServerError,
                 BadGatewayError,
@@ -114,6 +523,33 @@ class BigCommerceRequestClient(ABC):
 
         raise last_exc
 
+    def probe(
+        self, session: requests.Session, path: str, *, timeout: float | None = None
+    ) -> None:
+        """Make a ``GET`` request through a particular session
+
+        This opens the session's connection, or checks that it's still open.
+        """
+        import requests
+
+        if timeout is None:
+            timeout = self.timeout
+
+        try:
+            response = session.get(
+                self._prepare_url(path),
+                headers=self._get_cached_standard_request_headers(),
+                timeout=timeout,
+            )
+        except requests.Timeout as exc:
+            raise GatewayTimeoutError() from exc
+        except requests.RequestException as exc:
+            raise BigCommerceNetworkError() from exc
+
+        self.rate_limit.update(response.headers)
+        if not response.ok:
+            self._handle_error_response(response)
+
     def get(self, *args, **kwargs):
         """Alias for ``request('GET', ...)``"""
         return self.request('GET', *args, **kwargs)
@@ -135,17 +571,91 @@ class BigCommerceRequestClient(ABC):
         self,
         path: str,
         *,
-        page_size: int | None = None,
+        page_size: int | AdaptivePageSize | None = None,
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        deadline: Deadline | float | None = None,
     ) -> Iterator[Any]:
-        """Make a request to a paginated BigCommerce API endpoint"""
+        """Make a request to a paginated BigCommerce API endpoint
+
+        :param deadline: A time budget in seconds (or a ``Deadline``) for
+            every page together, starting when iteration starts. When it runs
+            out, ``DeadlineExceededError`` is raised with the ``resume_params``
+            and ``page_size`` to continue from the next page.
+        """
 
     @abstractmethod
     def _prepare_url(self, path: str) -> str:
         pass
 
+    def _get_page(
+        self,
+        prepared: _PreparedRequest,
+        *,
+        params: dict[str, Any],
+        offset: int | None,
+        adaptive: AdaptivePageSize | None,
+        count_records: Callable[[Any], int],
+        timeout: float | None,
+        retries: int | None,
+        deadline: Deadline | None,
+    ) -> Any:
+        """Get one page, setting its ``limit`` (and ``page``, given an offset)
+
+        Only the pagination values are taken from ``params``, as the others
+        are already in ``prepared``.
+        """
+        while True:
+            if adaptive is not None:
+                params['limit'] = adaptive.page_size_at(offset)
+            if offset is not None:
+                params['page'] = offset // params['limit'] + 1
+
+            page_params = {
+                name: str(params[name]) for name in _PAGINATION_PARAMS if name in params
+            }
+
+            started_at = time.perf_counter()
+            try:
+                response = self._send(
+                    'GET',
+                    prepared._replace(
+                        params={**(prepared.params or {}), **page_params}
+                    ),
+                    timeout=timeout,
+                    retries=retries,
+                    deadline=deadline,
+                )
+            except DeadlineExceededError as exc:
+                exc.page_size = params['limit']
+                if offset is not None:
+                    exc.resume_params = {'page': params['page']}
+                else:
+                    exc.resume_params = (
+                        {'after': params['after']} if 'after' in params else {}
+                    )
+                raise
+            except GatewayTimeoutError:
+                if adaptive is None:
+                    raise
+
+                page_size = params['limit']
+                adaptive.shrink()
+                if adaptive.page_size_at(offset) >= page_size:
+                    raise
+
+                continue
+
+            if adaptive is not None:
+                adaptive.record_page(
+                    time.perf_counter() - started_at,
+                    self._thread_local.last_response_size,
+                    count_records(response),
+                )
+
+            return response
+
     @staticmethod
     def _validate_path(path: str) -> None:
         if '?' in path:
@@ -155,12 +665,14 @@ class BigCommerceRequestClient(ABC):
             raise ValueError('path should not contain fragment')
 
     @staticmethod
-    def _validate_retries(method: str, retries: int) -> None:
+    def _validate_retries(method: str, retries: int, can_find_existing: bool) -> None:
         if retries < 0:
             raise ValueError('retries must be 0 or greater')
 
-        if method == 'POST' and retries:
-            raise ValueError('POST requests cannot be safely retried')
+        if method == 'POST' and retries and not can_find_existing:
+            raise ValueError(
+                'POST requests cannot be safely retried without find_existing'
+            )
 
     def _get_standard_request_headers(self) -> dict[str, str]:
         return {
@@ -169,21 +681,32 @@ class BigCommerceRequestClient(ABC):
             'X-Auth-Token': self.access_token,
         }
 
+    def _get_cached_standard_request_headers(self) -> dict[str, str]:
+        """The standard headers, only built again if the access token changes
+
+        The same dict is shared by every request, so it must not be changed.
+        """
+        cached = self._standard_headers
+        if cached is None or cached[0] != self.access_token:
+            cached = (self.access_token, self._get_standard_request_headers())
+            self._standard_headers = cached
+
+        return cached[1]
+
     @staticmethod
     def _process_params(params: dict[str, Any] | None) -> dict[str, str] | None:
         if not params:
             return None
 
-        def _process_param(value: Any) -> str:
-            if isinstance(value, list | tuple | set):
-                return ','.join(map(str, value))
-
-            return str(value)
-
-        return {k: _process_param(v) for k, v in params.items()}
+        return {
+            k: ','.join(map(str, v)) if isinstance(v, list | tuple | set) else str(v)
+            for k, v in params.items()
+        }
 
     @staticmethod
     def _handle_error_response(response: requests.Response) -> NoReturn:
+        import requests
+
         try:
             message, errors = BigCommerceException.extract_error_message(
                 response.json()
@@ -205,19 +728,28 @@ class BigCommerceRequestClient(ABC):
 class BigCommerceV2APIClient(BigCommerceRequestClient):
     """A client for directly calling BigCommerce v2 API endpoints"""
 
+    @functools.cached_property
+    def _base_url(self) -> str:
+        return f'https://api.bigcommerce.com/stores/{self.store_hash}/v2/'
+
     def _prepare_url(self, path: str) -> str:
-        return f'https://api.bigcommerce.com/stores/{self.store_hash}/v2/{path.lstrip("/")}'
+        return self._base_url + path.lstrip('/')
 
     def get_many(
         self,
         path: str,
         *,
-        page_size: int | None = None,
+        page_size: int | AdaptivePageSize | None = None,
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        deadline: Deadline | float | None = None,
     ) -> Iterator[Any]:
-        page_size = MAX_V2_PAGE_SIZE if page_size is None else int(page_size)
+        deadline = Deadline.resolve(deadline)
+
+        adaptive = page_size if isinstance(page_size, AdaptivePageSize) else None
+        if adaptive is None:
+            page_size = MAX_V2_PAGE_SIZE if page_size is None else int(page_size)
 
         params = {**params} if params else {}
 
@@ -226,13 +758,28 @@ class BigCommerceV2APIClient(BigCommerceRequestClient):
                 'params already has pagination values (limit and/or offset)'
             )
 
-        params['limit'] = page_size
+        if adaptive is None:
+            params['limit'] = page_size
+        # Start from a later page, such as when resuming after a deadline
+        offset = (int(params.pop('page', 1)) - 1) * (
+            adaptive.page_size if adaptive is not None else page_size
+        )
 
-        for cur_page in itertools.count(1):
-            params['page'] = cur_page
+        prepared = self._prepare(
+            path,
+            {k: v for k, v in params.items() if k not in _PAGINATION_PARAMS},
+        )
 
-            res_data = super().get(
-                path, params=params, timeout=timeout, retries=retries
+        while True:
+            res_data = self._get_page(
+                prepared,
+                params=params,
+                offset=offset,
+                adaptive=adaptive,
+                count_records=lambda res_data: len(res_data or ()),
+                timeout=timeout,
+                retries=retries,
+                deadline=deadline,
             )
 
             # The API returns HTTP 204 (empty) past the last page
@@ -243,75 +790,138 @@ class BigCommerceV2APIClient(BigCommerceRequestClient):
                 raise TypeError(f'expected list, got {type(res_data).__name__}')
 
             yield from res_data
+            offset += len(res_data)
 
             # Check if we're on the last page
-            if len(res_data) < page_size:
+            if len(res_data) < params['limit']:
                 return
 
 
 class BigCommerceV3APIClient(BigCommerceRequestClient):
     """A client for directly calling BigCommerce v3 API endpoints"""
 
+    @functools.cached_property
+    def _base_url(self) -> str:
+        return f'https://api.bigcommerce.com/stores/{self.store_hash}/v3/'
+
     def _prepare_url(self, path: str) -> str:
-        return f'https://api.bigcommerce.com/stores/{self.store_hash}/v3/{path.lstrip("/")}'
+        return self._base_url + path.lstrip('/')
+
+    def request(
+        self,
+        *args,
+        find_existing: Callable[[], Any] | None = None,
+        boxed: bool = False,
+        **kwargs,
+    ):
+        """Make a request, returning the response's ``data``
+
+        :param boxed: Return the whole response body instead, e.g. to read the
+            ``errors`` of a ``207 Multi-Status`` response.
+        """
+        if find_existing is not None:
+            unboxed_find_existing = find_existing
+
+            def find_existing() -> Any:
+                existing = unboxed_find_existing()
+                return None if existing is None else {'data': existing}
 
-    def request(self, *args, **kwargs):
         # v3 response bodies are boxed in the 'data' key
-        response = super().request(*args, **kwargs)
-        return None if response is None else response['data']
+        response = super().request(*args, find_existing=find_existing, **kwargs)
+        if response is None or boxed:
+            return response
+        return response['data']
 
     def _get_many_using_limit_offset(
         self,
         path: str,
         *,
-        page_size: int,
+        page_size: int | AdaptivePageSize,
         params: dict[str, Any],
         timeout: float | None,
         retries: int | None = None,
+        deadline: Deadline | float | None = None,
     ) -> Iterator[Any]:
+        deadline = Deadline.resolve(deadline)
+
         if params.keys() & {'limit', 'offset'}:
             raise ValueError(
                 'params already has pagination values (limit and/or offset)'
             )
 
-        params['limit'] = page_size
+        adaptive = page_size if isinstance(page_size, AdaptivePageSize) else None
+        if adaptive is None:
+            params['limit'] = page_size
+        # Start from a later page, such as when resuming after a deadline
+        offset = (int(params.pop('page', 1)) - 1) * (
+            adaptive.page_size if adaptive is not None else page_size
+        )
 
-        cur_page = 1
-        num_pages = 1  # Will be set to the right value in the loop
-        while cur_page <= num_pages:
-            params['page'] = cur_page
+        prepared = self._prepare(
+            path,
+            {k: v for k, v in params.items() if k not in _PAGINATION_PARAMS},
+        )
 
-            res_data = super().request(
-                'GET', path, params=params, timeout=timeout, retries=retries
+        while True:
+            res_data = self._get_page(
+                prepared,
+                params=params,
+                offset=offset,
+                adaptive=adaptive,
+                count_records=lambda res_data: len(res_data['data']),
+                timeout=timeout,
+                retries=retries,
+                deadline=deadline,
             )
 
-            cur_page += 1
-            num_pages = int(res_data['meta']['pagination']['total_pages'])
-
             if not isinstance(res_data['data'], list):
                 raise TypeError(f'expected list, got {type(res_data["data"]).__name__}')
 
             yield from res_data['data']
+            offset += len(res_data['data'])
+
+            # The number of pages depends on the page size, which may change
+            pagination = res_data['meta']['pagination']
+            if params['page'] >= int(pagination['total_pages']):
+                return
 
     def _get_many_using_cursor(
         self,
         path: str,
         *,
-        page_size: int,
+        page_size: int | AdaptivePageSize,
         params: dict[str, Any],
         timeout: float | None,
         retries: int | None = None,
+        deadline: Deadline | float | None = None,
     ) -> Iterator[Any]:
-        if params.keys() & {'limit', 'before', 'after'}:
+        deadline = Deadline.resolve(deadline)
+
+        # An 'after' cursor is allowed, such as when resuming after a deadline
+        if params.keys() & {'limit', 'before'}:
             raise ValueError(
-                'params already has pagination values (limit, before, and/or after)'
+                'params already has pagination values (limit and/or before)'
             )
 
-        params['limit'] = page_size
+        adaptive = page_size if isinstance(page_size, AdaptivePageSize) else None
+        if adaptive is None:
+            params['limit'] = page_size
+
+        prepared = self._prepare(
+            path,
+            {k: v for k, v in params.items() if k not in _PAGINATION_PARAMS},
+        )
 
         while True:
-            response = super().request(
-                'GET', path, params=params, timeout=timeout, retries=retries
+            response = self._get_page(
+                prepared,
+                params=params,
+                offset=None,
+                adaptive=adaptive,
+                count_records=lambda response: len(response['data']),
+                timeout=timeout,
+                retries=retries,
+                deadline=deadline,
             )
 
             yield from response['data']
@@ -329,13 +939,15 @@ class BigCommerceV3APIClient(BigCommerceRequestClient):
         self,
         path: str,
         *,
-        page_size: int | None = None,
+        page_size: int | AdaptivePageSize | None = None,
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        deadline: Deadline | float | None = None,
         cursor: bool = False,
     ) -> Iterator[Any]:
-        page_size = MAX_V3_PAGE_SIZE if page_size is None else int(page_size)
+        if not isinstance(page_size, AdaptivePageSize):
+            page_size = MAX_V3_PAGE_SIZE if page_size is None else int(page_size)
         params = {**params} if params else {}
 
         if cursor:
@@ -345,6 +957,7 @@ class BigCommerceV3APIClient(BigCommerceRequestClient):
                 params=params,
                 timeout=timeout,
                 retries=retries,
+                deadline=deadline,
             )
         else:
             return self._get_many_using_limit_offset(
@@ -353,4 +966,5 @@ class BigCommerceV3APIClient(BigCommerceRequestClient):
                 params=params,
                 timeout=timeout,
                 retries=retries,
+                deadline=deadline,
             )
@@ -0,0 +1,255 @@
+"""
+In-memory caching of API reads, kept fresh by webhooks instead of short TTLs.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bigc.api import BigCommerceAPI
+    from bigc.webhooks import WebhookEvent
+
+__all__ = ('BigCommerceReadCache', 'TTLCache')
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A thread-safe LRU cache whose entries expire a fixed time after being set
+
+    Entries may be given tags, so that every entry sharing a tag can be
+    invalidated at once.
+    """
+
+    def __init__(self, ttl: float, *, max_size: int | None = None):
+        """
+        :param ttl: How long, in seconds, entries remain valid.
+        :param max_size: The most entries to keep. The least recently used
+            entries are evicted first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any, tuple]] = OrderedDict()
+        self._keys_by_tag: dict[Hashable, set[Hashable]] = {}
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                expires_at, value, _ = self._entries[key]
+            except KeyError:
+                return default
+
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, *, tags: Iterable[Hashable] = ()) -> None:
+        tags = tuple(tags)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._remove(next(iter(self._entries)))
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        get_value: Callable[[], Any],
+        *,
+        tags: Iterable[Hashable] = (),
+    ) -> Any:
+        """Return the cached value, calling ``get_value`` to fill it if needed"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            invalidations = self._invalidations
+            value = get_value()
+
+            # Don't cache a value that may have been invalidated while it was
+            # being fetched
+            if invalidations == self._invalidations:
+                self.set(key, value, tags=tags)
+
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._invalidations += 1
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """Remove every entry with the given tag, returning how many were removed"""
+        with self._lock:
+            self._invalidations += 1
+            keys = list(self._keys_by_tag.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+
+class _CachedResource:
+    """Stands in for a resource, caching the results of its ``get`` method"""
+
+    def __init__(
+        self, cache: BigCommerceReadCache, resource: str, get: Callable[..., Any]
+    ):
+        self._cache = cache
+        self._resource = resource
+        self._get = get
+
+    def get(
+        self,
+        entity_id: int,
+        *,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+    ) -> dict[str, Any]:
+        """Get an entity from the cache, or from the API if it isn't cached"""
+        kwargs: dict[str, Any] = {'timeout': timeout, 'retries': retries}
+        if params:
+            kwargs['params'] = params
+
+        entity_tag = (self._resource, int(entity_id))
+        key = (*entity_tag, json.dumps(params, sort_keys=True, default=str))
+
+        return self._cache.entities.get_or_set(
+            key, lambda: self._get(entity_id, **kwargs), tags=[entity_tag]
+        )
+
+
+class BigCommerceReadCache:
+    """Cache products, categories, customers and orders, invalidated by webhooks
+
+    Reads go through resource-shaped attributes, so ``api.products_v3.get(1)``
+    becomes ``cache.products_v3.get(1)``. Pass ``handle_webhook_events`` to a
+    ``bigc.webhooks.WebhookReceiver`` (or call it from your own handler) and
+    use ``register_webhooks`` to create the webhooks it relies on.
+    """
+
+    WEBHOOK_SCOPES = (
+        'store/product/*',
+        'store/category/*',
+        'store/customer/*',
+        'store/order/*',
+    )
+
+    def __init__(
+        self,
+        api: BigCommerceAPI,
+        *,
+        ttl: float = 24 * 60 * 60,
+        max_size: int | None = 100_000,
+    ):
+        """
+        :param api: The API to read through to on cache misses.
+        :param ttl: How long, in seconds, cached entities remain valid. This
+            is a safety net for missed webhooks, so it can be long.
+        :param max_size: The most responses to keep.
+        """
+        self._api = api
+        self.entities = TTLCache(ttl, max_size=max_size)
+
+        self.products_v3 = _CachedResource(self, 'product', api.products_v3.get)
+        self.categories_v3 = _CachedResource(self, 'category', api.categories_v3.get)
+        self.customers_v3 = _CachedResource(self, 'customer', api.customers_v3.get)
+        self.orders_v2 = _CachedResource(self, 'order', api.orders_v2.get)
+
+    def invalidate(self, resource: str, entity_id: int) -> None:
+        """Drop all cached responses for an entity, e.g. ``('product', 77)``"""
+        self.entities.invalidate_tag((resource, int(entity_id)))
+
+    def clear(self) -> None:
+        self.entities.clear()
+
+    def handle_webhook_events(self, events: Iterable[WebhookEvent]) -> None:
+        """Invalidate the entities that a batch of webhook events refers to"""
+        for event in events:
+            entity_id = self._get_invalidated_entity_id(event)
+            if entity_id is not None:
+                self.invalidate(event.resource, entity_id)
+
+    def register_webhooks(
+        self,
+        destination: str,
+        *,
+        headers: dict[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Create or reactivate the webhooks needed to keep the cache fresh
+
+        Existing webhooks with the same scope and destination are reused.
+        Returns the webhooks, in the order of ``WEBHOOK_SCOPES``.
+        """
+        webhooks_v3 = self._api.webhooks_v3
+        existing = {
+            webhook['scope']: webhook
+            for webhook in webhooks_v3.all()
+            if webhook['destination'] == destination
+        }
+
+        webhooks = []
+        for scope in self.WEBHOOK_SCOPES:
+            data: dict[str, Any] = {'is_active': True}
+            if headers is not None:
+                data['headers'] = headers
+
+            webhook = existing.get(scope)
+            if webhook is None:
+                webhook = webhooks_v3.create(
+                    {'scope': scope, 'destination': destination, **data}
+                )
+            elif not webhook.get('is_active') or (
+                headers is not None and webhook.get('headers') != headers
+            ):
+                webhook = webhooks_v3.update(webhook['id'], data)
+
+            webhooks.append(webhook)
+
+        return webhooks
+
+    @staticmethod
+    def _get_invalidated_entity_id(event: WebhookEvent) -> Any:
+        if event.resource not in {'product', 'category', 'customer', 'order'}:
+            return None
+
+        # Address events refer to the address's ID, not the customer's
+        if event.resource == 'customer' and 'address' in event.data:
+            return event.data['address'].get('customer_id')
+
+        return event.entity_id
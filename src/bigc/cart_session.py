@@ -0,0 +1,215 @@
+"""
+Keep a local copy of a cart, and sync it to a desired state with the fewest
+requests.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bigc.resources.carts_v3 import BigCommerceCartsV3API, UUIDLike
+
+__all__ = ('CartDiff', 'CartSession')
+
+# Line item types that are identified by product and variant
+_PRODUCT_LINE_ITEM_TYPES = ('physical_items', 'digital_items')
+
+LineItemKey = tuple[int, int | None]
+
+
+def _line_item_key(line_item: Mapping[str, Any]) -> LineItemKey:
+    variant_id = line_item.get('variant_id')
+    return (
+        int(line_item['product_id']),
+        None if variant_id is None else int(variant_id),
+    )
+
+
+@dataclass
+class CartDiff:
+    """The line item changes needed to turn one cart into another"""
+
+    add: list[dict[str, Any]] = field(default_factory=list)
+    update: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    delete: list[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.add or self.update or self.delete)
+
+    @property
+    def num_requests(self) -> int:
+        return bool(self.add) + len(self.update) + len(self.delete)
+
+
+class CartSession:
+    """A cart, and the last state of it that BigCommerce returned
+
+    Line items are identified by their product and variant IDs. A cart can
+    have more than one line item for a variant (e.g. with different option
+    selections), in which case only the first is kept when syncing. Gift
+    certificates and custom items are left alone.
+    """
+
+    def __init__(
+        self,
+        carts: BigCommerceCartsV3API,
+        cart_id: UUIDLike,
+        *,
+        cart: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        max_workers: int = 4,
+    ):
+        """
+        :param carts: The carts resource, e.g. ``bigcommerce.carts_v3``.
+        :param cart_id: The cart to work on.
+        :param cart: The cart's current state, if it's already known (such as
+            the response from creating it).
+        :param params: Query parameters for every request, e.g. ``include``.
+        :param timeout: A timeout for each request.
+        :param max_workers: The most requests to run at once.
+        """
+        self._carts = carts
+        self.cart_id = cart_id
+        self.cart = cart
+        self.params = params
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def refresh(self) -> dict[str, Any]:
+        """Get the cart from the API"""
+        self.cart = self._carts.get(
+            self.cart_id, params=self.params, timeout=self.timeout
+        )
+        return self.cart
+
+    def line_items(self) -> dict[LineItemKey, list[dict[str, Any]]]:
+        """The cart's current product line items, by product and variant ID"""
+        if self.cart is None:
+            self.refresh()
+
+        line_items = self.cart.get('line_items') or {}
+        by_key: dict[LineItemKey, list[dict[str, Any]]] = {}
+        for line_item_type in _PRODUCT_LINE_ITEM_TYPES:
+            for line_item in line_items.get(line_item_type) or []:
+                by_key.setdefault(_line_item_key(line_item), []).append(line_item)
+
+        return by_key
+
+    def diff(self, desired: Iterable[Mapping[str, Any]]) -> CartDiff:
+        """Work out the changes needed for the cart to contain the desired line items
+
+        Each desired line item needs a ``product_id`` and ``quantity``, and
+        may have a ``variant_id`` and any other fields accepted when adding
+        line items. Line items for the same product and variant are combined.
+        """
+        desired_by_key: dict[LineItemKey, dict[str, Any]] = {}
+        for line_item in desired:
+            key = _line_item_key(line_item)
+            if key in desired_by_key:
+                desired_by_key[key]['quantity'] += line_item['quantity']
+            else:
+                desired_by_key[key] = dict(line_item)
+
+        current = self.line_items()
+        current_keys_by_product = {}
+        for product_id, variant_id in current:
+            current_keys_by_product.setdefault(product_id, []).append(
+                (product_id, variant_id)
+            )
+
+        diff = CartDiff()
+        matched_keys: set[LineItemKey] = set()
+
+        for key, line_item in desired_by_key.items():
+            # Without a variant ID, match the product's only line item, which
+            # will have the ID of the product's base variant
+            if key not in current and key[1] is None:
+                product_keys = current_keys_by_product.get(key[0], [])
+                if len(product_keys) == 1:
+                    key = product_keys[0]
+
+            existing = None
+            if key in current:
+                matched_keys.add(key)
+                existing, *duplicates = current[key]
+                diff.delete.extend(duplicate['id'] for duplicate in duplicates)
+
+            if line_item['quantity'] <= 0:
+                if existing is not None:
+                    diff.delete.append(existing['id'])
+            elif existing is None:
+                diff.add.append(line_item)
+            elif existing['quantity'] != line_item['quantity']:
+                update = {
+                    'product_id': key[0],
+                    'quantity': line_item['quantity'],
+                }
+                if key[1] is not None:
+                    update['variant_id'] = key[1]
+                diff.update.append((existing['id'], {'line_item': update}))
+
+        diff.delete.extend(
+            line_item['id']
+            for key, key_line_items in current.items()
+            if key not in matched_keys
+            for line_item in key_line_items
+        )
+
+        return diff
+
+    def sync(self, desired: Iterable[Mapping[str, Any]]) -> dict[str, Any] | None:
+        """Change the cart's line items to the desired ones
+
+        New line items are added in one request first, so the cart never
+        empties part way through. Then updates and deletions run
+        concurrently, except for one that runs last so that its response
+        reflects every change. Returns the final cart, or ``None`` if
+        every line item was removed (which deletes the cart).
+        """
+        diff = self.diff(desired)
+
+        if diff.add:
+            self.cart = self._carts.add_line_items(
+                self.cart_id,
+                {'line_items': diff.add},
+                params=self.params,
+                timeout=self.timeout,
+            )
+
+        changes: list[Callable[[], dict[str, Any] | None]] = [
+            lambda item_id=item_id, data=data: self._carts.update_line_item(
+                self.cart_id, item_id, data, params=self.params, timeout=self.timeout
+            )
+            for item_id, data in diff.update
+        ] + [
+            lambda item_id=item_id: self._carts.delete_line_item(
+                self.cart_id, item_id, params=self.params, timeout=self.timeout
+            )
+            for item_id in diff.delete
+        ]
+
+        if changes:
+            *concurrent_changes, last_change = changes
+
+            try:
+                if concurrent_changes:
+                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                        futures = [
+                            executor.submit(change) for change in concurrent_changes
+                        ]
+                        for future in futures:
+                            future.result()
+
+                self.cart = last_change()
+            except Exception:
+                # Some changes may have been applied, so the cart's state is
+                # unknown until it's fetched again
+                self.cart = None
+                raise
+
+        return self.cart
@@ -0,0 +1,232 @@
+"""
+Record API traffic to cassettes, and replay it later without a network, for
+repeatable tests and benchmarks.
+
+Pass a transport to ``BigCommerceAPI(transport=...)``. Cassettes are JSON
+Lines files, one request and response per line, and are gzipped if their
+path ends in ``.gz``. Access tokens aren't recorded, and store hashes are
+replaced with a placeholder, so cassettes recorded against one store can be
+replayed with any store hash.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import IO, Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+__all__ = ('CassetteMissError', 'RecordingTransport', 'ReplayTransport')
+
+_STORE_HASH_PLACEHOLDER = '{store_hash}'
+
+# Only the response headers that bigc reads are recorded
+_RECORDED_HEADERS = frozenset(
+    {
+        'content-type',
+        'x-rate-limit-requests-left',
+        'x-rate-limit-requests-quota',
+        'x-rate-limit-time-reset-ms',
+        'x-rate-limit-time-window-ms',
+    }
+)
+
+# Network errors that are recorded, and raised again when replayed
+_RECORDED_ERRORS: dict[str, type[requests.RequestException]] = {
+    'ConnectionError': requests.ConnectionError,
+    'ConnectTimeout': requests.ConnectTimeout,
+    'ReadTimeout': requests.ReadTimeout,
+}
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request wasn't recorded, or was replayed too often"""
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _recorded_error(exc: requests.RequestException) -> str:
+    """The name of the nearest recorded class of an error, e.g. for subclasses"""
+    for cls in type(exc).__mro__:
+        if _RECORDED_ERRORS.get(cls.__name__) is cls:
+            return cls.__name__
+    raise TypeError(f"{type(exc).__name__} errors aren't recorded")
+
+
+def _request_key(request: requests.PreparedRequest) -> str:
+    """Identify a request by its method, scrubbed URL, sorted query and body"""
+    url = urlsplit(request.url)
+
+    # e.g. /stores/abc123/v3/catalog/products
+    parts = url.path.split('/')
+    if len(parts) > 2 and parts[1] == 'stores':
+        parts[2] = _STORE_HASH_PLACEHOLDER
+    path = '/'.join(parts)
+
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+
+    body = request.body
+    if isinstance(body, bytes):
+        body = body.decode()
+    if body:
+        # The same data can be serialized with its keys in a different order
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'))
+
+    return f'{request.method} {path}?{query} {body or ""}'
+
+
+class RecordingTransport(BaseAdapter):
+    """Send requests over the network, and record them to a cassette
+
+    Each exchange is appended to the cassette as soon as it finishes, so an
+    interrupted run still leaves a usable cassette. The cassette is kept open
+    until the transport is closed.
+    """
+
+    def __init__(self, path: str | Path, *, transport: BaseAdapter | None = None):
+        """
+        :param path: The cassette to append to.
+        :param transport: The transport actually sending requests, by default
+            a ``requests`` ``HTTPAdapter``.
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.transport = transport or HTTPAdapter()
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        started_at = time.perf_counter()
+        try:
+            response = self.transport.send(request, **kwargs)
+        except tuple(_RECORDED_ERRORS.values()) as exc:
+            self._record(
+                request,
+                time.perf_counter() - started_at,
+                error=_recorded_error(exc),
+            )
+            raise
+
+        self._record(
+            request,
+            time.perf_counter() - started_at,
+            status=response.status_code,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() in _RECORDED_HEADERS
+            },
+            body=response.text,
+        )
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.transport.close()
+
+    def _record(
+        self, request: requests.PreparedRequest, elapsed: float, **response: Any
+    ) -> None:
+        line = json.dumps(
+            {'request': _request_key(request), 'elapsed': round(elapsed, 4)} | response,
+            separators=(',', ':'),
+        )
+        with self._lock:
+            # Opened once, as each reopening of a gzipped cassette starts a
+            # new compressed stream
+            if self._file is None:
+                self._file = _open(self.path, 'a')
+            self._file.write(line + '\n')
+            self._file.flush()
+
+
+class ReplayTransport(BaseAdapter):
+    """Answer requests from a cassette, without a network
+
+    Identical requests are answered in the order they were recorded, so
+    retries after errors and repeated reads replay faithfully.
+    """
+
+    def __init__(self, path: str | Path, *, speed: float | None = 1.0):
+        """
+        :param path: The cassette to replay.
+        :param speed: How much faster than recorded to respond, e.g. ``10``
+            for a tenth of the recorded latency, or ``None`` to respond
+            immediately.
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.speed = speed
+
+        self._exchanges: defaultdict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        with _open(self.path, 'r') as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+
+                    try:
+                        exchange = json.loads(line)
+                    except json.JSONDecodeError:
+                        if line.endswith('\n'):
+                            raise
+                        # The last line, cut off part way through when the
+                        # recording was interrupted
+                        break
+
+                    self._exchanges[exchange['request']].append(exchange)
+            except EOFError:
+                # A gzipped cassette whose recording was interrupted before
+                # it was closed, which is usable up to that point
+                pass
+        self._lock = threading.Lock()
+
+    @property
+    def num_remaining(self) -> int:
+        """The number of recorded exchanges not replayed yet"""
+        return sum(len(exchanges) for exchanges in self._exchanges.values())
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        key = _request_key(request)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise CassetteMissError(f'No recorded response for {key}')
+            exchange = exchanges.popleft()
+
+        if self.speed is not None:
+            time.sleep(exchange['elapsed'] / self.speed)
+
+        if 'error' in exchange:
+            raise _RECORDED_ERRORS[exchange['error']](request=request)
+
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response._content = exchange['body'].encode()
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,234 @@
+"""
+Complete a checkout in as few sequential round-trips as possible.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from bigc.exceptions import InvalidDataError
+
+if TYPE_CHECKING:
+    from bigc.resources.checkouts_v3 import BigCommerceCheckoutsV3API, UUIDLike
+
+__all__ = ('CheckoutSession', 'cheapest_shipping_option')
+
+# Needed in consignment responses to select a shipping option without a GET
+SHIPPING_OPTIONS_INCLUDE = 'consignments.available_shipping_options'
+
+
+def cheapest_shipping_option(consignment: dict[str, Any]) -> str:
+    """Pick the cheapest shipping option available to a consignment"""
+    options = consignment.get('available_shipping_options') or []
+    if not options:
+        raise InvalidDataError(
+            f'No shipping options are available for consignment {consignment["id"]}.'
+        )
+
+    return min(options, key=lambda option: float(option['cost']))['id']
+
+
+class CheckoutSession:
+    """Run the steps of a checkout, overlapping the ones that don't depend on each other
+
+    Each step keeps the checkout that BigCommerce returns, so the current state
+    is available as ``checkout`` without extra requests. The time taken by
+    each step, in seconds, is recorded in ``timings``.
+    """
+
+    def __init__(
+        self,
+        checkouts: BigCommerceCheckoutsV3API,
+        checkout_id: UUIDLike,
+        *,
+        checkout: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        max_workers: int = 4,
+    ):
+        """
+        :param checkouts: The checkouts resource, e.g. ``bigcommerce.checkouts_v3``.
+        :param checkout_id: The checkout to work on.
+        :param checkout: The checkout's current state, if it's already known.
+        :param timeout: A timeout for each request.
+        :param max_workers: The most requests to run at once.
+        """
+        self._checkouts = checkouts
+        self.checkout_id = checkout_id
+        self.checkout = checkout
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.timings: dict[str, float] = {}
+
+    def refresh(self) -> dict[str, Any]:
+        """Get the checkout from the API"""
+        self.checkout = self._run_step(
+            'get',
+            lambda: self._checkouts.get(
+                self.checkout_id,
+                params={'include': SHIPPING_OPTIONS_INCLUDE},
+                timeout=self.timeout,
+            ),
+        )
+        return self.checkout
+
+    def add_billing_address(self, data: dict[str, Any]) -> dict[str, Any]:
+        self.checkout = self._run_step(
+            'add_billing_address',
+            lambda: self._checkouts.add_billing_address(
+                self.checkout_id, data, timeout=self.timeout
+            ),
+        )
+        return self.checkout
+
+    def add_consignments(self, data: list[dict[str, Any]]) -> dict[str, Any]:
+        self.checkout = self._run_step(
+            'add_consignments',
+            lambda: self._checkouts.add_consignments(
+                self.checkout_id,
+                data,
+                params={'include': SHIPPING_OPTIONS_INCLUDE},
+                timeout=self.timeout,
+            ),
+        )
+        return self.checkout
+
+    def add_coupon(self, coupon_code: str) -> dict[str, Any]:
+        self.checkout = self._run_step(
+            'add_coupon',
+            lambda: self._checkouts.add_coupon(
+                self.checkout_id, {'coupon_code': coupon_code}, timeout=self.timeout
+            ),
+        )
+        return self.checkout
+
+    def select_shipping_options(
+        self,
+        select: Callable[[dict[str, Any]], str] = cheapest_shipping_option,
+    ) -> dict[str, Any]:
+        """Select a shipping option for each consignment that doesn't have one
+
+        The shipping options are read from the current ``checkout``, so call
+        ``add_consignments`` (or ``refresh``) first. Consignments are updated
+        concurrently, and then the checkout is fetched again, as no single
+        response reflects every update.
+        """
+        if self.checkout is None:
+            self.refresh()
+
+        consignments = self._consignments_without_shipping_options()
+        if not consignments:
+            return self.checkout
+
+        def update(consignment: dict[str, Any]) -> dict[str, Any]:
+            data = {'shipping_option_id': select(consignment)}
+            return self._run_step(
+                f'select_shipping_option:{consignment["id"]}',
+                lambda: self._checkouts.update_consignment(
+                    self.checkout_id, consignment['id'], data, timeout=self.timeout
+                ),
+            )
+
+        if len(consignments) == 1:
+            self.checkout = update(consignments[0])
+            return self.checkout
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(update, consignments))
+
+        return self.refresh()
+
+    def create_order(self) -> dict[str, Any]:
+        """Create an order from the checkout, returning the order, with its ``id``"""
+        return self._run_step(
+            'create_order',
+            lambda: self._checkouts.create_order(
+                self.checkout_id, timeout=self.timeout
+            ),
+        )
+
+    def complete(
+        self,
+        *,
+        billing_address: dict[str, Any] | None = None,
+        consignments: list[dict[str, Any]] | None = None,
+        coupon_code: str | None = None,
+        select_shipping_option: Callable[
+            [dict[str, Any]], str
+        ] = cheapest_shipping_option,
+        create_order: bool = True,
+    ) -> dict[str, Any]:
+        """Run every given step, then create the order
+
+        The billing address, consignments and coupon are added concurrently.
+        Once the consignments exist, their shipping options are selected, and
+        then the order is created. Responses to concurrent steps only reflect
+        some of the changes (e.g. their totals may be out of date), so the
+        checkout is fetched again afterwards, unless selecting a shipping
+        option returns it anyway.
+
+        Returns the created order (with its ``id``), or the checkout if
+        ``create_order`` is false.
+        """
+        started_at = time.perf_counter()
+
+        steps: list[tuple[str, Callable[[], dict[str, Any]]]] = []
+        if billing_address is not None:
+            steps.append(
+                (
+                    'add_billing_address',
+                    lambda: self.add_billing_address(billing_address),
+                )
+            )
+        if consignments:
+            steps.append(
+                ('add_consignments', lambda: self.add_consignments(consignments))
+            )
+        if coupon_code is not None:
+            steps.append(('add_coupon', lambda: self.add_coupon(coupon_code)))
+
+        results = self._run_concurrently(steps)
+
+        if consignments:
+            # Only the consignments' shipping options are needed from here,
+            # and the selection's response reflects every earlier step
+            self.checkout = results['add_consignments']
+            if self._consignments_without_shipping_options():
+                self.select_shipping_options(select_shipping_option)
+            elif len(steps) > 1:
+                self.refresh()
+        elif len(steps) > 1:
+            self.refresh()
+
+        result = self.create_order() if create_order else self.checkout
+
+        self.timings['complete'] = time.perf_counter() - started_at
+        return result
+
+    def _consignments_without_shipping_options(self) -> list[dict[str, Any]]:
+        return [
+            consignment
+            for consignment in self.checkout.get('consignments') or []
+            if not consignment.get('selected_shipping_option')
+        ]
+
+    def _run_step(self, name: str, func: Callable[[], Any]) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self.timings[name] = time.perf_counter() - started_at
+
+    def _run_concurrently(
+        self, steps: list[tuple[str, Callable[[], dict[str, Any]]]]
+    ) -> dict[str, dict[str, Any]]:
+        """Run steps at once, returning the checkout each one responded with"""
+        if len(steps) <= 1:
+            return {name: step() for name, step in steps}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(name, executor.submit(step)) for name, step in steps]
+            # Raises the first error, after every step has finished
+            return {name: future.result() for name, future in futures}
@@ -0,0 +1,203 @@
+"""
+Convert and format prices using a store's currencies, refreshed in the
+background.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Context, Decimal
+from typing import TYPE_CHECKING, Any
+
+from bigc.exceptions import DoesNotExistError
+
+if TYPE_CHECKING:
+    from bigc.resources.currencies_v2 import BigCommerceCurrenciesV2API
+
+__all__ = ('Currency', 'CurrencyTable')
+
+logger = logging.getLogger(__name__)
+
+# Enough precision that only the final rounding affects converted amounts
+_CONVERSION_CONTEXT = Context(prec=40)
+
+
+@dataclass(frozen=True)
+class Currency:
+    """A store currency, with its exchange rate from the store's default currency"""
+
+    code: str
+    exchange_rate: Decimal
+    decimal_places: int = 2
+    token: str = ''
+    token_location: str = 'left'
+    decimal_token: str = '.'
+    thousands_token: str = ','
+    is_default: bool = False
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> Currency:
+        """Read a currency from ``currencies_v2`` data"""
+        decimal_places = data.get('decimal_places')
+        return cls(
+            code=data['currency_code'],
+            exchange_rate=Decimal(str(data['currency_exchange_rate'])),
+            decimal_places=2 if decimal_places is None else int(decimal_places),
+            token=data.get('token') or '',
+            token_location=data.get('token_location') or 'left',
+            decimal_token=data.get('decimal_token') or '.',
+            thousands_token=data.get('thousands_token') or ',',
+            is_default=bool(data.get('is_default')),
+        )
+
+    def round(self, amount: Decimal | int | str) -> Decimal:
+        """Round an amount to the currency's decimal places, with halves rounded up"""
+        return Decimal(amount).quantize(
+            Decimal(1).scaleb(-self.decimal_places), rounding=ROUND_HALF_UP
+        )
+
+    def format(self, amount: Decimal | int | str) -> str:
+        """Format an amount as the storefront displays it, e.g. ``$1,234.50``"""
+        rounded = self.round(amount)
+        sign = '-' if rounded < 0 else ''
+        whole, _, fraction = f'{abs(rounded):f}'.partition('.')
+
+        groups = []
+        while len(whole) > 3:
+            whole, group = whole[:-3], whole[-3:]
+            groups.insert(0, group)
+        number = self.thousands_token.join([whole, *groups])
+        if fraction:
+            number += self.decimal_token + fraction
+
+        if self.token_location == 'right':
+            return f'{sign}{number}{self.token}'
+        return f'{sign}{self.token}{number}'
+
+
+class CurrencyTable:
+    """A store's currencies, kept up to date by a background thread
+
+    Currencies are loaded once when the table is created, and then reloaded
+    every ``refresh_interval`` seconds. Readers never wait for a reload: the
+    whole table is replaced at once when it finishes. If a reload fails, the
+    previous currencies are kept, and the error is logged and saved in
+    ``last_error``.
+    """
+
+    def __init__(
+        self,
+        currencies: BigCommerceCurrenciesV2API,
+        *,
+        refresh_interval: float | None = 3600.0,
+        timeout: float | None = None,
+    ):
+        """
+        :param currencies: The currencies resource, e.g.
+            ``bigcommerce.currencies_v2``.
+        :param refresh_interval: How often, in seconds, to reload currencies,
+            or ``None`` to only load them once.
+        :param timeout: A timeout for each request.
+        """
+        self._currencies_api = currencies
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+
+        self.currencies: dict[str, Currency] = {}
+        self.last_refreshed: float | None = None
+        self.last_error: Exception | None = None
+
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.refresh()
+
+        if refresh_interval is not None:
+            self._thread = threading.Thread(
+                target=self._refresh_periodically,
+                name='bigc-currency-refresh',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def refresh(self) -> None:
+        """Reload currencies from the API"""
+        currencies = [
+            Currency.from_api(data)
+            for data in self._currencies_api.all(timeout=self.timeout)
+        ]
+
+        # Replaced in one assignment, so readers see the old or the new table
+        self.currencies = {currency.code: currency for currency in currencies}
+        self.last_refreshed = time.monotonic()
+
+    def close(self) -> None:
+        """Stop refreshing in the background"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def get(self, currency_code: str) -> Currency:
+        try:
+            return self.currencies[currency_code]
+        except KeyError:
+            raise DoesNotExistError(f'No {currency_code} currency exists.') from None
+
+    @property
+    def default(self) -> Currency:
+        """The store's default currency"""
+        for currency in self.currencies.values():
+            if currency.is_default:
+                return currency
+
+        raise DoesNotExistError('The store has no default currency.')
+
+    def convert(
+        self, amount: Decimal | int | str, from_code: str, to_code: str
+    ) -> Decimal:
+        """Convert an amount between currencies, rounded for the target currency"""
+        return self.convert_many([amount], from_code, to_code)[0]
+
+    def convert_many(
+        self, amounts: Iterable[Decimal | int | str], from_code: str, to_code: str
+    ) -> list[Decimal]:
+        """Convert many amounts between the same currencies at once
+
+        Exchange rates are relative to the default currency, so amounts are
+        converted through it. Every amount is converted from the same
+        snapshot of rates, even if they're refreshed part way through.
+        """
+        currencies = self.currencies
+        try:
+            from_currency = currencies[from_code]
+            to_currency = currencies[to_code]
+        except KeyError as exc:
+            raise DoesNotExistError(f'No {exc.args[0]} currency exists.') from None
+
+        places = Decimal(1).scaleb(-to_currency.decimal_places)
+        multiply = _CONVERSION_CONTEXT.multiply
+        divide = _CONVERSION_CONTEXT.divide
+        to_rate = to_currency.exchange_rate
+        from_rate = from_currency.exchange_rate
+
+        return [
+            divide(multiply(Decimal(amount), to_rate), from_rate).quantize(
+                places, rounding=ROUND_HALF_UP
+            )
+            for amount in amounts
+        ]
+
+    def _refresh_periodically(self) -> None:
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as exc:
+                # Anything escaping would stop refreshing for good
+                logger.exception('Failed to refresh currencies')
+                self.last_error = exc
+            else:
+                self.last_error = None
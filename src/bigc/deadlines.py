@@ -0,0 +1,93 @@
+"""
+Time budgets for whole operations, spanning every request, retry and page
+they make.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from bigc.exceptions import DeadlineExceededError
+
+__all__ = ('Deadline', 'current_deadline', 'deadline')
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar(
+    'bigc_deadline', default=None
+)
+
+
+class Deadline:
+    """A point in time by which an operation must finish"""
+
+    def __init__(self, seconds: float):
+        """
+        :param seconds: The time budget, starting now.
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    def __repr__(self) -> str:
+        return f'<Deadline in {self.remaining():.3f}s>'
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline, which is negative once it has passed"""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        """Raise ``DeadlineExceededError`` if the deadline has passed"""
+        if self.expired:
+            raise DeadlineExceededError()
+
+    def cap_timeout(self, timeout: float | None) -> float:
+        """Shorten a timeout so that it ends by the deadline"""
+        self.check()
+
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    @classmethod
+    def resolve(cls, deadline: Deadline | float | None) -> Deadline | None:
+        """Get the deadline to use, from a ``deadline`` argument or the context
+
+        A number is a time budget in seconds, starting now. With no argument,
+        the deadline set by an enclosing ``deadline()`` block is used.
+        """
+        if deadline is None:
+            return _current_deadline.get()
+        if isinstance(deadline, Deadline):
+            return deadline
+
+        return cls(deadline)
+
+
+def current_deadline() -> Deadline | None:
+    """The deadline set by the enclosing ``deadline()`` block, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Limit every API call in the block to a shared time budget
+
+    Nested blocks can only shorten the deadline. The deadline doesn't follow
+    calls into other threads.
+    """
+    new_deadline = Deadline(seconds)
+    enclosing_deadline = _current_deadline.get()
+    if (
+        enclosing_deadline is not None
+        and enclosing_deadline.expires_at < new_deadline.expires_at
+    ):
+        new_deadline = enclosing_deadline
+
+    token = _current_deadline.set(new_deadline)
+    try:
+        yield new_deadline
+    finally:
+        _current_deadline.reset(token)
@@ -122,6 +122,14 @@ class TooManyRequestsError(BigCommerceClientError):
     DEFAULT_MESSAGE = "The store's rate limit has been exceeded."
     STATUS_CODE = 429
 
+    @property
+    def retry_after(self) -> float | None:
+        """Seconds until the rate limit resets, if BigCommerce reported it"""
+        try:
+            return int(self.response.headers['X-Rate-Limit-Time-Reset-Ms']) / 1000
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
 
 class BigCommerceServerError(BigCommerceException):
     """Exception class for 5xx errors from the BigCommerce API."""
@@ -156,6 +164,38 @@ class BigCommerceNetworkError(BigCommerceException):
     """Exception class for network-related errors."""
 
 
+class PoolTimeoutError(BigCommerceException):
+    """Exception class for requests that found no free pooled connection in time.
+
+    The request was never sent, so this isn't retried like a server timeout.
+    """
+
+    DEFAULT_MESSAGE = 'No connection to the API became free in time.'
+
+
+class DeadlineExceededError(BigCommerceException):
+    """Exception class for operations that ran out of time."""
+
+    DEFAULT_MESSAGE = 'The deadline passed before the operation finished.'
+
+    def __init__(
+        self,
+        message: str | None = None,
+        *,
+        resume_params: dict[str, Any] | None = None,
+        page_size: int | None = None,
+    ):
+        """
+        :param resume_params: For ``get_many``, the pagination parameters to
+            pass in ``params`` to continue from the page that wasn't fetched.
+        :param page_size: For ``get_many``, the page size to continue with.
+        """
+        super().__init__(message)
+
+        self.resume_params = resume_params
+        self.page_size = page_size
+
+
 __all__ = (
     'BadGatewayError',
     'BadRequestError',
@@ -164,6 +204,7 @@ __all__ = (
     'BigCommerceNetworkError',
     'BigCommerceServerError',
     'ConflictError',
+    'DeadlineExceededError',
     'DoesNotExistError',
     'EntityTooLargeError',
     'ForbiddenError',
@@ -172,6 +213,7 @@ __all__ = (
     'InternalServerError',
     'InvalidDataError',
     'LockedError',
+    'PoolTimeoutError',
     'ServiceUnavailableError',
     'TooManyRequestsError',
     'UnauthorizedError',
@@ -0,0 +1,186 @@
+"""
+Inject latency and failures into API traffic, to measure how code copes with
+a slow or unreliable API before it meets one.
+
+Pass a ``FaultInjectionTransport`` to ``BigCommerceAPI(transport=...)``. It
+wraps another transport, such as a ``bigc.cassettes.ReplayTransport`` to run
+offline.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+__all__ = ('FaultInjectionTransport',)
+
+_SERVER_ERRORS = {
+    500: 'Internal Server Error',
+    502: 'Bad Gateway',
+    503: 'Service Unavailable',
+    504: 'Gateway Timeout',
+}
+
+
+def _read_timeout(timeout: Any) -> float | None:
+    # requests allows a (connect, read) tuple
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+class FaultInjectionTransport(BaseAdapter):
+    """Delay requests, and fail some of them instead of sending them
+
+    Each fault is chosen at random with its own rate, from a generator seeded
+    with ``seed`` so that runs are repeatable. Delays honor the request's
+    timeout: a request that would take longer raises ``ReadTimeout`` once the
+    timeout has passed, like a real slow response. ``faults`` counts every
+    fault injected so far, by kind.
+    """
+
+    def __init__(
+        self,
+        transport: BaseAdapter | None = None,
+        *,
+        latency: float | Callable[[random.Random], float] = 0.0,
+        rate_limit_rate: float = 0.0,
+        rate_limit_reset: float = 1.0,
+        server_error_rate: float = 0.0,
+        server_error_burst: int = 1,
+        reset_rate: float = 0.0,
+        slow_body_rate: float = 0.0,
+        slow_body_delay: float = 5.0,
+        seed: int | None = None,
+    ):
+        """
+        :param transport: The transport sending requests that aren't failed,
+            by default a ``requests`` ``HTTPAdapter``.
+        :param latency: Seconds added to every request, or a function taking
+            a ``random.Random`` and returning them, e.g.
+            ``lambda r: r.lognormvariate(-3, 0.5)``.
+        :param rate_limit_rate: The fraction of requests answered with 429,
+            as when the rate limit's quota has run out.
+        :param rate_limit_reset: Seconds until the quota resets, according to
+            the 429 responses' headers.
+        :param server_error_rate: The fraction of requests starting a burst of
+            5xx responses.
+        :param server_error_burst: How many requests in a row each burst fails.
+        :param reset_rate: The fraction of requests whose connection is reset.
+        :param slow_body_rate: The fraction of responses whose body is delayed.
+        :param slow_body_delay: Seconds by which a slow body is delayed.
+        :param seed: Seeds the random faults.
+        """
+        super().__init__()
+        self.transport = transport or HTTPAdapter()
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.rate_limit_reset = rate_limit_reset
+        self.server_error_rate = server_error_rate
+        self.server_error_burst = server_error_burst
+        self.reset_rate = reset_rate
+        self.slow_body_rate = slow_body_rate
+        self.slow_body_delay = slow_body_delay
+
+        self.faults: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._burst_remaining = 0
+        self._lock = threading.Lock()
+
+    def send(
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        status = 500
+        with self._lock:
+            fault = self._choose_fault()
+            latency = (
+                self.latency(self._random) if callable(self.latency) else self.latency
+            )
+            if fault == 'slow_body':
+                latency += self.slow_body_delay
+            elif fault == 'server_error':
+                status = self._random.choice(list(_SERVER_ERRORS))
+            if fault is not None:
+                self.faults[fault] += 1
+
+        timeout = _read_timeout(kwargs.get('timeout'))
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise requests.ReadTimeout(request=request)
+        if latency > 0:
+            time.sleep(latency)
+
+        if fault == 'reset':
+            raise requests.ConnectionError(
+                ConnectionResetError('Connection reset by peer'), request=request
+            )
+        if fault == 'rate_limit':
+            return self._response(
+                request,
+                429,
+                'Too Many Requests',
+                {
+                    'X-Rate-Limit-Requests-Left': '0',
+                    'X-Rate-Limit-Requests-Quota': '150',
+                    'X-Rate-Limit-Time-Reset-Ms': str(
+                        int(self.rate_limit_reset * 1000)
+                    ),
+                    'X-Rate-Limit-Time-Window-Ms': '30000',
+                },
+            )
+        if fault == 'server_error':
+            return self._response(request, status, _SERVER_ERRORS[status])
+
+        return self.transport.send(request, **kwargs)
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def _choose_fault(self) -> str | None:
+        # Requests in a burst fail regardless of the other faults
+        if self._burst_remaining:
+            self._burst_remaining -= 1
+            return 'server_error'
+
+        roll = self._random.random()
+        for fault, rate in (
+            ('reset', self.reset_rate),
+            ('rate_limit', self.rate_limit_rate),
+            ('server_error', self.server_error_rate),
+            ('slow_body', self.slow_body_rate),
+        ):
+            if roll < rate:
+                if fault == 'server_error':
+                    self._burst_remaining = self.server_error_burst - 1
+                return fault
+            roll -= rate
+
+        return None
+
+    @staticmethod
+    def _response(
+        request: requests.PreparedRequest,
+        status: int,
+        title: str,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.reason = title
+        response.headers = CaseInsensitiveDict(
+            {'Content-Type': 'application/json'} | (headers or {})
+        )
+        response._content = json.dumps({'status': status, 'title': title}).encode()
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
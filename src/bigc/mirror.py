@@ -0,0 +1,378 @@
+"""
+A local SQLite copy of a store's orders, products and customers, for reads
+that don't need to leave the process.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from bigc.exceptions import DoesNotExistError
+from bigc.utils import parse_rfc2822_dates
+
+if TYPE_CHECKING:
+    from bigc.api import BigCommerceAPI
+
+__all__ = ('BigCommerceMirror',)
+
+# Rows written to the database in each transaction while syncing
+_SYNC_BATCH_SIZE = 500
+
+# Indexed columns, with each one's SQL type and how to get its value from a record
+Columns = dict[str, tuple[str, Callable[[dict[str, Any]], Any]]]
+# Filter parameters, with the column and comparison each one uses
+Filters = dict[str, tuple[str, str]]
+
+
+def _timestamp(value: datetime | str | None) -> int | None:
+    """Convert a date (or a date string from the API) to a UNIX timestamp"""
+    if value is None or value == '':
+        return None
+    if not isinstance(value, datetime):
+        value = parse_rfc2822_dates([value])[0]
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return int(value.timestamp())
+
+
+def _in_values(value: Any) -> list[Any]:
+    """Split a value for an ``:in`` filter, as a list or a comma separated string"""
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    if isinstance(value, Iterable):
+        return list(value)
+    return [value]
+
+
+class _MirroredResource(ABC):
+    """The records of one resource in the mirror, queried like the resource itself
+
+    ``all`` accepts the resource's own filter parameters, as long as they're
+    in ``filters``. Other parameters raise a ``ValueError``, since the mirror
+    can't answer them.
+    """
+
+    table: ClassVar[str]
+    columns: ClassVar[Columns]
+    filters: ClassVar[Filters]
+    date_columns: ClassVar[frozenset[str]] = frozenset(
+        {'date_created', 'date_modified'}
+    )
+
+    def __init__(self, mirror: BigCommerceMirror):
+        self._mirror = mirror
+
+    def get(self, record_id: int) -> dict[str, Any]:
+        """Get a record by its ID"""
+        rows = self._mirror._query(
+            f'SELECT data FROM {self.table} WHERE id = ?', (int(record_id),)
+        )
+        if not rows:
+            raise DoesNotExistError()
+
+        return json.loads(rows[0][0])
+
+    def all(self, *, params: dict[str, Any] | None = None) -> Iterator[dict[str, Any]]:
+        """Return an iterator for all records matching the filters, by ID"""
+        where, values = self._where(params or {})
+        rows = self._mirror._query(
+            f'SELECT data FROM {self.table}{where} ORDER BY id', values
+        )
+
+        return (json.loads(data) for (data,) in rows)
+
+    def count(self, *, params: dict[str, Any] | None = None) -> int:
+        """Count the records matching the filters"""
+        where, values = self._where(params or {})
+        rows = self._mirror._query(f'SELECT COUNT(*) FROM {self.table}{where}', values)
+        return rows[0][0]
+
+    def upsert(self, records: Iterable[dict[str, Any]]) -> int:
+        """Add or replace records, such as ones from webhooks or responses"""
+        rows = [
+            (
+                int(record['id']),
+                *(extract(record) for _, extract in self.columns.values()),
+                json.dumps(record),
+            )
+            for record in records
+        ]
+        placeholders = ', '.join('?' * (len(self.columns) + 2))
+        names = ', '.join(['id', *self.columns, 'data'])
+
+        with self._mirror._lock, self._mirror._connection as connection:
+            connection.executemany(
+                f'INSERT OR REPLACE INTO {self.table} ({names}) VALUES ({placeholders})',
+                rows,
+            )
+
+        return len(rows)
+
+    def delete(self, record_ids: Iterable[int]) -> None:
+        """Remove records, such as ones deleted in BigCommerce"""
+        with self._mirror._lock, self._mirror._connection as connection:
+            connection.executemany(
+                f'DELETE FROM {self.table} WHERE id = ?',
+                [(int(record_id),) for record_id in record_ids],
+            )
+
+    def last_modified(self) -> datetime | None:
+        """The latest modification date of any mirrored record"""
+        rows = self._mirror._query(f'SELECT MAX(date_modified) FROM {self.table}')
+        timestamp = rows[0][0]
+
+        return (
+            None
+            if timestamp is None
+            else datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        )
+
+    def sync(self, *, full: bool = False, timeout: float | None = None) -> int:
+        """Fetch records changed since the last sync, returning how many there were
+
+        The first sync, or a ``full`` one, fetches every record, and removes
+        mirrored records that no longer exist. Later syncs only fetch records
+        modified since the latest one in the mirror, so they can't see
+        deletions.
+        """
+        since = None if full else self.last_modified()
+        params = None if since is None else self._modified_since_params(since)
+
+        records = self._source_all(params=params, timeout=timeout)
+        seen_ids: set[int] = set()
+        num_records = 0
+
+        batch: list[dict[str, Any]] = []
+        for record in records:
+            seen_ids.add(int(record['id']))
+            batch.append(record)
+            if len(batch) >= _SYNC_BATCH_SIZE:
+                num_records += self.upsert(batch)
+                batch = []
+        num_records += self.upsert(batch)
+
+        if since is None:
+            mirrored_ids = {
+                record_id
+                for (record_id,) in self._mirror._query(f'SELECT id FROM {self.table}')
+            }
+            self.delete(mirrored_ids - seen_ids)
+
+        return num_records
+
+    def _create_table(self, connection: sqlite3.Connection) -> None:
+        definitions = ', '.join(
+            f'{name} {definition}' for name, (definition, _) in self.columns.items()
+        )
+        connection.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} '
+            f'(id INTEGER PRIMARY KEY, {definitions}, data TEXT NOT NULL)'
+        )
+        for name in self.columns:
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_{name} '
+                f'ON {self.table} ({name})'
+            )
+
+    def _where(self, params: dict[str, Any]) -> tuple[str, list[Any]]:
+        conditions = []
+        values: list[Any] = []
+
+        for param, value in params.items():
+            try:
+                column, comparison = self.filters[param]
+            except KeyError:
+                raise ValueError(
+                    f'{param} is not a filter supported by the mirror'
+                ) from None
+
+            convert = _timestamp if column in self.date_columns else lambda v: v
+
+            if comparison == 'in':
+                in_values = [convert(v) for v in _in_values(value)]
+                conditions.append(f'{column} IN ({", ".join("?" * len(in_values))})')
+                values.extend(in_values)
+            else:
+                conditions.append(f'{column} {comparison} ?')
+                values.append(convert(value))
+
+        if not conditions:
+            return '', values
+
+        return ' WHERE ' + ' AND '.join(conditions), values
+
+    @abstractmethod
+    def _source_all(
+        self, *, params: dict[str, Any] | None, timeout: float | None
+    ) -> Iterator[dict[str, Any]]:
+        """Get records from the API, with the resource's own ``all``"""
+
+    @abstractmethod
+    def _modified_since_params(self, since: datetime) -> dict[str, Any]:
+        """Filter parameters for records modified since a date"""
+
+
+class MirroredOrdersV2(_MirroredResource):
+    table = 'orders'
+    columns: ClassVar[Columns] = {
+        'customer_id': ('INTEGER', lambda order: order.get('customer_id')),
+        'status_id': ('INTEGER', lambda order: order.get('status_id')),
+        'email': (
+            'TEXT COLLATE NOCASE',
+            lambda order: (order.get('billing_address') or {}).get('email'),
+        ),
+        'date_created': (
+            'INTEGER',
+            lambda order: _timestamp(order.get('date_created')),
+        ),
+        'date_modified': (
+            'INTEGER',
+            lambda order: _timestamp(order.get('date_modified')),
+        ),
+    }
+    filters: ClassVar[Filters] = {
+        'min_id': ('id', '>='),
+        'max_id': ('id', '<='),
+        'customer_id': ('customer_id', '='),
+        'status_id': ('status_id', '='),
+        'email': ('email', '='),
+        'min_date_created': ('date_created', '>='),
+        'max_date_created': ('date_created', '<='),
+        'min_date_modified': ('date_modified', '>='),
+        'max_date_modified': ('date_modified', '<='),
+    }
+
+    def _source_all(self, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        return self._mirror._api.orders_v2.all(**kwargs)
+
+    def _modified_since_params(self, since: datetime) -> dict[str, Any]:
+        return {'min_date_modified': format_datetime(since)}
+
+
+class MirroredProductsV3(_MirroredResource):
+    """Mirrored products, looked up by their own SKUs (not their variants')"""
+
+    table = 'products'
+    columns: ClassVar[Columns] = {
+        'sku': ('TEXT', lambda product: product.get('sku') or None),
+        'is_visible': ('INTEGER', lambda product: product.get('is_visible')),
+        'date_modified': (
+            'INTEGER',
+            lambda product: _timestamp(product.get('date_modified')),
+        ),
+    }
+    filters: ClassVar[Filters] = {
+        'id:in': ('id', 'in'),
+        'id:min': ('id', '>='),
+        'id:max': ('id', '<='),
+        'sku': ('sku', '='),
+        'sku:in': ('sku', 'in'),
+        'is_visible': ('is_visible', '='),
+        'date_modified:min': ('date_modified', '>='),
+        'date_modified:max': ('date_modified', '<='),
+    }
+
+    def _source_all(self, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        return self._mirror._api.products_v3.all(**kwargs)
+
+    def _modified_since_params(self, since: datetime) -> dict[str, Any]:
+        return {'date_modified:min': since.isoformat()}
+
+
+class MirroredCustomersV3(_MirroredResource):
+    table = 'customers'
+    columns: ClassVar[Columns] = {
+        'email': ('TEXT COLLATE NOCASE', lambda customer: customer.get('email')),
+        'customer_group_id': (
+            'INTEGER',
+            lambda customer: customer.get('customer_group_id'),
+        ),
+        'date_created': (
+            'INTEGER',
+            lambda customer: _timestamp(customer.get('date_created')),
+        ),
+        'date_modified': (
+            'INTEGER',
+            lambda customer: _timestamp(customer.get('date_modified')),
+        ),
+    }
+    filters: ClassVar[Filters] = {
+        'id:in': ('id', 'in'),
+        'email:in': ('email', 'in'),
+        'customer_group_id:in': ('customer_group_id', 'in'),
+        'date_created:min': ('date_created', '>='),
+        'date_created:max': ('date_created', '<='),
+        'date_modified:min': ('date_modified', '>='),
+        'date_modified:max': ('date_modified', '<='),
+    }
+
+    def _source_all(self, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        return self._mirror._api.customers_v3.all(**kwargs)
+
+    def _modified_since_params(self, since: datetime) -> dict[str, Any]:
+        return {'date_modified:min': since.isoformat()}
+
+
+class BigCommerceMirror:
+    """A copy of a store's orders, products and customers in a SQLite database
+
+    The mirrored resources have the same names as on ``BigCommerceAPI``, and
+    their ``get`` and ``all`` methods take the same IDs and filter parameters
+    as the real ones (for the filters that are indexed). Call ``sync``
+    periodically to fetch records modified since the last sync.
+    """
+
+    def __init__(self, api: BigCommerceAPI, path: str = ':memory:'):
+        """
+        :param api: The API to fill the mirror from.
+        :param path: The database file, kept in memory by default.
+        """
+        self._api = api
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        self.orders_v2 = MirroredOrdersV2(self)
+        self.products_v3 = MirroredProductsV3(self)
+        self.customers_v3 = MirroredCustomersV3(self)
+        self.resources: tuple[_MirroredResource, ...] = (
+            self.orders_v2,
+            self.products_v3,
+            self.customers_v3,
+        )
+
+        with self._lock, self._connection as connection:
+            for resource in self.resources:
+                resource._create_table(connection)
+
+    def sync(
+        self, *, full: bool = False, timeout: float | None = None
+    ) -> dict[str, int]:
+        """Sync every resource concurrently, see ``_MirroredResource.sync``
+
+        Returns the number of records fetched for each resource's table.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.resources)) as executor:
+            futures = {
+                resource.table: executor.submit(
+                    resource.sync, full=full, timeout=timeout
+                )
+                for resource in self.resources
+            }
+            return {table: future.result() for table, future in futures.items()}
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _query(self, sql: str, values: Iterable[Any] = ()) -> list[tuple]:
+        # The connection is shared between threads, so rows are read under the lock
+        with self._lock:
+            return self._connection.execute(sql, tuple(values)).fetchall()
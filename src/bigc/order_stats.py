@@ -0,0 +1,300 @@
+"""
+Compact, columnar order statistics for dashboards and reports.
+
+This module needs NumPy, which isn't installed with bigc.
+"""
+
+from __future__ import annotations
+
+import datetime
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+from bigc._concurrency import call_within_rate_limit
+from bigc.data import BigCommerceOrderStatus
+from bigc.utils import parse_rfc2822_dates
+
+if TYPE_CHECKING:
+    import numpy
+
+    from bigc.api import BigCommerceAPI
+
+__all__ = ('OrderGroup', 'OrderStats', 'fetch_order_stats')
+
+# Totals are stored as integer cents
+_TOTAL_SCALE = 100
+_SECONDS_PER_DAY = 86_400
+
+GroupKey = Literal['status', 'channel', 'day']
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required for order stats') from None
+
+    return numpy
+
+
+def _total_in_cents(total: str | float | None) -> int:
+    """Rounded half up, like ``Decimal`` amounts elsewhere, rather than to even"""
+    cents = Decimal(str(total or 0)) * _TOTAL_SCALE
+    return int(cents.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class OrderGroup(NamedTuple):
+    key: Any
+    count: int
+    total: Decimal
+
+
+class OrderStats:
+    """The fields of many orders needed for statistics, as NumPy arrays
+
+    Each order takes about 30 bytes: IDs and timestamps (UNIX seconds) are
+    64-bit integers, totals (including tax) are 64-bit integer cents, and
+    statuses and channels are small integers.
+    """
+
+    def __init__(
+        self,
+        ids: numpy.ndarray,
+        status_ids: numpy.ndarray,
+        channel_ids: numpy.ndarray,
+        totals: numpy.ndarray,
+        dates_created: numpy.ndarray,
+        dates_modified: numpy.ndarray,
+    ):
+        self.ids = ids
+        self.status_ids = status_ids
+        self.channel_ids = channel_ids
+        self.totals = totals
+        self.dates_created = dates_created
+        self.dates_modified = dates_modified
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def empty(cls) -> OrderStats:
+        np = _numpy()
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.uint8),
+            np.empty(0, dtype=np.uint32),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_orders(
+        cls, orders: Iterable[dict[str, Any]], *, chunk_size: int = 10_000
+    ) -> OrderStats:
+        """Read orders (as returned by ``orders_v2.all``) into arrays
+
+        Orders are converted in chunks, so only ``chunk_size`` order dicts
+        are held at once.
+        """
+        chunks = []
+        chunk: list[dict[str, Any]] = []
+
+        for order in orders:
+            chunk.append(order)
+            if len(chunk) >= chunk_size:
+                chunks.append(cls._from_chunk(chunk))
+                chunk = []
+        if chunk:
+            chunks.append(cls._from_chunk(chunk))
+
+        return cls.concatenate(chunks)
+
+    @classmethod
+    def _from_chunk(cls, orders: list[dict[str, Any]]) -> OrderStats:
+        np = _numpy()
+
+        def timestamps(field: str) -> numpy.ndarray:
+            return parse_rfc2822_dates(
+                (order.get(field) for order in orders), as_numpy=True
+            ).view(np.int64)
+
+        totals = np.array(
+            [_total_in_cents(order.get('total_inc_tax')) for order in orders],
+            dtype=np.int64,
+        )
+
+        return cls(
+            np.array([order['id'] for order in orders], dtype=np.int64),
+            np.array([order['status_id'] for order in orders], dtype=np.uint8),
+            np.array(
+                [order.get('channel_id') or 1 for order in orders], dtype=np.uint32
+            ),
+            totals,
+            timestamps('date_created'),
+            timestamps('date_modified'),
+        )
+
+    @classmethod
+    def concatenate(cls, stats: Iterable[OrderStats]) -> OrderStats:
+        """Combine several sets of stats into one"""
+        np = _numpy()
+
+        stats = [s for s in stats if len(s)]
+        if not stats:
+            return cls.empty()
+        if len(stats) == 1:
+            return stats[0]
+
+        return cls(
+            *(
+                np.concatenate([getattr(s, name) for s in stats])
+                for name in (
+                    'ids',
+                    'status_ids',
+                    'channel_ids',
+                    'totals',
+                    'dates_created',
+                    'dates_modified',
+                )
+            )
+        )
+
+    def filter(
+        self,
+        *,
+        status_ids: Iterable[int] | None = None,
+        channel_ids: Iterable[int] | None = None,
+        created_min: datetime.datetime | None = None,
+        created_max: datetime.datetime | None = None,
+    ) -> OrderStats:
+        """Return the stats for only the orders matching every given filter"""
+        np = _numpy()
+
+        mask = np.ones(len(self), dtype=bool)
+        if status_ids is not None:
+            mask &= np.isin(self.status_ids, list(status_ids))
+        if channel_ids is not None:
+            mask &= np.isin(self.channel_ids, list(channel_ids))
+        if created_min is not None:
+            mask &= self.dates_created >= int(created_min.timestamp())
+        if created_max is not None:
+            mask &= self.dates_created <= int(created_max.timestamp())
+
+        return self._select(mask)
+
+    def total(self) -> Decimal:
+        return Decimal(int(self.totals.sum())) / _TOTAL_SCALE
+
+    def group_by(self, key: GroupKey) -> list[OrderGroup]:
+        """Count orders and sum their totals by status, channel, or day created
+
+        Groups are sorted by key. Status keys are ``BigCommerceOrderStatus``
+        members, and day keys are UTC dates.
+        """
+        np = _numpy()
+
+        if key == 'status':
+            values = self.status_ids
+        elif key == 'channel':
+            values = self.channel_ids
+        elif key == 'day':
+            values = self.dates_created // _SECONDS_PER_DAY
+        else:
+            raise ValueError(f'Cannot group orders by {key!r}')
+
+        keys, inverse = np.unique(values, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(keys))
+        totals = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(totals, inverse, self.totals)
+
+        return [
+            OrderGroup(
+                self._group_key(key, int(value)),
+                int(count),
+                Decimal(int(total)) / _TOTAL_SCALE,
+            )
+            for value, count, total in zip(keys, counts, totals)
+        ]
+
+    def count_by_status(self) -> dict[BigCommerceOrderStatus, int]:
+        return {group.key: group.count for group in self.group_by('status')}
+
+    def status_transitions(
+        self, previous: OrderStats
+    ) -> dict[tuple[BigCommerceOrderStatus, BigCommerceOrderStatus], int]:
+        """Count orders whose status changed since an earlier snapshot"""
+        np = _numpy()
+
+        _, current_indexes, previous_indexes = np.intersect1d(
+            self.ids, previous.ids, assume_unique=True, return_indices=True
+        )
+        before = previous.status_ids[previous_indexes]
+        after = self.status_ids[current_indexes]
+        changed = before != after
+
+        # Encode each (before, after) pair as one integer to count them together
+        pairs, counts = np.unique(
+            before[changed].astype(np.uint16) * 256 + after[changed],
+            return_counts=True,
+        )
+
+        return {
+            (
+                BigCommerceOrderStatus(int(pair) // 256),
+                BigCommerceOrderStatus(int(pair) % 256),
+            ): int(count)
+            for pair, count in zip(pairs, counts)
+        }
+
+    def _select(self, mask: numpy.ndarray) -> OrderStats:
+        return OrderStats(
+            self.ids[mask],
+            self.status_ids[mask],
+            self.channel_ids[mask],
+            self.totals[mask],
+            self.dates_created[mask],
+            self.dates_modified[mask],
+        )
+
+    @staticmethod
+    def _group_key(key: GroupKey, value: int) -> Any:
+        if key == 'status':
+            return BigCommerceOrderStatus(value)
+        if key == 'day':
+            return datetime.date(1970, 1, 1) + datetime.timedelta(days=value)
+        return value
+
+
+def fetch_order_stats(
+    api: BigCommerceAPI,
+    *,
+    status_ids: Iterable[int] | None = None,
+    params: dict[str, Any] | None = None,
+    max_workers: int = 4,
+    timeout: float | None = None,
+) -> OrderStats:
+    """Fetch orders into ``OrderStats``, with one concurrent scan per status
+
+    :param status_ids: The statuses to fetch, by default every status.
+    :param params: Extra filters for every scan, e.g. ``min_date_created``.
+    :param max_workers: The most statuses to scan at once.
+    """
+    _numpy()
+
+    if status_ids is None:
+        status_ids = list(BigCommerceOrderStatus)
+
+    def fetch_status(status_id: int) -> OrderStats:
+        status_params = {**(params or {}), 'status_id': int(status_id)}
+        return call_within_rate_limit(
+            api.rate_limit,
+            lambda: OrderStats.from_orders(
+                api.orders_v2.all(params=status_params, timeout=timeout)
+            ),
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return OrderStats.concatenate(executor.map(fetch_status, status_ids))
@@ -0,0 +1,344 @@
+"""
+A bounded pool of HTTP sessions, shared by every thread using an API instance.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+from bigc.exceptions import BigCommerceException
+
+if TYPE_CHECKING:
+    import requests
+    from requests.adapters import BaseAdapter
+
+__all__ = ('PoolStats', 'SessionPool')
+
+
+class PoolStats(NamedTuple):
+    max_size: int
+    # Sessions currently making a request
+    in_use: int
+    # Open sessions waiting to be reused
+    idle: int
+    # Totals since the pool was created
+    num_created: int
+    num_reaped: int
+    num_waits: int
+    num_probe_failures: int
+
+    @property
+    def utilization(self) -> float:
+        """The fraction of the pool currently making requests"""
+        return self.in_use / self.max_size
+
+
+class SessionPool:
+    """Sessions that are lent to one request at a time, up to ``max_size``
+
+    ``requests.Session`` isn't thread-safe, so each request borrows a session
+    for its duration and returns it afterwards. Sessions (and the connections
+    they keep alive) are only opened when every existing one is busy, so the
+    pool grows with the number of concurrent requests, not with the number
+    of threads. When ``max_size`` sessions are busy, further requests wait.
+
+    Sessions that go unused for ``idle_timeout`` seconds are closed the next
+    time a session is borrowed, or when ``reap()`` is called.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 16,
+        *,
+        idle_timeout: float | None = 60.0,
+        acquire_timeout: float | None = 10.0,
+        transport: BaseAdapter | None = None,
+    ):
+        """
+        :param max_size: The most sessions, and so connections, open at once.
+        :param idle_timeout: How long, in seconds, an unused session is kept
+            open, or ``None`` to keep sessions until the pool is closed.
+        :param acquire_timeout: How long, in seconds, to wait for a session
+            when all of them are busy, unless told otherwise, or ``None`` to
+            wait indefinitely. This is separate from requests' timeouts, so
+            waiting doesn't eat into them.
+        :param transport: A ``requests`` transport adapter to send every
+            request through instead of the network, such as a
+            ``bigc.cassettes.ReplayTransport``. It's shared by every session,
+            and closed with the pool.
+        """
+        if max_size < 1:
+            raise ValueError('max_size must be 1 or greater')
+
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.transport = transport
+
+        # Idle sessions, with when they were returned, most recently used last
+        self._idle: deque[tuple[requests.Session, float]] = deque()
+        self._in_use = 0
+        self._num_created = 0
+        self._num_reaped = 0
+        self._num_waits = 0
+        self._num_probe_failures = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        self._stopped = threading.Event()
+        self._keep_alive: threading.Thread | None = None
+        self._keep_alive_timeout: float | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> PoolStats:
+        with self._condition:
+            return PoolStats(
+                max_size=self.max_size,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                num_created=self._num_created,
+                num_reaped=self._num_reaped,
+                num_waits=self._num_waits,
+                num_probe_failures=self._num_probe_failures,
+            )
+
+    def session(self, timeout: float | None = None) -> _Borrowed:
+        """Borrow a session for the duration of the block
+
+        :param timeout: The longest, in seconds, to wait for a session, by
+            default ``acquire_timeout``.
+        :raises TimeoutError: If no session became free in time.
+        """
+        return _Borrowed(self, timeout)
+
+    def warmup(
+        self,
+        probe: Callable[[requests.Session], None],
+        connections: int,
+        *,
+        timeout: float | None = None,
+    ) -> None:
+        """Open (or check) connections ahead of time, so requests don't wait
+
+        ``connections`` sessions are borrowed at once, so that each is a
+        separate connection, and ``probe`` makes a request through each of
+        them concurrently. Errors from ``probe`` are raised.
+
+        :param timeout: The longest, in seconds, to wait for each session, by
+            default ``acquire_timeout``.
+        """
+        if not 1 <= connections <= self.max_size:
+            raise ValueError('connections must be between 1 and max_size')
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        sessions: list[requests.Session] = []
+        try:
+            for _ in range(connections):
+                sessions.append(self._acquire(timeout))
+
+            with ThreadPoolExecutor(max_workers=connections) as executor:
+                # Consumed to raise the first error
+                list(executor.map(probe, sessions))
+        finally:
+            for session in sessions:
+                self._release(session)
+
+    def start_keep_alive(
+        self,
+        probe: Callable[[requests.Session], None],
+        interval: float,
+        *,
+        timeout: float | None = None,
+    ) -> None:
+        """Check idle connections in the background, so they're kept open
+
+        Every ``interval`` seconds, ``probe`` makes a request through each
+        session that has been idle for at least that long. This stops the
+        server from closing idle connections, and sessions that fail the
+        check are closed rather than reused. Checking also keeps sessions
+        from being reaped. It stops when the pool is closed.
+
+        :param timeout: The longest, in seconds, that ``probe`` takes, which
+            is also the longest that closing the pool waits for a check in
+            progress.
+        """
+        if self._keep_alive is not None:
+            raise RuntimeError('Keep-alive has already been started.')
+
+        self._keep_alive_timeout = timeout
+        self._keep_alive = threading.Thread(
+            target=self._keep_alive_periodically,
+            args=(probe, interval),
+            name='bigc-keep-alive',
+            daemon=True,
+        )
+        self._keep_alive.start()
+
+    def close(self) -> None:
+        """Close every session, and stop keep-alive
+
+        Sessions in use are closed once their requests finish.
+        """
+        with self._condition:
+            self._closed = True
+            idle = [session for session, _ in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        self._stopped.set()
+
+        for session in idle:
+            self._close_session(session)
+
+        if self.transport is not None:
+            self.transport.close()
+
+        if self._keep_alive is not None:
+            # Bounded, in case a check hangs; the thread is a daemon
+            self._keep_alive.join(self._keep_alive_timeout)
+
+    def reap(self) -> int:
+        """Close sessions idle for longer than ``idle_timeout``, returning how many"""
+        if self.idle_timeout is None:
+            return 0
+
+        expired = []
+        cutoff = time.monotonic() - self.idle_timeout
+        # Checked without the lock first, as this runs before every request.
+        # Another thread can take the last idle session in between.
+        try:
+            if self._idle[0][1] > cutoff:
+                return 0
+        except IndexError:
+            return 0
+
+        with self._condition:
+            # The least recently used sessions are first
+            while self._idle and self._idle[0][1] <= cutoff:
+                expired.append(self._idle.popleft()[0])
+            self._num_reaped += len(expired)
+
+        for session in expired:
+            self._close_session(session)
+
+        return len(expired)
+
+    def _acquire(self, timeout: float | None) -> requests.Session:
+        # Imported when first needed, as it's slow to import
+        import requests
+
+        if timeout is None:
+            timeout = self.acquire_timeout
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        self.reap()
+
+        with self._condition:
+            waited = False
+            while True:
+                if self._closed:
+                    raise RuntimeError('The connection pool is closed.')
+
+                if self._idle:
+                    # Reuse the most recently used session, whose connection
+                    # is the least likely to have been dropped
+                    session, _ = self._idle.pop()
+                    break
+
+                if self._in_use < self.max_size:
+                    session = requests.Session()
+                    if self.transport is not None:
+                        session.mount('https://', self.transport)
+                    self._num_created += 1
+                    break
+
+                if not waited:
+                    waited = True
+                    self._num_waits += 1
+
+                remaining = (
+                    None if give_up_at is None else give_up_at - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError('No connection became free in time.')
+                self._condition.wait(remaining)
+
+            self._in_use += 1
+            return session
+
+    def _release(self, session: requests.Session) -> None:
+        with self._condition:
+            self._in_use -= 1
+            if not self._closed:
+                self._idle.append((session, time.monotonic()))
+                self._condition.notify()
+                return
+
+        self._close_session(session)
+
+    def _close_session(self, session: requests.Session) -> None:
+        # The shared transport is closed with the pool instead
+        if self.transport is not None:
+            session.adapters.pop('https://', None)
+
+        session.close()
+
+    def _discard(self, session: requests.Session) -> None:
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
+
+        self._close_session(session)
+
+    def _keep_alive_periodically(
+        self, probe: Callable[[requests.Session], None], interval: float
+    ) -> None:
+        while not self._stopped.wait(interval):
+            cutoff = time.monotonic() - interval
+            with self._condition:
+                # Borrowed, so no request uses them while they're checked
+                stale = [session for session, used in self._idle if used <= cutoff]
+                self._idle = deque(
+                    (session, used) for session, used in self._idle if used > cutoff
+                )
+                self._in_use += len(stale)
+
+            for session in stale:
+                if self._stopped.is_set():
+                    # Closed, rather than checked, as the pool is closed
+                    self._release(session)
+                    continue
+
+                try:
+                    probe(session)
+                except BigCommerceException:
+                    with self._condition:
+                        self._num_probe_failures += 1
+                    self._discard(session)
+                else:
+                    self._release(session)
+
+
+class _Borrowed:
+    """Borrows a session for the duration of a block
+
+    A class rather than a generator, as it's entered for every request.
+    """
+
+    __slots__ = ('pool', 'session', 'timeout')
+
+    def __init__(self, pool: SessionPool, timeout: float | None):
+        self.pool = pool
+        self.timeout = timeout
+
+    def __enter__(self) -> requests.Session:
+        self.session = self.pool._acquire(self.timeout)
+        return self.session
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.pool._release(self.session)
@@ -0,0 +1,202 @@
+"""
+Batched, cached product pricing on top of the pricing API.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from bigc.cache import TTLCache
+
+if TYPE_CHECKING:
+    from bigc.resources.pricing_v3 import BigCommercePricingV3API
+
+__all__ = ('PriceKey', 'PricingContext', 'PricingService')
+
+# The most items to request prices for at once
+MAX_PRICING_BATCH_SIZE = 50
+
+_MISSING = object()
+
+
+class PricingContext(NamedTuple):
+    """The parts of a pricing request shared by every item in it"""
+
+    customer_group_id: int
+    currency_code: str
+    channel_id: int
+
+
+class PriceKey(NamedTuple):
+    product_id: int
+    variant_id: int
+    customer_group_id: int
+    currency_code: str
+    channel_id: int
+
+
+class PricingService:
+    """Look up product prices, sharing requests between callers and caching results
+
+    Requests for the same prices from different threads at the same time are
+    merged, and items needing the same customer group, currency, and channel
+    are packed into as few requests as possible. Prices are cached, and can
+    be invalidated by product.
+    """
+
+    def __init__(
+        self,
+        pricing: BigCommercePricingV3API,
+        *,
+        ttl: float = 300.0,
+        max_size: int | None = 100_000,
+        max_batch_size: int = MAX_PRICING_BATCH_SIZE,
+        batch_delay: float = 0.002,
+        timeout: float | None = None,
+    ):
+        """
+        :param pricing: The pricing resource, e.g. ``bigcommerce.pricing_v3``.
+        :param ttl: How long, in seconds, prices are cached.
+        :param max_size: The most prices to cache.
+        :param max_batch_size: The most items to put in one request.
+        :param batch_delay: How long, in seconds, to wait for other callers'
+            items before sending a request.
+        :param timeout: A timeout for each request.
+        """
+        self._pricing = pricing
+        self.max_batch_size = max_batch_size
+        self.batch_delay = batch_delay
+        self.timeout = timeout
+
+        self.prices = TTLCache(ttl, max_size=max_size)
+        self._in_flight: dict[PriceKey, Future] = {}
+        self._pending: dict[PricingContext, list[PriceKey]] = {}
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get_prices(
+        self,
+        items: Iterable[tuple[int, int]],
+        *,
+        customer_group_id: int = 0,
+        currency_code: str = 'USD',
+        channel_id: int = 1,
+    ) -> dict[tuple[int, int], dict[str, Any] | None]:
+        """Get prices for many ``(product_id, variant_id)`` pairs
+
+        Returns the pricing API's result for each pair, or ``None`` for items
+        that BigCommerce didn't return a price for.
+        """
+        context = PricingContext(customer_group_id, currency_code, channel_id)
+        keys = {
+            PriceKey(int(product_id), int(variant_id), *context)
+            for product_id, variant_id in items
+        }
+
+        results: dict[PriceKey, dict[str, Any] | None] = {}
+        futures: dict[PriceKey, Future] = {}
+        is_leader = False
+
+        for key in keys:
+            cached = self.prices.get(key, _MISSING)
+            if cached is not _MISSING:
+                results[key] = cached
+
+        with self._lock:
+            for key in keys - results.keys():
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._in_flight[key] = Future()
+                    if context not in self._pending:
+                        self._pending[context] = []
+                        is_leader = True
+                    self._pending[context].append(key)
+
+                futures[key] = future
+
+        # The first caller to queue items for a context sends the requests
+        if is_leader:
+            if self.batch_delay:
+                time.sleep(self.batch_delay)
+            self._send_pending(context)
+
+        for key, future in futures.items():
+            results[key] = future.result()
+
+        return {
+            (key.product_id, key.variant_id): result for key, result in results.items()
+        }
+
+    def get_price(
+        self, product_id: int, variant_id: int, **kwargs: Any
+    ) -> dict[str, Any] | None:
+        """Get the price of one product variant, see ``get_prices``"""
+        return self.get_prices([(product_id, variant_id)], **kwargs)[
+            product_id, variant_id
+        ]
+
+    def invalidate(self, product_id: int | None = None) -> None:
+        """Drop cached prices for a product, or for every product"""
+        self._invalidations += 1
+        if product_id is None:
+            self.prices.clear()
+        else:
+            self.prices.invalidate_tag(int(product_id))
+
+    def _send_pending(self, context: PricingContext) -> None:
+        try:
+            while True:
+                with self._lock:
+                    keys = self._pending.get(context, [])[: self.max_batch_size]
+                    if not keys:
+                        # Later callers will have to send their own requests
+                        self._pending.pop(context, None)
+                        return
+                    del self._pending[context][: len(keys)]
+
+                self._send_batch(context, keys)
+        except BaseException as exc:
+            # Fail everything still queued, instead of leaving callers waiting
+            with self._lock:
+                for key in self._pending.pop(context, []):
+                    self._in_flight.pop(key).set_exception(exc)
+            raise
+
+    def _send_batch(self, context: PricingContext, keys: list[PriceKey]) -> None:
+        data = {
+            'channel_id': context.channel_id,
+            'currency_code': context.currency_code,
+            'customer_group_id': context.customer_group_id,
+            'items': [
+                {'product_id': key.product_id, 'variant_id': key.variant_id}
+                for key in keys
+            ],
+        }
+
+        invalidations = self._invalidations
+        try:
+            response = self._pricing.get_pricing(data, timeout=self.timeout)
+        except BaseException as exc:
+            with self._lock:
+                for key in keys:
+                    self._in_flight.pop(key).set_exception(exc)
+            raise
+
+        results = {
+            PriceKey(item['product_id'], item['variant_id'], *context): item
+            for item in response or []
+        }
+
+        for key in keys:
+            result = results.get(key)
+
+            # Prices fetched while an invalidation happened may be stale
+            if invalidations == self._invalidations:
+                self.prices.set(key, result, tags=[key.product_id])
+
+            with self._lock:
+                self._in_flight.pop(key).set_result(result)
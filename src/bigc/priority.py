@@ -0,0 +1,178 @@
+"""
+Priority lanes, so that interactive requests aren't held up by batch jobs
+sharing the same store's rate limit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bigc.api_client import RateLimitStatus
+    from bigc.deadlines import Deadline
+
+__all__ = ('Priority', 'RequestScheduler', 'current_priority', 'priority')
+
+
+class Priority(IntEnum):
+    """How urgent a request is"""
+
+    # Requests someone is waiting on, like loading a cart
+    HIGH = 0
+    # Requests that can wait, like exports and syncs
+    LOW = 1
+
+
+_current_priority: ContextVar[Priority | None] = ContextVar(
+    'bigc_priority', default=None
+)
+
+
+def current_priority() -> Priority | None:
+    """The priority set by the enclosing ``priority()`` block, if any"""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    """Make every API call in the block use a priority
+
+    The priority doesn't follow calls into other threads.
+    """
+    token = _current_priority.set(Priority(value))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RequestScheduler:
+    """Hold back low priority requests while high priority ones need the quota
+
+    High priority requests are never delayed. Low priority requests wait
+    while any high priority request is in progress, or while less than
+    ``reserved_headroom`` of the rate limit quota is left, so that it's kept
+    for high priority requests. To avoid starving batch jobs, a low priority
+    request waits for at most ``max_delay`` seconds.
+    """
+
+    def __init__(
+        self,
+        rate_limit: RateLimitStatus,
+        *,
+        default_priority: Priority = Priority.HIGH,
+        reserved_headroom: float = 0.2,
+        max_delay: float = 5.0,
+        poll_interval: float = 0.05,
+    ):
+        """
+        :param rate_limit: The store's rate limit status.
+        :param default_priority: The priority of requests that don't set one.
+        :param reserved_headroom: The fraction of the quota that low priority
+            requests leave for high priority ones.
+        :param max_delay: The longest, in seconds, that a low priority
+            request waits.
+        :param poll_interval: How often, in seconds, waiting requests check
+            the rate limit again.
+        """
+        self.rate_limit = rate_limit
+        self.default_priority = default_priority
+        self.reserved_headroom = reserved_headroom
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+
+        self.num_high_in_progress = 0
+        self.num_low_waiting = 0
+        self.num_delayed = 0
+        self._condition = threading.Condition(threading.Lock())
+
+    def resolve(self, value: Priority | None) -> Priority:
+        """Get the priority to use, from an argument, the context or the default"""
+        if type(value) is Priority:
+            return value
+        if value is not None:
+            return Priority(value)
+
+        # Not ``or``, as Priority.HIGH is 0
+        current = _current_priority.get()
+        return self.default_priority if current is None else current
+
+    def slot(
+        self, value: Priority | None = None, *, deadline: Deadline | None = None
+    ) -> _Slot:
+        """Wait for a request's turn, then hold it for the duration of the block"""
+        return _Slot(self, self.resolve(value), deadline)
+
+    def _enter(self, value: Priority, deadline: Deadline | None) -> None:
+        if value == Priority.LOW:
+            self._wait_for_turn(deadline)
+            return
+
+        with self._condition:
+            self.num_high_in_progress += 1
+
+    def _exit(self, value: Priority) -> None:
+        if value == Priority.LOW:
+            return
+
+        with self._condition:
+            self.num_high_in_progress -= 1
+            if self.num_low_waiting:
+                self._condition.notify_all()
+
+    def _must_wait(self) -> bool:
+        if self.num_high_in_progress:
+            return True
+
+        headroom = self.rate_limit.headroom
+        return headroom is not None and headroom < self.reserved_headroom
+
+    def _wait_for_turn(self, deadline: Deadline | None) -> None:
+        give_up_at = time.monotonic() + self.max_delay
+        if deadline is not None:
+            give_up_at = min(give_up_at, deadline.expires_at)
+
+        with self._condition:
+            if not self._must_wait():
+                return
+
+            self.num_delayed += 1
+            self.num_low_waiting += 1
+            try:
+                while self._must_wait():
+                    remaining = give_up_at - time.monotonic()
+                    if remaining <= 0:
+                        return
+
+                    # Headroom changes without notifying anyone, so keep checking
+                    self._condition.wait(min(remaining, self.poll_interval))
+            finally:
+                self.num_low_waiting -= 1
+
+
+class _Slot:
+    """Holds a request's turn
+
+    A class rather than a generator, as it's entered for every request.
+    """
+
+    __slots__ = ('deadline', 'priority', 'scheduler')
+
+    def __init__(
+        self, scheduler: RequestScheduler, value: Priority, deadline: Deadline | None
+    ):
+        self.scheduler = scheduler
+        self.priority = value
+        self.deadline = deadline
+
+    def __enter__(self) -> None:
+        self.scheduler._enter(self.priority, self.deadline)
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.scheduler._exit(self.priority)
@@ -0,0 +1,413 @@
+"""
+Refund many orders at once.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Literal
+
+from bigc._concurrency import call_within_rate_limit
+from bigc._find_existing import CLOCK_SKEW
+from bigc.exceptions import BigCommerceException, DoesNotExistError
+
+if TYPE_CHECKING:
+    from bigc.api import BigCommerceAPI
+    from bigc.resources.orders_v3 import BigCommerceOrdersV3API
+
+__all__ = (
+    'BulkRefundRunner',
+    'RefundIndex',
+    'RefundResult',
+    'export_refunds',
+    'first_refund_method',
+)
+
+RefundStatus = Literal['refunded', 'dry_run', 'invalid', 'failed', 'unknown', 'skipped']
+
+
+@dataclass
+class RefundResult:
+    """The outcome of refunding one order"""
+
+    order_id: int
+    status: RefundStatus
+    quote: dict[str, Any] | None = None
+    refund: dict[str, Any] | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'order_id': self.order_id,
+            'status': self.status,
+            'refund_id': None if self.refund is None else self.refund.get('id'),
+            'error': self.error,
+        }
+
+
+def first_refund_method(quote: dict[str, Any]) -> list[dict[str, Any]]:
+    """Pay the refund with the first refund method BigCommerce offers"""
+    return [
+        {
+            'provider_id': payment['provider_id'],
+            'amount': payment['amount'],
+            'offline': payment.get('offline', False),
+        }
+        for payment in quote['refund_methods'][0]
+    ]
+
+
+class _RefundJournal:
+    """An append-only record of refund progress, used to resume after a crash"""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self.last_entries: dict[int, dict[str, Any]] = {}
+        # The last submission of each order's refund, even if it failed since
+        self.last_submissions: dict[int, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A partly written line, from a crash
+                        continue
+                    self.last_entries[int(entry['order_id'])] = entry
+                    if entry['status'] == 'submitting':
+                        self.last_submissions[int(entry['order_id'])] = entry
+        except FileNotFoundError:
+            pass
+
+    def record(self, order_id: int, status: str, **extra: Any) -> None:
+        entry = {
+            'order_id': order_id,
+            'status': status,
+            'at': datetime.now(timezone.utc).isoformat(),
+            **extra,
+        }
+        with self._lock, open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class BulkRefundRunner:
+    """Quote and refund many orders concurrently
+
+    Each order is quoted, the quote is checked, and then the refund is
+    created, with many orders in progress at once. Results are yielded as
+    each order finishes.
+
+    If a journal file is given, progress is recorded there, and orders that
+    were already refunded are skipped when the same journal is used again.
+    A refund that was submitted, but not confirmed, because of a crash or
+    an error that leaves it unclear whether the refund was made, has the
+    status ``unknown``. When resuming, it's looked up before being tried
+    again, so no order is refunded twice.
+    """
+
+    def __init__(
+        self,
+        api: BigCommerceAPI,
+        *,
+        journal_path: str | os.PathLike | None = None,
+        dry_run: bool = False,
+        max_workers: int = 8,
+        max_refund_amount: Decimal | str | None = None,
+        validate_quote: Callable[[int, dict[str, Any]], str | None] | None = None,
+        choose_payments: Callable[
+            [dict[str, Any]], list[dict[str, Any]]
+        ] = first_refund_method,
+        retries: int = 2,
+        timeout: float | None = None,
+    ):
+        """
+        :param api: The API to refund orders through.
+        :param journal_path: A file to record progress in, for resuming.
+        :param dry_run: Get and check quotes, but don't create refunds.
+        :param max_workers: The most orders to work on at once.
+        :param max_refund_amount: Reject quotes refunding more than this.
+        :param validate_quote: Called with each order ID and quote. Return a
+            message to reject the quote, or ``None`` to accept it.
+        :param choose_payments: Picks the ``payments`` for a refund from a
+            quote's ``refund_methods``.
+        :param retries: Retries for each request. Refunds are retried safely
+            by checking for an existing refund first.
+        :param timeout: A timeout for each request.
+        """
+        self._api = api
+        self.journal_path = journal_path
+        self.dry_run = dry_run
+        self.max_workers = max_workers
+        self.max_refund_amount = (
+            None if max_refund_amount is None else Decimal(str(max_refund_amount))
+        )
+        self.validate_quote = validate_quote
+        self.choose_payments = choose_payments
+        self.retries = retries
+        self.timeout = timeout
+
+    def run(
+        self, refunds: Iterable[tuple[int, list[dict[str, Any]]]]
+    ) -> Iterator[RefundResult]:
+        """Refund each ``(order_id, items)`` pair, yielding results as they finish
+
+        ``items`` is the list of items to refund, in the format accepted by
+        ``orders_v3.create_refund``.
+        """
+        journal = (
+            None if self.journal_path is None else _RefundJournal(self.journal_path)
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight: set[Future] = set()
+
+            for order_id, items in refunds:
+                # Keep input streaming, instead of queueing every order
+                if len(in_flight) >= self.max_workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    yield from (future.result() for future in done)
+
+                in_flight.add(
+                    executor.submit(self._refund_order, order_id, items, journal)
+                )
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+
+    def _call(self, func: Callable[[], Any]) -> Any:
+        return call_within_rate_limit(self._api.rate_limit, func)
+
+    def _check_quote(self, order_id: int, quote: dict[str, Any]) -> str | None:
+        amount = Decimal(str(quote.get('total_refund_amount') or 0))
+        if amount <= 0:
+            return 'Nothing to refund.'
+        if self.max_refund_amount is not None and amount > self.max_refund_amount:
+            return f'Refund of {amount} is over the limit of {self.max_refund_amount}.'
+        if not quote.get('refund_methods'):
+            return 'No refund methods are available.'
+        if self.validate_quote is not None:
+            return self.validate_quote(order_id, quote)
+
+        return None
+
+    def _find_interrupted_refund(
+        self, order_id: int, items: list[dict[str, Any]], entry: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        created_after = datetime.fromisoformat(entry['at']) - CLOCK_SKEW
+        data: dict[str, Any] = {'items': items}
+        if entry.get('payments') is not None:
+            data['payments'] = entry['payments']
+
+        return self._call(
+            lambda: self._api.orders_v3.find_refund(
+                order_id,
+                data,
+                created_after=created_after,
+                timeout=self.timeout,
+                retries=self.retries,
+            )
+        )
+
+    def _refund_order(
+        self,
+        order_id: int,
+        items: list[dict[str, Any]],
+        journal: _RefundJournal | None,
+    ) -> RefundResult:
+        orders_v3 = self._api.orders_v3
+
+        def record(result: RefundResult) -> RefundResult:
+            if journal is not None and result.status != 'skipped':
+                journal.record(**result.as_dict())
+            return result
+
+        submitted = False
+        try:
+            entry = None if journal is None else journal.last_entries.get(order_id)
+            if entry is not None and entry['status'] == 'refunded':
+                return RefundResult(order_id, 'skipped')
+
+            # Whatever happened since, an earlier submission may have gone through
+            submission = (
+                None if journal is None else journal.last_submissions.get(order_id)
+            )
+            if submission is not None:
+                refund = self._find_interrupted_refund(order_id, items, submission)
+                if refund is not None:
+                    return record(RefundResult(order_id, 'refunded', refund=refund))
+
+            quote = self._call(
+                lambda: orders_v3.get_refund_quote(
+                    order_id, {'items': items}, timeout=self.timeout
+                )
+            )
+
+            error = self._check_quote(order_id, quote)
+            if error is not None:
+                return record(
+                    RefundResult(order_id, 'invalid', quote=quote, error=error)
+                )
+
+            if self.dry_run:
+                return RefundResult(order_id, 'dry_run', quote=quote)
+
+            data = {'items': items, 'payments': self.choose_payments(quote)}
+
+            if journal is not None:
+                journal.record(order_id, 'submitting', payments=data['payments'])
+
+            submitted = True
+            refund = self._call(
+                lambda: orders_v3.create_refund(
+                    order_id, data, timeout=self.timeout, retries=self.retries
+                )
+            )
+        except BigCommerceException as exc:
+            # Once submitted, even a rejection may follow a timed out attempt
+            # that went through
+            status: RefundStatus = 'unknown' if submitted else 'failed'
+            return record(RefundResult(order_id, status, error=str(exc)))
+
+        return record(RefundResult(order_id, 'refunded', quote=quote, refund=refund))
+
+
+class RefundIndex:
+    """Refunds seen by an export, by ID, with their order IDs
+
+    ``get_refund`` answers from the index when it can, and only asks the API
+    about refunds it hasn't seen.
+    """
+
+    def __init__(self, orders_v3: BigCommerceOrdersV3API | None = None):
+        """
+        :param orders_v3: The orders resource, e.g. ``bigcommerce.orders_v3``,
+            to look up refunds that aren't in the index.
+        """
+        self._orders_v3 = orders_v3
+        self.refunds: dict[int, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.refunds)
+
+    def __contains__(self, refund_id: int) -> bool:
+        return int(refund_id) in self.refunds
+
+    def add(self, refund: dict[str, Any]) -> None:
+        with self._lock:
+            self.refunds[int(refund['id'])] = refund
+
+    def get_order_id(self, refund_id: int) -> int:
+        """Get the ID of the order a refund belongs to"""
+        return int(self.get_refund(refund_id)['order_id'])
+
+    def get_refund(self, refund_id: int, **kwargs: Any) -> dict[str, Any]:
+        """Get a refund by ID, see ``orders_v3.get_refund``"""
+        refund = self.refunds.get(int(refund_id))
+        if refund is not None:
+            return refund
+
+        if self._orders_v3 is None:
+            raise DoesNotExistError()
+
+        refund = self._orders_v3.get_refund(refund_id, **kwargs)
+        self.add(refund)
+        return refund
+
+
+def _refund_windows(
+    start: datetime, end: datetime, window: timedelta
+) -> Iterator[tuple[datetime, datetime]]:
+    while start < end:
+        window_end = min(start + window, end)
+        yield start, window_end
+        start = window_end
+
+
+def export_refunds(
+    api: BigCommerceAPI,
+    start: datetime,
+    end: datetime | None = None,
+    *,
+    window: timedelta = timedelta(days=7),
+    max_workers: int = 8,
+    params: dict[str, Any] | None = None,
+    index: RefundIndex | None = None,
+    timeout: float | None = None,
+    retries: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Return an iterator for every refund created between ``start`` and ``end``
+
+    The time range is split into windows, which are fetched concurrently and
+    yielded in order, oldest window first. Only a few windows are fetched
+    ahead of the one being yielded. Each refund is added to ``index``, if
+    given.
+
+    :param start: The earliest creation date to export.
+    :param end: The latest creation date to export, by default now.
+    :param window: The length of time covered by each window's requests.
+    :param max_workers: The most windows to fetch at once.
+    :param params: Extra query parameters for every request.
+    """
+    if end is None:
+        end = datetime.now(timezone.utc)
+    if window <= timedelta(0):
+        raise ValueError('window must be positive')
+
+    def fetch_window(window_start: datetime, window_end: datetime) -> list[dict]:
+        window_params = {
+            **(params or {}),
+            'created:min': window_start.isoformat(),
+            'created:max': window_end.isoformat(),
+        }
+        return call_within_rate_limit(
+            api.rate_limit,
+            lambda: list(
+                api.orders_v3.all_refunds(
+                    params=window_params, timeout=timeout, retries=retries
+                )
+            ),
+        )
+
+    windows = _refund_windows(start, end, window)
+    # The bounds are inclusive, so refunds on a boundary are in two windows
+    window_ids: set[int] = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[Future] = deque()
+
+        def submit_next() -> None:
+            bounds = next(windows, None)
+            if bounds is not None:
+                pending.append(executor.submit(fetch_window, *bounds))
+
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while pending:
+            refunds = pending.popleft().result()
+            submit_next()
+
+            previous_window_ids, window_ids = window_ids, set()
+            for refund in refunds:
+                refund_id = int(refund['id'])
+                window_ids.add(refund_id)
+                if refund_id in previous_window_ids:
+                    continue
+
+                if index is not None:
+                    index.add(refund)
+                yield refund
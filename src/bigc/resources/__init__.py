@@ -3,15 +3,59 @@ Resources are organized by their URLs and API version. For example, all v3 endpo
 with `/customers` reside within `customers_v3.py`.
 """
 
-from .carts_v3 import BigCommerceCartsV3API
-from .categories_v3 import BigCommerceCategoriesV3API
-from .checkouts_v3 import BigCommerceCheckoutsV3API
-from .currencies_v2 import BigCommerceCurrenciesV2API
-from .customer_groups_v2 import BigCommerceCustomerGroupsV2API
-from .customers_v3 import BigCommerceCustomersV3API
-from .orders_v2 import BigCommerceOrdersV2API
-from .orders_v3 import BigCommerceOrdersV3API
-from .pricing_v3 import BigCommercePricingV3API
-from .product_variants_v3 import BigCommerceProductVariantsV3API
-from .products_v3 import BigCommerceProductsV3API
-from .webhooks_v3 import BigCommerceWebhooksV3API
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .carts_v3 import BigCommerceCartsV3API
+    from .categories_v3 import BigCommerceCategoriesV3API
+    from .checkouts_v3 import BigCommerceCheckoutsV3API
+    from .currencies_v2 import BigCommerceCurrenciesV2API
+    from .customer_groups_v2 import BigCommerceCustomerGroupsV2API
+    from .customers_v3 import BigCommerceCustomersV3API
+    from .orders_v2 import BigCommerceOrdersV2API
+    from .orders_v3 import BigCommerceOrdersV3API
+    from .pricing_v3 import BigCommercePricingV3API
+    from .product_variants_v3 import BigCommerceProductVariantsV3API
+    from .products_v3 import BigCommerceProductsV3API
+    from .webhooks_v3 import BigCommerceWebhooksV3API
+
+# Each resource's module, so that modules are only imported when used
+_RESOURCE_MODULES = {
+    'BigCommerceCartsV3API': 'carts_v3',
+    'BigCommerceCategoriesV3API': 'categories_v3',
+    'BigCommerceCheckoutsV3API': 'checkouts_v3',
+    'BigCommerceCurrenciesV2API': 'currencies_v2',
+    'BigCommerceCustomerGroupsV2API': 'customer_groups_v2',
+    'BigCommerceCustomersV3API': 'customers_v3',
+    'BigCommerceOrdersV2API': 'orders_v2',
+    'BigCommerceOrdersV3API': 'orders_v3',
+    'BigCommercePricingV3API': 'pricing_v3',
+    'BigCommerceProductVariantsV3API': 'product_variants_v3',
+    'BigCommerceProductsV3API': 'products_v3',
+    'BigCommerceWebhooksV3API': 'webhooks_v3',
+}
+
+__all__ = (
+    'BigCommerceCartsV3API',
+    'BigCommerceCategoriesV3API',
+    'BigCommerceCheckoutsV3API',
+    'BigCommerceCurrenciesV2API',
+    'BigCommerceCustomerGroupsV2API',
+    'BigCommerceCustomersV3API',
+    'BigCommerceOrdersV2API',
+    'BigCommerceOrdersV3API',
+    'BigCommercePricingV3API',
+    'BigCommerceProductVariantsV3API',
+    'BigCommerceProductsV3API',
+    'BigCommerceWebhooksV3API',
+)
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _RESOURCE_MODULES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    return getattr(importlib.import_module(f'.{module_name}', __name__), name)
@@ -17,10 +17,15 @@ class BigCommerceCartsV3API:
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        hedge: bool = False,
     ) -> dict[str, Any]:
         """Get a specific cart by its ID"""
         return self._api.get(
-            f'/carts/{cart_id}', params=params, timeout=timeout, retries=retries
+            f'/carts/{cart_id}',
+            params=params,
+            timeout=timeout,
+            retries=retries,
+            hedge=hedge,
         )
 
     def create(
@@ -17,10 +17,15 @@ class BigCommerceCheckoutsV3API:
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        hedge: bool = False,
     ) -> dict[str, Any]:
         """Get a specific checkout by its ID"""
         return self._api.get(
-            f'/checkouts/{checkout_id}', params=params, timeout=timeout, retries=retries
+            f'/checkouts/{checkout_id}',
+            params=params,
+            timeout=timeout,
+            retries=retries,
+            hedge=hedge,
         )
 
     def update(
@@ -183,8 +188,22 @@ class BigCommerceCheckoutsV3API:
         *,
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
+        retries: int | None = None,
     ) -> dict[str, Any]:
-        """Create an order"""
+        """Create an order
+
+        To retry safely, the checkout is checked for an order ID before each
+        retry.
+        """
+
+        def find_order() -> dict[str, Any] | None:
+            order_id = self.get(checkout_id, timeout=timeout).get('order_id')
+            return {'id': order_id} if order_id else None
+
         return self._api.post(
-            f'/checkouts/{checkout_id}/orders', params=params, timeout=timeout
+            f'/checkouts/{checkout_id}/orders',
+            params=params,
+            timeout=timeout,
+            retries=retries,
+            find_existing=find_order if retries else None,
         )
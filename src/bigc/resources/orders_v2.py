@@ -1,7 +1,10 @@
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from email.utils import format_datetime
 from typing import Any
 
+from bigc._find_existing import first_attempt_cutoff
 from bigc.api_client import BigCommerceV2APIClient
+from bigc.utils import parse_rfc2822_dates
 
 
 class BigCommerceOrdersV2API:
@@ -39,9 +42,28 @@ class BigCommerceOrdersV2API:
         *,
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
+        retries: int | None = None,
     ) -> dict[str, Any]:
-        """Create an order"""
-        return self._api.post('/orders', data=data, params=params, timeout=timeout)
+        """Create an order
+
+        To retry safely, ``data`` must include a unique ``external_id``, which
+        identifies the order. Before each retry, orders created since the
+        first attempt are checked for that ``external_id``.
+        """
+        find_existing = None
+        if retries:
+            if not data.get('external_id'):
+                raise ValueError('Orders need an external_id to be retried safely')
+            find_existing = self._make_order_finder(data, timeout=timeout)
+
+        return self._api.post(
+            '/orders',
+            data=data,
+            params=params,
+            timeout=timeout,
+            retries=retries,
+            find_existing=find_existing,
+        )
 
     def update(
         self,
@@ -177,11 +199,34 @@ class BigCommerceOrdersV2API:
         )
 
     def create_shipment(
-        self, order_id: int, data: dict[str, Any], *, timeout: float | None = None
+        self,
+        order_id: int,
+        data: dict[str, Any],
+        *,
+        timeout: float | None = None,
+        retries: int | None = None,
     ) -> dict[str, Any]:
-        """Creates an order shipment for the specified order"""
+        """Creates an order shipment for the specified order
+
+        To retry safely, ``data`` must include a ``tracking_number``, which
+        identifies the shipment. Before each retry, the order's shipments are
+        checked for one created since the first attempt with that number.
+        """
+        find_existing = None
+        if retries:
+            if not data.get('tracking_number'):
+                # Another shipment of the same items can't be told apart
+                raise ValueError(
+                    'Shipments need a tracking_number to be retried safely'
+                )
+            find_existing = self._make_shipment_finder(order_id, data, timeout=timeout)
+
         return self._api.post(
-            f'/orders/{order_id}/shipments', data=data, timeout=timeout
+            f'/orders/{order_id}/shipments',
+            data=data,
+            timeout=timeout,
+            retries=retries,
+            find_existing=find_existing,
         )
 
     def update_shipment(
@@ -231,3 +276,45 @@ class BigCommerceOrdersV2API:
             timeout=timeout,
             retries=retries,
         )
+
+    def _make_order_finder(
+        self, data: dict[str, Any], *, timeout: float | None
+    ) -> Callable[[], dict[str, Any] | None]:
+        params = {
+            'min_date_created': format_datetime(first_attempt_cutoff()),
+            'sort': 'date_created:desc',
+        }
+        if data.get('customer_id'):
+            params['customer_id'] = data['customer_id']
+
+        def find_order() -> dict[str, Any] | None:
+            for order in self.all(params=params, timeout=timeout):
+                if order.get('external_id') == data['external_id']:
+                    return order
+
+            return None
+
+        return find_order
+
+    def _make_shipment_finder(
+        self, order_id: int, data: dict[str, Any], *, timeout: float | None
+    ) -> Callable[[], dict[str, Any] | None]:
+        created_after = first_attempt_cutoff()
+
+        def find_shipment() -> dict[str, Any] | None:
+            shipments = list(self.all_shipments(order_id, timeout=timeout))
+            dates_created = parse_rfc2822_dates(
+                shipment.get('date_created') for shipment in shipments
+            )
+
+            for shipment, date_created in zip(shipments, dates_created):
+                if (
+                    date_created is not None
+                    and date_created >= created_after
+                    and shipment.get('tracking_number') == data['tracking_number']
+                ):
+                    return shipment
+
+            return None
+
+        return find_shipment
@@ -1,8 +1,12 @@
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from decimal import Decimal
 from typing import Any
 
+from bigc._find_existing import first_attempt_cutoff
 from bigc.api_client import BigCommerceV3APIClient
 from bigc.exceptions import DoesNotExistError
+from bigc.utils import parse_rfc2822_dates
 
 
 class BigCommerceOrdersV3API:
@@ -32,13 +36,25 @@ class BigCommerceOrdersV3API:
         *,
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
+        retries: int | None = None,
     ) -> dict[str, Any]:
-        """Create a refund for an order by ID"""
+        """Create a refund for an order by ID
+
+        To retry safely, the refund is identified by its items, amounts and
+        payments. Before each retry, the order's refunds created since the
+        first attempt are checked for a match.
+        """
+        find_existing = None
+        if retries:
+            find_existing = self._make_refund_finder(order_id, data, timeout=timeout)
+
         return self._api.post(
             f'/orders/{order_id}/payment_actions/refunds',
             data=data,
             params=params,
             timeout=timeout,
+            retries=retries,
+            find_existing=find_existing,
         )
 
     def all_refunds(
@@ -82,3 +98,75 @@ class BigCommerceOrdersV3API:
             )[0]
         except IndexError:
             raise DoesNotExistError() from None
+
+    def find_refund(
+        self,
+        order_id: int,
+        data: dict[str, Any],
+        *,
+        created_after: datetime,
+        timeout: float | None = None,
+        retries: int | None = None,
+    ) -> dict[str, Any] | None:
+        """Find a refund of an order matching a refund request
+
+        A refund matches if it refunds the same quantities or amounts of the
+        same items and, if ``data`` includes ``payments``, pays the same
+        amounts through the same providers. Only refunds created after
+        ``created_after`` are considered. Returns ``None`` if there isn't one.
+        """
+        items = _refund_items(data)
+        payments = None if data.get('payments') is None else _refund_payments(data)
+
+        refunds = list(self.all_refunds(order_id, timeout=timeout, retries=retries))
+        dates_created = parse_rfc2822_dates(refund.get('created') for refund in refunds)
+
+        for refund, created in zip(refunds, dates_created):
+            if (
+                created is not None
+                and created >= created_after
+                and _refund_items(refund) == items
+                and (payments is None or _refund_payments(refund) == payments)
+            ):
+                return refund
+
+        return None
+
+    def _make_refund_finder(
+        self, order_id: int, data: dict[str, Any], *, timeout: float | None
+    ) -> Callable[[], dict[str, Any] | None]:
+        created_after = first_attempt_cutoff()
+
+        return lambda: self.find_refund(
+            order_id, data, created_after=created_after, timeout=timeout
+        )
+
+
+def _decimal(value: Any) -> Decimal | None:
+    return None if value is None else Decimal(str(value))
+
+
+def _refund_item(item: dict[str, Any]) -> tuple:
+    quantity = item.get('quantity')
+    if quantity is not None:
+        return item['item_type'], int(item['item_id']), int(quantity), None
+
+    # Items refunded by amount, which requests give as amount, and refunds
+    # as requested_amount
+    amount = item.get('amount', item.get('requested_amount'))
+    return item['item_type'], int(item['item_id']), None, _decimal(amount)
+
+
+def _refund_items(refund: dict[str, Any]) -> list[tuple]:
+    return sorted(
+        (_refund_item(item) for item in refund.get('items') or []),
+        # None can't be compared with numbers
+        key=lambda item: (item[0], item[1], item[2] or 0, item[3] or 0),
+    )
+
+
+def _refund_payments(refund: dict[str, Any]) -> list[tuple]:
+    return sorted(
+        (payment['provider_id'], _decimal(payment['amount']))
+        for payment in refund.get('payments') or []
+    )
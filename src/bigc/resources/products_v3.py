@@ -1,7 +1,59 @@
-from collections.abc import Iterator
+from __future__ import annotations
+
+import contextvars
+import itertools
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
 from typing import Any
 
+from bigc._concurrency import call_within_rate_limit
+from bigc._find_existing import first_attempt_cutoff
 from bigc.api_client import BigCommerceV3APIClient
+from bigc.exceptions import (
+    BigCommerceClientError,
+    BigCommerceException,
+    TooManyRequestsError,
+)
+from bigc.utils import parse_rfc2822_dates
+
+# The most products BigCommerce accepts in one batch update
+BATCH_UPDATE_SIZE = 10
+# The most product IDs deleted per request, keeping the query string short
+BATCH_DELETE_SIZE = 250
+
+
+@dataclass
+class ProductBatchError:
+    """A product that couldn't be created, updated or deleted"""
+
+    # The product's data, or its ID when deleting
+    product: dict[str, Any] | int
+    error: BigCommerceException
+
+
+@dataclass
+class ProductBatchResult:
+    """The outcome of a batch operation, in the order products were given
+
+    ``succeeded`` holds the created or updated products, or the deleted IDs.
+    """
+
+    succeeded: list[Any] = field(default_factory=list)
+    failed: list[ProductBatchError] = field(default_factory=list)
+
+
+def _error_from_data(error_data: dict[str, Any]) -> BigCommerceException:
+    """Build the exception for one of the errors in a ``207`` response"""
+    message, errors = BigCommerceException.extract_error_message(error_data)
+    status_code = error_data.get('status') or 422
+    exc_class = BigCommerceException.get_exc_class_for_status_code(status_code)
+    return exc_class(message=message, status_code=status_code, errors=errors)
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
 
 
 class BigCommerceProductsV3API:
@@ -27,6 +79,7 @@ class BigCommerceProductsV3API:
         params: dict[str, Any] | None = None,
         timeout: float | None = None,
         retries: int | None = None,
+        hedge: bool = False,
     ) -> dict[str, Any]:
         """Get a specific product by its ID"""
         return self._api.get(
@@ -34,6 +87,7 @@ class BigCommerceProductsV3API:
             params=params,
             timeout=timeout,
             retries=retries,
+            hedge=hedge,
         )
 
     def create(
@@ -48,6 +102,38 @@ class BigCommerceProductsV3API:
             '/catalog/products', data=data, params=params, timeout=timeout
         )
 
+    def create_many(
+        self,
+        data: Iterable[dict[str, Any]],
+        *,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        retries: int = 2,
+        max_workers: int = 4,
+    ) -> ProductBatchResult:
+        """Create many products concurrently
+
+        BigCommerce creates one product per request. Before a creation is
+        retried, the product is looked up by its (unique) name, so it's
+        never created twice. Only a product created since the first attempt
+        (with the same SKU, if one is given) counts. Otherwise, this works
+        like ``update_many``.
+        """
+
+        def create(batch: list[dict[str, Any]]) -> ProductBatchResult:
+            product = batch[0]
+            created = self._api.post(
+                '/catalog/products',
+                data=product,
+                params=params,
+                timeout=timeout,
+                retries=retries,
+                find_existing=self._make_product_finder(product, timeout=timeout),
+            )
+            return ProductBatchResult([created])
+
+        return self._run_batches(create, data, 1, max_workers)
+
     def update(
         self,
         product_id: int,
@@ -66,6 +152,40 @@ class BigCommerceProductsV3API:
             retries=retries,
         )
 
+    def update_many(
+        self,
+        data: Iterable[dict[str, Any]],
+        *,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        retries: int = 2,
+        max_workers: int = 4,
+    ) -> ProductBatchResult:
+        """Update many products, each of which must include its ``id``
+
+        Products are sent in batches of ``BATCH_UPDATE_SIZE``, up to
+        ``max_workers`` batches at once, within the rate limit. Batches are
+        retried after 429s, and after server or network errors up to
+        ``retries`` times. A batch rejected for any other reason is sent
+        again one product at a time, so the rest of the batch still succeeds.
+        Products that BigCommerce reports as failed in a ``207 Multi-Status``
+        response fail with the errors it gives. Errors are reported per
+        product, rather than raised.
+        """
+
+        def update(batch: list[dict[str, Any]]) -> ProductBatchResult:
+            response = self._api.put(
+                '/catalog/products',
+                data=batch,
+                params=params,
+                timeout=timeout,
+                retries=retries,
+                boxed=True,
+            )
+            return self._partial_result(batch, response)
+
+        return self._run_batches(update, data, BATCH_UPDATE_SIZE, max_workers)
+
     def delete(
         self,
         product_id: int,
@@ -77,3 +197,135 @@ class BigCommerceProductsV3API:
         return self._api.delete(
             f'/catalog/products/{product_id}', timeout=timeout, retries=retries
         )
+
+    def delete_many(
+        self,
+        product_ids: Iterable[int],
+        *,
+        timeout: float | None = None,
+        retries: int = 2,
+        max_workers: int = 4,
+    ) -> ProductBatchResult:
+        """Delete many products by their IDs, like ``update_many``
+
+        IDs are sent in batches of ``BATCH_DELETE_SIZE``.
+        """
+
+        def delete(batch: list[int]) -> ProductBatchResult:
+            self._api.delete(
+                '/catalog/products',
+                params={'id:in': batch},
+                timeout=timeout,
+                retries=retries,
+            )
+            return ProductBatchResult(batch)
+
+        return self._run_batches(delete, product_ids, BATCH_DELETE_SIZE, max_workers)
+
+    def _make_product_finder(
+        self, data: dict[str, Any], *, timeout: float | None
+    ) -> Callable[[], dict[str, Any] | None]:
+        created_after = first_attempt_cutoff()
+
+        def find_product() -> dict[str, Any] | None:
+            products = self._api.get(
+                '/catalog/products', params={'name': data['name']}, timeout=timeout
+            )
+            dates_created = parse_rfc2822_dates(
+                product.get('date_created') for product in products
+            )
+
+            for product, date_created in zip(products, dates_created):
+                # A product that already had the name isn't the one created
+                if date_created is None or date_created < created_after:
+                    continue
+                if data.get('sku') and product.get('sku') != data['sku']:
+                    continue
+                return product
+
+            return None
+
+        return find_product
+
+    @staticmethod
+    def _partial_result(
+        batch: list[dict[str, Any]], response: dict[str, Any]
+    ) -> ProductBatchResult:
+        """Split a batch update's response into the products updated and not
+
+        A ``207 Multi-Status`` response only includes the updated products,
+        with an error for each of the others.
+        """
+        updated = response.get('data') or []
+        updated_ids = {product['id'] for product in updated}
+        missing = [product for product in batch if product['id'] not in updated_ids]
+        errors_data = response.get('errors') or []
+
+        if len(errors_data) == len(missing):
+            errors = [_error_from_data(error_data) for error_data in errors_data]
+        else:
+            # The errors can't be matched to products, so each gets all of them
+            titles = [error_data.get('title') for error_data in errors_data]
+            error = BigCommerceException(
+                message='; '.join(filter(None, titles)) or 'Not updated.',
+                status_code=207,
+            )
+            errors = [error] * len(missing)
+
+        return ProductBatchResult(
+            updated,
+            [ProductBatchError(product, exc) for product, exc in zip(missing, errors)],
+        )
+
+    def _run_batches(
+        self,
+        send: Callable[[list[Any]], ProductBatchResult],
+        items: Iterable[Any],
+        size: int,
+        max_workers: int,
+    ) -> ProductBatchResult:
+        """Send items in batches, up to ``max_workers`` batches at once
+
+        Each batch runs in a copy of the caller's context, so enclosing
+        ``deadline()`` and ``priority()`` blocks apply to it.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        result = ProductBatchResult()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, self._send_batch, send, batch
+                )
+                for batch in _batches(items, size)
+            ]
+
+            for future in futures:
+                batch_result = future.result()
+                result.succeeded.extend(batch_result.succeeded)
+                result.failed.extend(batch_result.failed)
+
+        return result
+
+    def _send_batch(
+        self, send: Callable[[list[Any]], ProductBatchResult], batch: list[Any]
+    ) -> ProductBatchResult:
+        try:
+            return call_within_rate_limit(self._api.rate_limit, lambda: send(batch))
+        except BigCommerceClientError as exc:
+            if len(batch) == 1 or isinstance(exc, TooManyRequestsError):
+                return ProductBatchResult(
+                    failed=[ProductBatchError(item, exc) for item in batch]
+                )
+        except BigCommerceException as exc:
+            return ProductBatchResult(
+                failed=[ProductBatchError(item, exc) for item in batch]
+            )
+
+        result = ProductBatchResult()
+        for item in batch:
+            item_result = self._send_batch(send, [item])
+            result.succeeded.extend(item_result.succeeded)
+            result.failed.extend(item_result.failed)
+
+        return result
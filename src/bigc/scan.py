@@ -0,0 +1,191 @@
+"""
+Scan large collections faster by splitting them into disjoint filter
+partitions, and paging through the partitions concurrently.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bigc.api_client import RateLimitStatus
+
+__all__ = (
+    'date_partitions',
+    'id_partitions',
+    'partitioned_scan',
+    'value_partitions',
+)
+
+Partition = dict[str, Any]
+
+# How often waiting workers check for rate limit headroom, or for the scan
+# being abandoned, in seconds
+_POLL_INTERVAL = 0.1
+
+
+def id_partitions(
+    min_id: int,
+    max_id: int,
+    num_partitions: int,
+    *,
+    min_param: str = 'min_id',
+    max_param: str = 'max_id',
+) -> list[Partition]:
+    """Split an inclusive ID range into ranges of about the same size
+
+    The default parameters are the v2 API's. For the v3 API, use
+    ``min_param='id:min', max_param='id:max'``.
+    """
+    if num_partitions < 1:
+        raise ValueError('num_partitions must be 1 or greater')
+
+    size = math.ceil((max_id - min_id + 1) / num_partitions)
+    return [
+        {min_param: start, max_param: min(start + size - 1, max_id)}
+        for start in range(min_id, max_id + 1, max(size, 1))
+    ]
+
+
+def date_partitions(
+    start: datetime,
+    end: datetime,
+    num_partitions: int,
+    *,
+    min_param: str,
+    max_param: str,
+    format_date: Callable[[datetime], str] = datetime.isoformat,
+) -> list[Partition]:
+    """Split a date range into windows of the same length
+
+    BigCommerce's date filters are inclusive and precise to the second, so
+    each window ends a second before the next one starts.
+    """
+    if num_partitions < 1:
+        raise ValueError('num_partitions must be 1 or greater')
+
+    step = (end - start) / num_partitions
+    bounds = [start + step * i for i in range(num_partitions)] + [end]
+
+    return [
+        {
+            min_param: format_date(window_start),
+            max_param: format_date(
+                window_end
+                if i == num_partitions - 1
+                else window_end - timedelta(seconds=1)
+            ),
+        }
+        for i, (window_start, window_end) in enumerate(itertools.pairwise(bounds))
+    ]
+
+
+def value_partitions(param: str, values: Iterable[Any]) -> list[Partition]:
+    """Make a partition for each value of a filter, such as each ``status_id``"""
+    return [{param: value} for value in values]
+
+
+def partitioned_scan(
+    all_records: Callable[..., Iterable[Any]],
+    partitions: Iterable[Partition],
+    *,
+    params: dict[str, Any] | None = None,
+    rate_limit: RateLimitStatus | None = None,
+    max_workers: int = 8,
+    buffer_size: int = 1000,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Return an iterator for every record in every partition
+
+    Each partition's parameters are added to ``params``, and its pages are
+    requested with ``all_records`` (a resource's ``all`` method, such as
+    ``bigcommerce.orders_v2.all``, or anything else taking ``params``).
+    Partitions are paged through concurrently, and their records are yielded
+    as they arrive, so records from different partitions are interleaved.
+
+    The partitions must not overlap, or records will be repeated.
+
+    :param rate_limit: The store's rate limit status, e.g.
+        ``bigcommerce.rate_limit``. The fewer requests are left in the current
+        window, the fewer partitions are started at once. Use many small
+        partitions so that this can adapt quickly.
+    :param max_workers: The most partitions to page through at once.
+    :param buffer_size: The most records to fetch ahead of the consumer.
+    :param kwargs: Passed to ``all_records``, e.g. ``timeout``.
+    """
+    partitions = list(partitions)
+    if not partitions:
+        return
+
+    results: queue.Queue = queue.Queue(maxsize=buffer_size)
+    remaining = iter(partitions)
+    condition = threading.Condition()
+    stopped = threading.Event()
+    active = 0
+
+    def target_workers() -> int:
+        headroom = None if rate_limit is None else rate_limit.headroom
+        if headroom is None:
+            return max_workers
+        return max(1, min(max_workers, math.ceil(max_workers * headroom)))
+
+    def put(item: Any) -> None:
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def drain_partitions() -> None:
+        nonlocal active
+
+        while not stopped.is_set():
+            with condition:
+                # Headroom changes without notifying anyone, so keep checking
+                while active >= target_workers() and not stopped.is_set():
+                    condition.wait(_POLL_INTERVAL)
+
+                partition = next(remaining, None)
+                if partition is None:
+                    return
+                active += 1
+
+            try:
+                for record in all_records(
+                    params={**(params or {}), **partition}, **kwargs
+                ):
+                    put(record)
+                    if stopped.is_set():
+                        return
+            finally:
+                with condition:
+                    active -= 1
+                    condition.notify_all()
+
+    num_workers = min(max_workers, len(partitions))
+    executor = ThreadPoolExecutor(max_workers=num_workers)
+    try:
+        # Each worker's future is queued after its records, once it finishes
+        for _ in range(num_workers):
+            executor.submit(drain_partitions).add_done_callback(put)
+
+        num_done = 0
+        while num_done < num_workers:
+            item = results.get()
+            if isinstance(item, Future):
+                item.result()
+                num_done += 1
+            else:
+                yield item
+    finally:
+        # Stop the workers when finished, failed, or abandoned by the consumer
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
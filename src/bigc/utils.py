@@ -1,13 +1,135 @@
-from datetime import datetime, timezone
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
 from email.utils import mktime_tz, parsedate_tz
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy
+
+__all__ = ('parse_rfc2822_date', 'parse_rfc2822_dates')
+
+_MONTHS = {
+    month: index
+    for index, month in enumerate(
+        (
+            'Jan',
+            'Feb',
+            'Mar',
+            'Apr',
+            'May',
+            'Jun',
+            'Jul',
+            'Aug',
+            'Sep',
+            'Oct',
+            'Nov',
+            'Dec',
+        ),
+        start=1,
+    )
+}
+
+# Matches the fixed format BigCommerce emits, e.g. 'Tue, 20 Nov 2012 00:00:00 +0000'
+_BIGCOMMERCE_DATE_RE = re.compile(
+    r'(?:[A-Z][a-z]{2}, )?(\d{1,2}) ([A-Z][a-z]{2}) (\d{4}) '
+    r'(\d{1,2}):(\d{2}):(\d{2}) ([+-])(\d{2})(\d{2})'
+)
+
 
-__all__ = ('parse_rfc2822_date',)
+def _parse_bigcommerce_date(date_str: str) -> datetime | None:
+    """Parse the common BigCommerce date format, returning None for anything else"""
+    match = _BIGCOMMERCE_DATE_RE.fullmatch(date_str)
+    if match is None:
+        return None
+
+    day, month, year, hour, minute, second, sign, tz_hours, tz_minutes = match.groups()
+    try:
+        parsed = datetime(
+            int(year),
+            _MONTHS[month],
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            tzinfo=timezone.utc,
+        )
+    except (KeyError, ValueError):
+        # Leave unusual values (e.g. leap seconds) to the standard library
+        return None
+
+    offset = timedelta(hours=int(tz_hours), minutes=int(tz_minutes))
+    return parsed + offset if sign == '-' else parsed - offset
 
 
 # The BigCommerce API uses RFC-2822 sometimes, and there isn't a one-liner
 # in the standard library to parse it.
 def parse_rfc2822_date(date_str: str) -> datetime:
     """Parse an RFC-2822 date using ``email.utils.parsedate_tz`` and return a ``datetime`` instance"""
+    parsed = _parse_bigcommerce_date(date_str)
+    if parsed is not None:
+        return parsed
+
     parsed_parts: tuple = parsedate_tz(date_str)
     utc_timestamp: int = mktime_tz(parsed_parts)
     return datetime.fromtimestamp(utc_timestamp, tz=timezone.utc)
+
+
+def _parse_any_date(date_str: str) -> datetime:
+    parsed = _parse_bigcommerce_date(date_str)
+    if parsed is not None:
+        return parsed
+
+    if parsedate_tz(date_str) is not None:
+        return parse_rfc2822_date(date_str)
+
+    # v3 endpoints use ISO-8601 instead
+    try:
+        parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'could not parse date: {date_str!r}') from None
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_rfc2822_dates(
+    date_strs: Iterable[str | None], *, as_numpy: bool = False
+) -> list[datetime | None] | numpy.ndarray:
+    """Parse many RFC-2822 (or ISO-8601) dates at once
+
+    Empty values (such as ``date_shipped`` on an unshipped order) become
+    ``None``, or ``NaT`` if ``as_numpy`` is set, in which case a
+    ``datetime64[s]`` array of UTC times is returned instead of a list.
+    """
+    parsed_by_str: dict[str, datetime] = {}
+    results: list[datetime | None] = []
+
+    for date_str in date_strs:
+        if not date_str:
+            results.append(None)
+            continue
+
+        try:
+            parsed = parsed_by_str[date_str]
+        except KeyError:
+            parsed = parsed_by_str[date_str] = _parse_any_date(date_str)
+
+        results.append(parsed)
+
+    if not as_numpy:
+        return results
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required when as_numpy is set') from None
+
+    timestamp_by_dt = {dt: int(dt.timestamp()) for dt in parsed_by_str.values()}
+    timestamp_by_dt[None] = numpy.iinfo(numpy.int64).min  # NaT
+
+    timestamps = [timestamp_by_dt[dt] for dt in results]
+    return numpy.array(timestamps, dtype=numpy.int64).view('datetime64[s]')
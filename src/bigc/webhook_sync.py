@@ -0,0 +1,248 @@
+"""
+Declaratively sync webhooks across many stores: describe the webhooks each store
+should have, and only the differences are applied.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
+
+from bigc._concurrency import call_within_rate_limit
+from bigc.exceptions import BigCommerceException
+
+if TYPE_CHECKING:
+    from bigc.api import BigCommerceAPI
+
+__all__ = (
+    'DesiredWebhook',
+    'WebhookChange',
+    'WebhookSyncResult',
+    'plan_webhook_changes',
+    'sync_webhooks',
+)
+
+
+@dataclass(frozen=True)
+class DesiredWebhook:
+    """A webhook that a store should have"""
+
+    scope: str
+    destination: str
+    headers: dict[str, str] | None = None
+    is_active: bool = True
+
+    @property
+    def identity(self) -> tuple[str, str]:
+        return self.scope, self.destination
+
+    def as_data(self) -> dict[str, Any]:
+        return {
+            'scope': self.scope,
+            'destination': self.destination,
+            'headers': self.headers or {},
+            'is_active': self.is_active,
+        }
+
+
+@dataclass(frozen=True)
+class WebhookChange:
+    """A single create, update, or delete needed to reach the desired state"""
+
+    action: Literal['create', 'update', 'delete']
+    desired: DesiredWebhook | None = None
+    existing: dict[str, Any] | None = None
+
+    def __str__(self):
+        if self.action == 'delete':
+            webhook = self.existing
+            return f'delete {webhook["scope"]} -> {webhook["destination"]} (#{webhook["id"]})'
+
+        return f'{self.action} {self.desired.scope} -> {self.desired.destination}'
+
+
+@dataclass
+class WebhookSyncResult:
+    """The plan for one store, and the outcome of applying it"""
+
+    store: str
+    changes: list[WebhookChange] = field(default_factory=list)
+    applied: list[WebhookChange] = field(default_factory=list)
+    errors: list[tuple[WebhookChange | None, BigCommerceException]] = field(
+        default_factory=list
+    )
+    dry_run: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> str:
+        counts = {
+            action: sum(change.action == action for change in self.changes)
+            for action in ('create', 'update', 'delete')
+        }
+        planned = ', '.join(f'{count} to {action}' for action, count in counts.items())
+
+        if self.dry_run:
+            return f'{self.store}: {planned} (dry run)'
+
+        return (
+            f'{self.store}: {planned}; '
+            f'{len(self.applied)} applied, {len(self.errors)} failed'
+        )
+
+
+def _webhook_matches(desired: DesiredWebhook, existing: Mapping[str, Any]) -> bool:
+    return (existing.get('headers') or {}) == (desired.headers or {}) and bool(
+        existing.get('is_active')
+    ) == desired.is_active
+
+
+def plan_webhook_changes(
+    desired: Iterable[DesiredWebhook],
+    existing: Iterable[Mapping[str, Any]],
+    *,
+    prune: bool = True,
+) -> list[WebhookChange]:
+    """Work out the fewest changes to turn the existing webhooks into the desired ones
+
+    Webhooks are identified by their scope and destination. Duplicates of a
+    desired webhook are deleted. If ``prune`` is set, so is every existing
+    webhook that isn't desired.
+    """
+    existing_by_identity: dict[tuple[str, str], list[Mapping[str, Any]]] = {}
+    for webhook in existing:
+        identity = (webhook['scope'], webhook['destination'])
+        existing_by_identity.setdefault(identity, []).append(webhook)
+
+    changes: list[WebhookChange] = []
+
+    desired_by_identity = {webhook.identity: webhook for webhook in desired}
+    for identity, webhook in desired_by_identity.items():
+        candidates = existing_by_identity.pop(identity, [])
+        if not candidates:
+            changes.append(WebhookChange('create', desired=webhook))
+            continue
+
+        # Prefer keeping a webhook that's already correct
+        candidates.sort(key=lambda candidate: not _webhook_matches(webhook, candidate))
+        kept, *duplicates = candidates
+
+        if not _webhook_matches(webhook, kept):
+            changes.append(WebhookChange('update', desired=webhook, existing=kept))
+
+        changes.extend(
+            WebhookChange('delete', existing=duplicate) for duplicate in duplicates
+        )
+
+    if prune:
+        changes.extend(
+            WebhookChange('delete', existing=webhook)
+            for webhooks in existing_by_identity.values()
+            for webhook in webhooks
+        )
+
+    return changes
+
+
+def _apply_change(api: BigCommerceAPI, change: WebhookChange) -> None:
+    webhooks_v3 = api.webhooks_v3
+
+    if change.action == 'create':
+        webhooks_v3.create(change.desired.as_data())
+    elif change.action == 'update':
+        data = change.desired.as_data()
+        del data['scope'], data['destination']
+        webhooks_v3.update(change.existing['id'], data)
+    else:
+        webhooks_v3.delete(change.existing['id'])
+
+
+def sync_webhooks(
+    apis: Mapping[str, BigCommerceAPI],
+    desired: Iterable[DesiredWebhook] | Mapping[str, Iterable[DesiredWebhook]],
+    *,
+    prune: bool = True,
+    dry_run: bool = False,
+    max_workers: int = 16,
+    max_concurrency_per_store: int = 2,
+) -> dict[str, WebhookSyncResult]:
+    """Bring the webhooks of many stores in line with the desired webhooks
+
+    Stores are planned and updated concurrently. Each store gets at most
+    ``max_concurrency_per_store`` requests at a time, and waits out its rate
+    limit instead of failing when the limit runs out.
+
+    :param apis: Clients for each store, keyed by a name used in the results
+        (e.g. the store hash).
+    :param desired: The webhooks every store should have, or a mapping of
+        store names to the webhooks for that store. A mapping must include
+        every store, as a missing store would otherwise have all of its
+        webhooks pruned.
+    :param prune: Whether to delete webhooks that aren't desired.
+    :param dry_run: Only plan the changes, without applying them.
+    """
+    if isinstance(desired, Mapping):
+        missing = [store for store in apis if store not in desired]
+        if missing:
+            raise ValueError(f'No desired webhooks given for {", ".join(missing)}')
+
+        desired_by_store = {store: list(desired[store]) for store in apis}
+    else:
+        desired = list(desired)
+        desired_by_store = {store: desired for store in apis}
+
+    results = {store: WebhookSyncResult(store, dry_run=dry_run) for store in apis}
+    semaphores = {
+        store: threading.BoundedSemaphore(max_concurrency_per_store) for store in apis
+    }
+
+    def plan(store: str) -> None:
+        api = apis[store]
+        try:
+            existing = call_within_rate_limit(
+                api.rate_limit, lambda: list(api.webhooks_v3.all())
+            )
+        except BigCommerceException as exc:
+            results[store].errors.append((None, exc))
+            return
+
+        results[store].changes = plan_webhook_changes(
+            desired_by_store[store], existing, prune=prune
+        )
+
+    def apply(store: str, change: WebhookChange) -> None:
+        api = apis[store]
+        with semaphores[store]:
+            try:
+                call_within_rate_limit(
+                    api.rate_limit, lambda: _apply_change(api, change)
+                )
+            except BigCommerceException as exc:
+                results[store].errors.append((change, exc))
+            else:
+                results[store].applied.append(change)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(plan, apis))
+
+        if not dry_run:
+            # Interleave stores, so workers aren't all waiting on one store
+            changes_by_store = [
+                [(store, change) for change in result.changes]
+                for store, result in results.items()
+            ]
+            tasks = [
+                task
+                for tasks in itertools.zip_longest(*changes_by_store)
+                for task in tasks
+                if task is not None
+            ]
+            list(executor.map(lambda task: apply(*task), tasks))
+
+    return results
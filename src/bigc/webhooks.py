@@ -0,0 +1,406 @@
+"""
+Tools for receiving BigCommerce webhooks. These are framework-agnostic: pass
+the raw request body and headers from any web framework to ``WebhookReceiver``.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hmac
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bigc.api import BigCommerceAPI
+
+__all__ = (
+    'InvalidWebhookError',
+    'WebhookDeduplicator',
+    'WebhookEvent',
+    'WebhookReceiver',
+    'WebhookVerificationError',
+    'coalesce_webhook_events',
+    'fetch_webhook_entities',
+    'parse_webhook_payload',
+    'verify_webhook_headers',
+)
+
+logger = logging.getLogger(__name__)
+
+# Number of IDs to put in a single 'id:in' filter, keeping URLs short
+ENTITY_FETCH_CHUNK_SIZE = 50
+
+
+class InvalidWebhookError(ValueError):
+    """The webhook payload could not be parsed"""
+
+
+class WebhookVerificationError(ValueError):
+    """The webhook request did not carry the expected authentication headers"""
+
+
+@dataclass(frozen=True)
+class WebhookEvent:
+    """A single webhook callback from BigCommerce"""
+
+    scope: str
+    data: dict[str, Any]
+    created_at: int
+    store_id: str | None = None
+    producer: str | None = None
+    hash: str | None = None
+
+    @property
+    def resource(self) -> str:
+        """The resource type from the scope, e.g. ``'order'`` for ``store/order/created``"""
+        return self.scope.split('/')[1]
+
+    @property
+    def action(self) -> str:
+        """The last part of the scope, e.g. ``'created'`` for ``store/order/created``"""
+        return self.scope.rsplit('/', 1)[-1]
+
+    @property
+    def entity_id(self) -> Any:
+        """The ID of the entity that the event refers to, if any"""
+        return self.data.get('id')
+
+    @property
+    def dedupe_key(self) -> tuple[Any, ...]:
+        if self.hash:
+            return self.hash, self.created_at
+
+        return (
+            self.store_id,
+            self.scope,
+            json.dumps(self.data, sort_keys=True),
+            self.created_at,
+        )
+
+
+def parse_webhook_payload(payload: bytes | str | Mapping[str, Any]) -> WebhookEvent:
+    """Parse the body of a webhook callback into a ``WebhookEvent``"""
+    if isinstance(payload, bytes | str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            raise InvalidWebhookError('payload is not valid JSON') from None
+
+    if not isinstance(payload, Mapping):
+        raise InvalidWebhookError(f'expected JSON object, got {type(payload).__name__}')
+
+    scope = payload.get('scope')
+    if not isinstance(scope, str) or scope.count('/') < 2:
+        raise InvalidWebhookError(f'invalid scope: {scope!r}')
+
+    data = payload.get('data') or {}
+    if not isinstance(data, dict):
+        raise InvalidWebhookError(f'expected data object, got {type(data).__name__}')
+
+    try:
+        created_at = int(payload.get('created_at') or 0)
+    except (TypeError, ValueError):
+        raise InvalidWebhookError(
+            f'invalid created_at: {payload.get("created_at")!r}'
+        ) from None
+
+    store_id = payload.get('store_id')
+
+    return WebhookEvent(
+        scope=scope,
+        data=data,
+        created_at=created_at,
+        store_id=None if store_id is None else str(store_id),
+        producer=payload.get('producer'),
+        hash=payload.get('hash'),
+    )
+
+
+def verify_webhook_headers(
+    headers: Mapping[str, str], expected_headers: Mapping[str, str]
+) -> None:
+    """Check that a request carries the headers the webhook was created with
+
+    BigCommerce doesn't sign webhook payloads. Instead, secret headers can be
+    set when creating a webhook, and are sent back with every callback.
+    """
+    received = {name.lower(): value for name, value in headers.items()}
+
+    for name, expected_value in expected_headers.items():
+        value = received.get(name.lower())
+        if value is None or not hmac.compare_digest(
+            value.encode(), expected_value.encode()
+        ):
+            raise WebhookVerificationError(f'missing or incorrect header: {name}')
+
+
+class WebhookDeduplicator:
+    """Detect repeat deliveries of the same webhook within a sliding time window"""
+
+    def __init__(self, window: float = 300.0):
+        """
+        :param window: How long, in seconds, to remember each event.
+        """
+        self.window = window
+        self._seen: OrderedDict[tuple[Any, ...], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, event: WebhookEvent) -> bool:
+        """Record an event, returning whether it was already seen in the window"""
+        now = time.monotonic()
+        key = event.dedupe_key
+
+        with self._lock:
+            self._expire(now)
+
+            if key in self._seen:
+                return True
+
+            self._seen[key] = now
+            return False
+
+    def forget(self, event: WebhookEvent) -> None:
+        """Allow an event to be received again (e.g. after it failed to process)"""
+        with self._lock:
+            self._seen.pop(event.dedupe_key, None)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if seen_at > cutoff:
+                break
+            del self._seen[key]
+
+
+def coalesce_webhook_events(events: Iterable[WebhookEvent]) -> list[WebhookEvent]:
+    """Collapse events with the same scope and entity, keeping the latest of each
+
+    Events without an entity ID are kept as-is. Order is preserved by the
+    first occurrence of each entity.
+    """
+    coalesced: dict[tuple[Any, ...], WebhookEvent] = {}
+
+    for index, event in enumerate(events):
+        if event.entity_id is None:
+            key = (index,)
+        else:
+            key = (event.store_id, event.scope, str(event.entity_id))
+
+        previous = coalesced.get(key)
+        if previous is None:
+            coalesced[key] = event
+        elif event.created_at >= previous.created_at:
+            # Keep the first position, but the latest event
+            coalesced[key] = event
+
+    return list(coalesced.values())
+
+
+class WebhookReceiver:
+    """Verify, dedupe, and buffer webhooks, then hand them to a handler in batches
+
+    Call ``receive`` from a web request handler. The batch handler runs when
+    the buffer fills up, or on the first ``receive`` or ``flush_if_due`` call
+    after ``max_batch_delay`` seconds. Call ``flush_if_due`` periodically if
+    webhooks may stop arriving while some are still buffered.
+
+    Buffered events have already been acknowledged to BigCommerce, so a batch
+    whose handler raises isn't dropped. Its events are logged and buffered
+    again, to be retried with the next flush, or passed to ``on_error``.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[WebhookEvent]], None],
+        *,
+        scopes: Iterable[str] | None = None,
+        expected_headers: Mapping[str, str] | None = None,
+        dedupe_window: float = 300.0,
+        max_batch_size: int = 100,
+        max_batch_delay: float = 1.0,
+        coalesce: bool = True,
+        on_error: Callable[[list[WebhookEvent], Exception], None] | None = None,
+    ):
+        """
+        :param handler: Called with each batch of events.
+        :param scopes: Scope patterns to accept, such as ``'store/order/*'``.
+            Events outside these scopes are ignored. By default, all events
+            are accepted.
+        :param expected_headers: Headers that every callback must include,
+            matching the ``headers`` the webhooks were created with.
+        :param dedupe_window: How long, in seconds, to remember delivered
+            events so that repeat deliveries are dropped.
+        :param max_batch_size: The most events to buffer before flushing.
+        :param max_batch_delay: The longest time, in seconds, to hold an event
+            before flushing.
+        :param coalesce: Whether to collapse events on the same entity
+            within a batch.
+        :param on_error: Called with each batch the handler failed on, and
+            the error, instead of buffering the batch again. Use this to
+            dead-letter events that can't be handled.
+        """
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be 1 or greater')
+
+        self.handler = handler
+        self.scopes = None if scopes is None else tuple(scopes)
+        self.expected_headers = expected_headers
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.coalesce = coalesce
+        self.on_error = on_error
+
+        self._deduplicator = WebhookDeduplicator(dedupe_window)
+        self._buffer: list[WebhookEvent] = []
+        self._buffer_started_at: float | None = None
+        self._lock = threading.Lock()
+
+    def receive(
+        self,
+        body: bytes | str | Mapping[str, Any],
+        headers: Mapping[str, str] | None = None,
+    ) -> WebhookEvent | None:
+        """Accept a webhook callback
+
+        Returns the parsed event, or ``None`` if it was a repeat delivery or
+        outside the accepted scopes. Raises ``WebhookVerificationError`` or
+        ``InvalidWebhookError`` for requests that should be rejected.
+        """
+        if self.expected_headers:
+            verify_webhook_headers(headers or {}, self.expected_headers)
+
+        event = parse_webhook_payload(body)
+
+        if self.scopes is not None and not any(
+            fnmatch.fnmatchcase(event.scope, pattern) for pattern in self.scopes
+        ):
+            return None
+
+        if self._deduplicator.seen(event):
+            return None
+
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started_at = time.monotonic()
+            self._buffer.append(event)
+
+        self.flush_if_due()
+
+        return event
+
+    def flush_if_due(self) -> list[WebhookEvent]:
+        """Flush the buffer if it is full or has been held for too long"""
+        with self._lock:
+            due = self._buffer and (
+                len(self._buffer) >= self.max_batch_size
+                or time.monotonic() - self._buffer_started_at >= self.max_batch_delay
+            )
+
+        return self.flush() if due else []
+
+    def flush(self) -> list[WebhookEvent]:
+        """Hand all buffered events to the handler, returning the batch
+
+        If the handler raises, the error is logged rather than raised, and
+        an empty list is returned.
+        """
+        with self._lock:
+            events, self._buffer = self._buffer, []
+            self._buffer_started_at = None
+
+        if not events:
+            return []
+
+        batch = coalesce_webhook_events(events) if self.coalesce else events
+
+        try:
+            self.handler(batch)
+        except Exception as exc:
+            # Raising would fail an unrelated delivery, and BigCommerce won't
+            # redeliver the events that were acknowledged earlier
+            logger.exception('Webhook handler failed on %d events', len(batch))
+            if self.on_error is not None:
+                self.on_error(batch, exc)
+            else:
+                with self._lock:
+                    self._buffer[:0] = batch
+                    self._buffer_started_at = time.monotonic()
+            return []
+
+        return batch
+
+
+def _chunks(values: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _id_clusters(ids: list[int], max_span: int) -> Iterator[tuple[int, int]]:
+    """Group sorted IDs into (min, max) ranges spanning at most ``max_span`` IDs"""
+    start = prev = ids[0]
+    for cur in ids[1:]:
+        if cur - start >= max_span:
+            yield start, prev
+            start = cur
+        prev = cur
+    yield start, prev
+
+
+def fetch_webhook_entities(
+    api: BigCommerceAPI,
+    events: Iterable[WebhookEvent],
+    *,
+    chunk_size: int = ENTITY_FETCH_CHUNK_SIZE,
+) -> dict[tuple[str, int], dict[str, Any]]:
+    """Fetch the entities referenced by a batch of webhook events
+
+    Entities are fetched with one ``id:in`` request per resource type and
+    chunk of IDs, rather than one request per event. Orders, which can't be
+    filtered by a list of IDs, are fetched in ``min_id``/``max_id`` ranges.
+
+    Returns a dictionary keyed by ``(resource, id)``, e.g. ``('order', 101)``.
+    Entities that no longer exist, and events for deletions, are skipped.
+    """
+    ids_by_resource: dict[str, set[int]] = {}
+    for event in events:
+        if event.action == 'deleted' or event.entity_id is None:
+            continue
+
+        try:
+            entity_id = int(event.entity_id)
+        except (TypeError, ValueError):
+            continue
+
+        ids_by_resource.setdefault(event.resource, set()).add(entity_id)
+
+    list_functions = {
+        'product': api.products_v3.all,
+        'category': api.categories_v3.all,
+        'customer': api.customers_v3.all,
+    }
+
+    entities: dict[tuple[str, int], dict[str, Any]] = {}
+
+    for resource, ids in ids_by_resource.items():
+        if resource in list_functions:
+            for chunk in _chunks(sorted(ids), chunk_size):
+                for entity in list_functions[resource](params={'id:in': chunk}):
+                    entities[resource, entity['id']] = entity
+        elif resource == 'order':
+            for min_id, max_id in _id_clusters(sorted(ids), chunk_size):
+                params = {'min_id': min_id, 'max_id': max_id}
+                for order in api.orders_v2.all(params=params):
+                    if order['id'] in ids:
+                        entities['order', order['id']] = order
+
+    return entities
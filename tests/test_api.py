@@ -1,27 +1,114 @@
+import subprocess
+import sys
 import threading
+import time
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+import requests
 
 from bigc import BigCommerceAPI
+from bigc.exceptions import PoolTimeoutError
 
 
 class TestSession:
-    def test_api_versions_share_one_session(self):
+    def test_api_versions_share_one_pool(self):
         api = BigCommerceAPI('store_hash', 'access_token')
 
-        assert api.api_v2._session is api.api_v3._session
+        assert api.api_v2.pool is api.api_v3.pool is api.pool
 
-    def test_each_thread_gets_its_own_session(self):
+    def test_api_versions_share_one_rate_limit(self):
         api = BigCommerceAPI('store_hash', 'access_token')
-        sessions = []
 
-        threads = [
-            threading.Thread(target=lambda: sessions.append(api.api_v2._session))
-            for _ in range(8)
-        ]
+        assert api.api_v2.rate_limit is api.api_v3.rate_limit is api.rate_limit
+
+    def test_threads_share_sessions(self):
+        api = BigCommerceAPI('store_hash', 'access_token', max_connections=2)
+        barrier = threading.Barrier(8)
+
+        def borrow():
+            barrier.wait()
+            for _ in range(10):
+                with api.pool.session():
+                    pass
+
+        threads = [threading.Thread(target=borrow) for _ in range(8)]
         for thread in threads:
             thread.start()
         for thread in threads:
             thread.join()
 
-        assert len(sessions) == len(threads)
-        assert len(set(sessions)) == len(threads)
-        assert api.api_v2._session not in sessions
+        stats = api.pool.stats()
+        assert stats.num_created <= 2
+        assert stats.in_use == 0
+
+    def test_close(self):
+        with BigCommerceAPI('store_hash', 'access_token') as api:
+            with api.pool.session():
+                pass
+            assert api.pool.stats().idle == 1
+
+        assert api.pool.closed
+        assert api.pool.stats().idle == 0
+        with pytest.raises(RuntimeError):
+            api.products_v3.get(1)
+
+    def test_pool_timeout(self):
+        api = BigCommerceAPI(
+            'store_hash', 'access_token', max_connections=1, pool_timeout=0.01
+        )
+
+        start = time.monotonic()
+        with api.pool.session(), pytest.raises(PoolTimeoutError):
+            # The request's own timeout doesn't apply to waiting
+            api.products_v3.get(1, timeout=60)
+
+        assert time.monotonic() - start < 1
+
+    def test_warmup(self, monkeypatch):
+        response = create_autospec(requests.Response)()
+        response.headers = requests.structures.CaseInsensitiveDict()
+        response.ok = True
+        request_mock = MagicMock(return_value=response)
+        monkeypatch.setattr(requests.Session, 'request', request_mock)
+
+        api = BigCommerceAPI('store_hash', 'access_token')
+        api.warmup(2)
+
+        assert request_mock.call_count == 2
+        assert request_mock.call_args.args[1].endswith('/v2/time')
+        assert api.pool.stats().idle == 2
+
+
+class TestLazyLoading:
+    def test_resources_are_created_once(self):
+        api = BigCommerceAPI('store_hash', 'access_token')
+
+        assert api.orders_v2 is api.orders_v2
+        assert api.orders_v2._api is api.api_v2
+        assert api.products_v3._api is api.api_v3
+
+    def test_resources_can_be_imported_from_api_module(self):
+        from bigc.api import BigCommerceProductsV3API
+        from bigc.resources import products_v3
+
+        assert BigCommerceProductsV3API is products_v3.BigCommerceProductsV3API
+
+        with pytest.raises(ImportError):
+            from bigc.api import BigCommerceMissingAPI  # noqa: F401
+
+    def test_nothing_slow_is_imported_until_used(self):
+        code = """
+import sys
+from bigc import BigCommerceAPI
+
+api = BigCommerceAPI('store_hash', 'access_token')
+print('requests' in sys.modules, 'bigc.resources.orders_v2' in sys.modules)
+api.orders_v2
+print('requests' in sys.modules, 'bigc.resources.orders_v2' in sys.modules)
+"""
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, check=True, text=True
+        )
+
+        assert result.stdout.split() == ['False', 'False', 'False', 'True']
@@ -1,3 +1,5 @@
+import threading
+import time
 from collections.abc import Iterator
 from typing import Any
 from unittest.mock import MagicMock, create_autospec
@@ -5,8 +7,24 @@ from unittest.mock import MagicMock, create_autospec
 import pytest
 import requests
 
-from bigc.api_client import BigCommerceRequestClient
-from bigc.exceptions import BigCommerceNetworkError
+from bigc.api_client import (
+    AdaptivePageSize,
+    BigCommerceRequestClient,
+    BigCommerceV2APIClient,
+    BigCommerceV3APIClient,
+    HedgePolicy,
+    RateLimitStatus,
+)
+from bigc.deadlines import deadline
+from bigc.exceptions import (
+    BadGatewayError,
+    BigCommerceNetworkError,
+    DeadlineExceededError,
+    GatewayTimeoutError,
+    PoolTimeoutError,
+)
+from bigc.pool import SessionPool
+from bigc.priority import Priority, priority
 
 
 class DummyBigCommerceRequestClient(BigCommerceRequestClient):
@@ -34,6 +52,7 @@ def dummy_request_client() -> DummyBigCommerceRequestClient:
 @pytest.fixture
 def request_mock(monkeypatch):
     mock_response = create_autospec(requests.Response)()
+    mock_response.headers = requests.structures.CaseInsensitiveDict()
 
     monkeypatch.setattr(
         requests.Session,
@@ -68,3 +87,427 @@ class TestRequest:
         dummy_request_client.request('GET', '/test', retries=retries)
 
         assert request_mock.call_count == 3
+
+    def test_post_cannot_retry_without_find_existing(self, dummy_request_client):
+        with pytest.raises(ValueError):
+            dummy_request_client.request('POST', '/test', retries=1)
+
+    def test_post_retry_finds_existing(self, request_mock, dummy_request_client):
+        request_mock.side_effect = requests.RequestException()
+        find_existing = MagicMock(return_value={'id': 1})
+
+        result = dummy_request_client.request(
+            'POST', '/test', retries=2, find_existing=find_existing
+        )
+
+        assert result == {'id': 1}
+        assert request_mock.call_count == 1
+        find_existing.assert_called_once()
+
+    def test_post_retry_when_nothing_exists(self, request_mock, dummy_request_client):
+        request_mock.side_effect = (
+            requests.RequestException(),
+            request_mock.return_value,
+        )
+        request_mock.return_value.text = '{"id": 2}'
+        request_mock.return_value.json.return_value = {'id': 2}
+        find_existing = MagicMock(return_value=None)
+
+        result = dummy_request_client.request(
+            'POST', '/test', retries=2, find_existing=find_existing
+        )
+
+        assert result == {'id': 2}
+        assert request_mock.call_count == 2
+        find_existing.assert_called_once()
+
+    def test_v3_boxed_response(self, request_mock):
+        body = {'data': [{'id': 1}], 'errors': [{'status': 422}], 'meta': {}}
+        request_mock.return_value.ok = True
+        request_mock.return_value.text = 'x'
+        request_mock.return_value.json.return_value = body
+        client = BigCommerceV3APIClient('store_hash', 'access_token')
+
+        assert client.put('/test', data=[]) == [{'id': 1}]
+        assert client.put('/test', data=[], boxed=True) == body
+
+    def test_failed_find_existing_raises_original_error(
+        self, request_mock, dummy_request_client
+    ):
+        request_mock.side_effect = requests.RequestException()
+        find_existing = MagicMock(side_effect=BadGatewayError())
+
+        with pytest.raises(BigCommerceNetworkError):
+            dummy_request_client.request(
+                'POST', '/test', retries=2, find_existing=find_existing
+            )
+
+        assert request_mock.call_count == 1
+
+
+class TestRateLimitStatus:
+    def test_update_from_response(self, request_mock, dummy_request_client):
+        request_mock.return_value.headers.update(
+            {
+                'X-Rate-Limit-Requests-Left': '5',
+                'X-Rate-Limit-Requests-Quota': '150',
+                'X-Rate-Limit-Time-Reset-Ms': '3000',
+                'X-Rate-Limit-Time-Window-Ms': '30000',
+            }
+        )
+
+        dummy_request_client.request('GET', '/test')
+
+        rate_limit = dummy_request_client.rate_limit
+        assert rate_limit.requests_left == 5
+        assert rate_limit.requests_quota == 150
+        assert rate_limit.window == 30
+        assert 2 < rate_limit.time_until_reset <= 3
+        assert rate_limit.headroom == 5 / 150
+
+    def test_unknown(self, dummy_request_client):
+        rate_limit = dummy_request_client.rate_limit
+
+        assert rate_limit.requests_left is None
+        assert rate_limit.headroom is None
+        assert rate_limit.time_until_reset == 0
+
+
+def paged_response(records, params, *, v3=False):
+    limit, page = int(params['limit']), int(params['page'])
+    data = records[(page - 1) * limit : page * limit]
+
+    response = create_autospec(requests.Response)()
+    response.headers = requests.structures.CaseInsensitiveDict()
+    response.ok = True
+    response.content = b'x' * 100 * len(data)
+    response.text = 'x'
+    if v3:
+        total_pages = -(-len(records) // limit)
+        response.json.return_value = {
+            'data': data,
+            'meta': {'pagination': {'total_pages': total_pages}},
+        }
+    else:
+        response.json.return_value = data
+    return response
+
+
+class TestAdaptivePageSize:
+    def test_shrinks_slow_pages(self):
+        adaptive = AdaptivePageSize(target_latency=1.0)
+
+        adaptive.page_size_at(0)
+        adaptive.record_page(2.0, 0, 250)
+
+        assert adaptive.page_size_at(0) == 100
+
+    def test_shrinks_large_pages(self):
+        adaptive = AdaptivePageSize(initial=100, max_page_bytes=1000)
+
+        adaptive.record_page(0.1, 4000, 100)
+
+        assert adaptive.page_size_at(None) == 20
+
+    def test_grows_fast_full_pages(self):
+        adaptive = AdaptivePageSize(initial=50, target_latency=1.0)
+
+        adaptive.record_page(0.1, 0, 50)
+        assert adaptive.page_size_at(None) == 100
+
+        adaptive.record_page(0.1, 0, 20)
+        assert adaptive.page_size_at(None) == 100
+
+    def test_size_divides_offset(self):
+        adaptive = AdaptivePageSize(initial=100, target_latency=1.0)
+
+        adaptive.record_page(1.0, 0, 100)  # Wants 80
+
+        assert adaptive.page_size_at(300) == 75
+
+    def test_clamped(self):
+        adaptive = AdaptivePageSize(initial=20, minimum=10, maximum=30)
+
+        adaptive.record_page(100.0, 0, 20)
+        assert adaptive.page_size_at(None) == 10
+
+        adaptive.record_page(0.0, 0, 10)
+        adaptive.page_size_at(None)
+        adaptive.record_page(0.0, 0, 20)
+        assert adaptive.page_size_at(None) == 30
+
+    def test_v2_get_many_shrinks_after_timeout(self, request_mock):
+        records = list(range(1000))
+
+        def request(method, url, *, params, **kwargs):
+            if int(params['limit']) > 100:
+                raise requests.Timeout()
+            return paged_response(records, params)
+
+        request_mock.side_effect = request
+        client = BigCommerceV2APIClient('store_hash', 'access_token')
+        adaptive = AdaptivePageSize(target_latency=60)
+
+        assert list(client.get_many('/test', page_size=adaptive)) == records
+        limits = [
+            int(call.kwargs['params']['limit']) for call in request_mock.call_args_list
+        ]
+        assert limits[:3] == [250, 125, 62]
+
+    def test_pool_timeout_keeps_page_size(self, request_mock):
+        pool = SessionPool(1, acquire_timeout=0.01)
+        client = BigCommerceV2APIClient('store_hash', 'access_token', _pool=pool)
+        adaptive = AdaptivePageSize(initial=100)
+
+        with pool.session(), pytest.raises(PoolTimeoutError):
+            list(client.get_many('/test', page_size=adaptive, retries=2))
+
+        # Not a slow page or a server timeout, so not shrunk or retried
+        assert adaptive.page_size_at(0) == 100
+        request_mock.assert_not_called()
+        assert pool.stats().num_waits == 1
+
+    def test_v3_get_many(self, request_mock):
+        records = list(range(1000))
+        request_mock.side_effect = lambda method, url, *, params, **kwargs: (
+            paged_response(records, params, v3=True)
+        )
+        client = BigCommerceV3APIClient('store_hash', 'access_token')
+        adaptive = AdaptivePageSize(initial=100, max_page_bytes=16_000)
+
+        assert list(client.get_many('/test', page_size=adaptive)) == records
+        limits = [
+            int(call.kwargs['params']['limit']) for call in request_mock.call_args_list
+        ]
+        assert limits[:2] == [100, 100]
+        assert max(limits) <= 200
+
+    def test_minimum_timeout_raises(self, request_mock):
+        request_mock.side_effect = requests.Timeout()
+        client = BigCommerceV2APIClient('store_hash', 'access_token')
+
+        with pytest.raises(GatewayTimeoutError):
+            list(
+                client.get_many(
+                    '/test', page_size=AdaptivePageSize(initial=40, minimum=10)
+                )
+            )
+
+        assert [
+            int(call.kwargs['params']['limit']) for call in request_mock.call_args_list
+        ] == [
+            40,
+            20,
+            10,
+        ]
+
+
+class TestHedgePolicy:
+    @pytest.mark.parametrize('percentile', [0, 100, 150])
+    def test_invalid_percentile(self, percentile):
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=percentile)
+
+    def test_delay(self):
+        policy = HedgePolicy(percentile=90, initial_delay=2.0, min_delay=0.01)
+
+        assert policy.delay == 2.0
+
+        for latency in range(1, 11):
+            policy.record_latency(latency / 10)
+
+        assert policy.delay == 0.9
+
+    def test_fast_request_is_not_hedged(self):
+        policy = HedgePolicy(initial_delay=1.0, budget=1.0)
+        func = MagicMock(return_value='result')
+
+        assert policy.run(func, RateLimitStatus()) == 'result'
+        assert func.call_count == 1
+        assert policy.num_hedged == 0
+
+    def test_slow_request_is_hedged(self):
+        policy = HedgePolicy(initial_delay=0.01, budget=1.0)
+        calls = []
+        first_call_released = threading.Event()
+
+        def func():
+            calls.append(None)
+            if len(calls) == 1:
+                first_call_released.wait(1)
+                return 'slow'
+            return 'fast'
+
+        assert policy.run(func, RateLimitStatus()) == 'fast'
+        first_call_released.set()
+        assert policy.num_hedged == 1
+
+    def test_requests_dont_queue_behind_hedges(self):
+        policy = HedgePolicy(initial_delay=0.01, budget=1.0, max_workers=1)
+        released = threading.Event()
+
+        def slow():
+            released.wait(1)
+            return 'slow'
+
+        thread = threading.Thread(target=policy.run, args=(slow, RateLimitStatus()))
+        thread.start()
+        while policy.num_hedged == 0:
+            time.sleep(0.001)
+
+        # The only hedging thread is busy, but this isn't hedged
+        start = time.monotonic()
+        assert policy.run(lambda: 'fast', RateLimitStatus()) == 'fast'
+        assert time.monotonic() - start < 0.5
+
+        released.set()
+        thread.join()
+
+    def test_budget(self):
+        policy = HedgePolicy(initial_delay=0.01, budget=0.5)
+
+        def func():
+            time.sleep(0.03)
+            return 'result'
+
+        for _ in range(4):
+            policy.run(func, RateLimitStatus())
+
+        assert policy.num_hedged == 2
+
+    def test_no_hedging_without_headroom(self):
+        policy = HedgePolicy(initial_delay=0.01, budget=1.0)
+        rate_limit = MagicMock(headroom=0.1)
+
+        def func():
+            time.sleep(0.03)
+            return 'result'
+
+        assert policy.run(func, rate_limit) == 'result'
+        assert policy.num_hedged == 0
+
+    def test_request_with_hedge(self, request_mock, dummy_request_client):
+        request_mock.return_value.ok = True
+        request_mock.return_value.text = '{}'
+        request_mock.return_value.json.return_value = {'id': 1}
+
+        assert dummy_request_client.request('GET', '/test', hedge=True) == {'id': 1}
+
+        with pytest.raises(ValueError):
+            dummy_request_client.request('PUT', '/test', hedge=True)
+
+
+class TestDeadlines:
+    def test_timeout_is_capped(self, request_mock, dummy_request_client):
+        dummy_request_client.request('GET', '/test', timeout=30, deadline=2)
+
+        assert request_mock.call_args.kwargs['timeout'] <= 2
+
+    def test_expired_deadline(self, request_mock, dummy_request_client):
+        with pytest.raises(DeadlineExceededError):
+            dummy_request_client.request('GET', '/test', deadline=0)
+
+        request_mock.assert_not_called()
+
+    def test_retries_stop_at_deadline(self, request_mock, dummy_request_client):
+        def request(*args, **kwargs):
+            time.sleep(0.05)
+            raise requests.Timeout()
+
+        request_mock.side_effect = request
+
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            dummy_request_client.request('GET', '/test', retries=10, deadline=0.12)
+
+        assert isinstance(exc_info.value.__cause__, GatewayTimeoutError)
+        assert request_mock.call_count == 3
+
+    def test_deadline_from_context(self, request_mock, dummy_request_client):
+        with deadline(0), pytest.raises(DeadlineExceededError):
+            dummy_request_client.request('GET', '/test')
+
+    def test_get_many_can_resume(self, request_mock):
+        records = list(range(10))
+        calls = 0
+
+        def request(method, url, *, params, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                time.sleep(0.1)
+            return paged_response(records, params)
+
+        request_mock.side_effect = request
+        client = BigCommerceV2APIClient('store_hash', 'access_token')
+
+        received = []
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            received.extend(client.get_many('/test', page_size=2, deadline=0.05))
+
+        exc = exc_info.value
+        assert received == [0, 1, 2, 3, 4, 5]
+        assert exc.resume_params == {'page': 4}
+        assert exc.page_size == 2
+
+        received.extend(
+            client.get_many('/test', page_size=exc.page_size, params=exc.resume_params)
+        )
+        assert received == records
+
+
+class TestPriority:
+    def test_low_priority_request_waits(self, request_mock, dummy_request_client):
+        dummy_request_client.scheduler.max_delay = 0.05
+        dummy_request_client.rate_limit.update(
+            {
+                'X-Rate-Limit-Requests-Left': '0',
+                'X-Rate-Limit-Requests-Quota': '100',
+                'X-Rate-Limit-Time-Reset-Ms': '10000',
+                'X-Rate-Limit-Time-Window-Ms': '30000',
+            }
+        )
+
+        start = time.monotonic()
+        dummy_request_client.request('GET', '/test', priority=Priority.HIGH)
+        assert time.monotonic() - start < 0.05
+
+        with priority(Priority.LOW):
+            dummy_request_client.request('GET', '/test')
+        assert time.monotonic() - start >= 0.05
+
+        assert request_mock.call_count == 2
+        assert dummy_request_client.scheduler.num_delayed == 1
+
+
+class TestPreparedRequests:
+    def test_headers_follow_access_token(self, request_mock, dummy_request_client):
+        dummy_request_client.request('GET', '/test')
+        dummy_request_client.access_token = 'new_token'
+        dummy_request_client.request('GET', '/test')
+
+        assert request_mock.call_args.kwargs['headers']['X-Auth-Token'] == 'new_token'
+
+    def test_extra_headers_are_not_shared(self, request_mock, dummy_request_client):
+        dummy_request_client.request('GET', '/test', headers={'X-Extra': '1'})
+        dummy_request_client.request('GET', '/test')
+
+        assert 'X-Extra' not in request_mock.call_args.kwargs['headers']
+
+    def test_get_many_params(self, request_mock):
+        records = list(range(5))
+        sent_params = []
+
+        def request(method, url, *, params, **kwargs):
+            sent_params.append(params)
+            return paged_response(records, params, v3=True)
+
+        request_mock.side_effect = request
+        client = BigCommerceV3APIClient('store_hash', 'access_token')
+
+        assert (
+            list(client.get_many('/test', page_size=2, params={'id:in': [1, 2]}))
+            == records
+        )
+        assert sent_params == [
+            {'id:in': '1,2', 'limit': '2', 'page': str(page)} for page in (1, 2, 3)
+        ]
@@ -0,0 +1,123 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.cache import BigCommerceReadCache, TTLCache
+from bigc.webhooks import WebhookEvent
+
+
+class TestTTLCache:
+    def test_get_and_set(self):
+        cache = TTLCache(60)
+        cache.set('key', 'value')
+
+        assert cache.get('key') == 'value'
+        assert cache.get('missing') is None
+
+    def test_expiry(self):
+        cache = TTLCache(0)
+        cache.set('key', 'value')
+
+        assert cache.get('key') is None
+
+    def test_max_size_evicts_least_recently_used(self):
+        cache = TTLCache(60, max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+
+    def test_invalidate_tag(self):
+        cache = TTLCache(60)
+        cache.set('a', 1, tags=['x'])
+        cache.set('b', 2, tags=['x', 'y'])
+        cache.set('c', 3, tags=['y'])
+
+        assert cache.invalidate_tag('x') == 2
+        assert cache.get('a') is None
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+
+    def test_invalidation_during_fetch_is_not_cached(self):
+        cache = TTLCache(60)
+
+        def get_value():
+            cache.invalidate_tag('x')
+            return 'stale'
+
+        assert cache.get_or_set('key', get_value, tags=['x']) == 'stale'
+        assert cache.get('key') is None
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.products_v3.get.side_effect = lambda product_id, **kwargs: {'id': product_id}
+    return api
+
+
+class TestBigCommerceReadCache:
+    def test_reads_are_cached(self, api):
+        cache = BigCommerceReadCache(api)
+
+        assert cache.products_v3.get(1) == {'id': 1}
+        assert cache.products_v3.get(1) == {'id': 1}
+        cache.products_v3.get(1, params={'include': 'variants'})
+
+        assert api.products_v3.get.call_count == 2
+
+    def test_webhook_invalidates_entity(self, api):
+        cache = BigCommerceReadCache(api)
+        cache.products_v3.get(1)
+        cache.products_v3.get(1, params={'include': 'variants'})
+        cache.products_v3.get(2)
+
+        cache.handle_webhook_events(
+            [WebhookEvent('store/product/updated', {'id': 1}, created_at=0)]
+        )
+        cache.products_v3.get(1)
+        cache.products_v3.get(2)
+
+        assert api.products_v3.get.call_count == 4
+
+    def test_customer_address_event(self, api):
+        cache = BigCommerceReadCache(api)
+        cache.invalidate = MagicMock()
+
+        cache.handle_webhook_events(
+            [
+                WebhookEvent(
+                    'store/customer/address/updated',
+                    {'id': 60, 'address': {'customer_id': 32}},
+                    created_at=0,
+                )
+            ]
+        )
+
+        cache.invalidate.assert_called_once_with('customer', 32)
+
+    def test_register_webhooks(self, api):
+        api.webhooks_v3.all.return_value = [
+            {
+                'id': 1,
+                'scope': 'store/product/*',
+                'destination': 'https://example.com/hooks',
+                'is_active': True,
+            },
+            {
+                'id': 2,
+                'scope': 'store/order/*',
+                'destination': 'https://example.com/hooks',
+                'is_active': False,
+            },
+        ]
+
+        cache = BigCommerceReadCache(api)
+        cache.register_webhooks('https://example.com/hooks')
+
+        assert api.webhooks_v3.create.call_count == 2
+        api.webhooks_v3.update.assert_called_once_with(2, {'is_active': True})
@@ -0,0 +1,152 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.cart_session import CartSession
+from bigc.exceptions import InvalidDataError
+
+CART = {
+    'id': 'cart',
+    'line_items': {
+        'physical_items': [
+            {'id': 'a', 'product_id': 1, 'variant_id': 10, 'quantity': 1},
+            {'id': 'b', 'product_id': 2, 'variant_id': 20, 'quantity': 2},
+        ],
+        'digital_items': [
+            {'id': 'c', 'product_id': 3, 'variant_id': 30, 'quantity': 1},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def carts():
+    carts = MagicMock()
+    carts.get.return_value = CART
+    return carts
+
+
+class TestCartSession:
+    def test_diff(self, carts):
+        session = CartSession(carts, 'cart', cart=CART)
+
+        diff = session.diff(
+            [
+                {'product_id': 1, 'variant_id': 10, 'quantity': 1},
+                {'product_id': 2, 'variant_id': 20, 'quantity': 5},
+                {'product_id': 4, 'quantity': 1},
+                {'product_id': 4, 'quantity': 2},
+            ]
+        )
+
+        assert diff.add == [{'product_id': 4, 'quantity': 3}]
+        assert diff.update == [
+            ('b', {'line_item': {'product_id': 2, 'variant_id': 20, 'quantity': 5}})
+        ]
+        assert diff.delete == ['c']
+        assert diff.num_requests == 3
+        carts.get.assert_not_called()
+
+    def test_zero_quantity_is_deleted(self, carts):
+        session = CartSession(carts, 'cart', cart=CART)
+
+        diff = session.diff(
+            [
+                {'product_id': 1, 'variant_id': 10, 'quantity': 0},
+                {'product_id': 2, 'variant_id': 20, 'quantity': 2},
+                {'product_id': 3, 'variant_id': 30, 'quantity': 1},
+            ]
+        )
+
+        assert diff.delete == ['a']
+        assert not diff.add and not diff.update
+
+    def test_sync(self, carts):
+        final_cart = {'id': 'cart', 'line_items': {}}
+        carts.update_line_item.return_value = final_cart
+        carts.delete_line_item.return_value = final_cart
+        session = CartSession(carts, 'cart')
+
+        cart = session.sync(
+            [
+                {'product_id': 1, 'variant_id': 10, 'quantity': 3},
+                {'product_id': 4, 'quantity': 1},
+            ]
+        )
+
+        carts.get.assert_called_once()
+        carts.add_line_items.assert_called_once_with(
+            'cart',
+            {'line_items': [{'product_id': 4, 'quantity': 1}]},
+            params=None,
+            timeout=None,
+        )
+        carts.update_line_item.assert_called_once()
+        assert carts.delete_line_item.call_count == 2
+        assert cart is final_cart
+        assert session.cart is final_cart
+
+    def test_sync_without_changes(self, carts):
+        session = CartSession(carts, 'cart', cart=CART)
+
+        assert (
+            session.sync(
+                [
+                    {'product_id': 1, 'variant_id': 10, 'quantity': 1},
+                    {'product_id': 2, 'variant_id': 20, 'quantity': 2},
+                    {'product_id': 3, 'variant_id': 30, 'quantity': 1},
+                ]
+            )
+            is CART
+        )
+
+    def test_failed_sync_forgets_cart(self, carts):
+        carts.update_line_item.side_effect = InvalidDataError()
+        session = CartSession(carts, 'cart', cart=CART)
+
+        with pytest.raises(InvalidDataError):
+            session.sync(
+                [
+                    {'product_id': 1, 'variant_id': 10, 'quantity': 2},
+                    {'product_id': 2, 'variant_id': 20, 'quantity': 3},
+                ]
+            )
+
+        assert session.cart is None
+
+    def test_duplicate_line_items(self, carts):
+        duplicate = {'id': 'd', 'product_id': 1, 'variant_id': 10, 'quantity': 4}
+        cart = {
+            'id': 'cart',
+            'line_items': {
+                'physical_items': [*CART['line_items']['physical_items'], duplicate]
+            },
+        }
+        session = CartSession(carts, 'cart', cart=cart)
+
+        diff = session.diff([{'product_id': 1, 'variant_id': 10, 'quantity': 3}])
+
+        assert diff.add == []
+        assert diff.update == [
+            ('a', {'line_item': {'product_id': 1, 'variant_id': 10, 'quantity': 3}})
+        ]
+        assert sorted(diff.delete) == ['b', 'd']
+
+        # Unwanted, every line item for the variant is deleted
+        assert sorted(session.diff([]).delete) == ['a', 'b', 'd']
+
+    def test_match_without_variant_id(self, carts):
+        session = CartSession(carts, 'cart', cart=CART)
+
+        diff = session.diff(
+            [
+                {'product_id': 1, 'quantity': 1},
+                {'product_id': 2, 'quantity': 2},
+                {'product_id': 3, 'quantity': 4},
+            ]
+        )
+
+        assert diff.update == [
+            ('c', {'line_item': {'product_id': 3, 'variant_id': 30, 'quantity': 4}})
+        ]
+        assert not diff.add and not diff.delete
@@ -0,0 +1,186 @@
+import gzip
+import json
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from bigc import BigCommerceAPI
+from bigc.cassettes import CassetteMissError, RecordingTransport, ReplayTransport
+from bigc.exceptions import BigCommerceNetworkError, DoesNotExistError
+
+ORDERS = [{'id': i} for i in range(1, 6)]
+
+
+def make_response(status, body=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(
+        {
+            'Content-Type': 'application/json',
+            'Set-Cookie': 'session=secret',
+            'X-Rate-Limit-Requests-Left': '99',
+            'X-Rate-Limit-Requests-Quota': '100',
+            'X-Rate-Limit-Time-Reset-Ms': '1000',
+            'X-Rate-Limit-Time-Window-Ms': '30000',
+        }
+    )
+    response._content = b'' if body is None else json.dumps(body).encode()
+    response.encoding = 'utf-8'
+    return response
+
+
+class FakeStore(BaseAdapter):
+    """Serves pages of v2 orders, plus any queued responses or errors"""
+
+    def __init__(self, *queued):
+        super().__init__()
+        self.queued = deque(queued)
+
+    def send(self, request, **kwargs):
+        if self.queued:
+            item = self.queued.popleft()
+            if isinstance(item, Exception):
+                raise item
+            return make_response(*item)
+
+        query = parse_qs(urlsplit(request.url).query)
+        limit, page = int(query['limit'][0]), int(query['page'][0])
+        data = ORDERS[(page - 1) * limit : page * limit]
+        return make_response(200, data) if data else make_response(204)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    return tmp_path / 'cassette.jsonl'
+
+
+class TestCassettes:
+    def test_record_and_replay_pagination(self, cassette):
+        recording = RecordingTransport(cassette, transport=FakeStore())
+        with BigCommerceAPI('abc123', 'secret_token', transport=recording) as api:
+            recorded = list(api.api_v2.get_many('/orders', page_size=2))
+
+        assert recorded == ORDERS
+        contents = cassette.read_text()
+        assert 'secret' not in contents
+        assert 'abc123' not in contents
+        assert len(contents.splitlines()) == 3
+
+        replay = ReplayTransport(cassette, speed=None)
+        with BigCommerceAPI('other', 'other_token', transport=replay) as api:
+            assert list(api.api_v2.get_many('/orders', page_size=2)) == ORDERS
+            assert api.rate_limit.requests_left == 99
+
+        assert replay.num_remaining == 0
+
+    def test_replay_errors(self, cassette):
+        recording = RecordingTransport(
+            cassette,
+            transport=FakeStore(
+                (503, {'title': 'Unavailable'}),
+                (200, {'data': {'id': 7}}),
+                (404, {'title': 'Not found'}),
+                requests.ConnectionError(),
+                requests.exceptions.SSLError(),
+            ),
+        )
+        with BigCommerceAPI('abc123', 'token', transport=recording) as api:
+            assert api.api_v3.get('/catalog/products/7', retries=1) == {'id': 7}
+            with pytest.raises(DoesNotExistError):
+                api.api_v3.get('/catalog/products/8')
+            with pytest.raises(BigCommerceNetworkError):
+                api.api_v3.get('/catalog/products/9')
+            # Recorded as the nearest error that can be replayed
+            with pytest.raises(BigCommerceNetworkError):
+                api.api_v3.get('/catalog/products/10')
+
+        replay = ReplayTransport(cassette, speed=None)
+        with BigCommerceAPI('abc123', 'token', transport=replay) as api:
+            assert api.api_v3.get('/catalog/products/7', retries=1) == {'id': 7}
+            with pytest.raises(DoesNotExistError):
+                api.api_v3.get('/catalog/products/8')
+            with pytest.raises(BigCommerceNetworkError):
+                api.api_v3.get('/catalog/products/9')
+            with pytest.raises(BigCommerceNetworkError) as exc_info:
+                api.api_v3.get('/catalog/products/10')
+            assert type(exc_info.value.__cause__) is requests.ConnectionError
+            with pytest.raises(CassetteMissError):
+                api.api_v3.get('/catalog/products/11')
+
+    def test_request_body_key_order(self, tmp_path):
+        cassette = tmp_path / 'cassette.jsonl.gz'
+        recording = RecordingTransport(
+            cassette, transport=FakeStore((200, {'data': {'id': 1}}))
+        )
+        with BigCommerceAPI('abc123', 'token', transport=recording) as api:
+            api.api_v3.put('/catalog/products/1', data={'a': 1, 'b': 2})
+
+        replay = ReplayTransport(cassette, speed=None)
+        with BigCommerceAPI('abc123', 'token', transport=replay) as api:
+            assert api.api_v3.put('/catalog/products/1', data={'b': 2, 'a': 1}) == {
+                'id': 1
+            }
+
+    def test_gzipped_cassette_is_kept_open(self, tmp_path):
+        cassette = tmp_path / 'cassette.jsonl.gz'
+        recording = RecordingTransport(cassette, transport=FakeStore())
+        api = BigCommerceAPI('abc123', 'token', transport=recording)
+        assert list(api.api_v2.get_many('/orders', page_size=2)) == ORDERS
+
+        # Usable even if the recording is interrupted before it's closed
+        assert ReplayTransport(cassette).num_remaining == 3
+
+        api.close()
+        # A single compressed stream, rather than one per exchange
+        assert cassette.read_bytes().count(b'\x1f\x8b\x08') == 1
+        assert ReplayTransport(cassette).num_remaining == 3
+
+    @pytest.mark.parametrize('name', ['cassette.jsonl', 'cassette.jsonl.gz'])
+    def test_cut_off_last_line_is_skipped(self, tmp_path, name):
+        cassette = tmp_path / name
+        recording = RecordingTransport(cassette, transport=FakeStore())
+        with BigCommerceAPI('abc123', 'token', transport=recording) as api:
+            list(api.api_v2.get_many('/orders', page_size=2))
+
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(cassette, 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        with opener(cassette, 'wt', encoding='utf-8') as f:
+            f.write('\n'.join(lines[:2]) + '\n' + lines[2][:20])
+
+        assert ReplayTransport(cassette).num_remaining == 2
+
+        # Only the last line can be incomplete
+        with opener(cassette, 'wt', encoding='utf-8') as f:
+            f.write(lines[0][:20] + '\n' + '\n'.join(lines[1:]) + '\n')
+        with pytest.raises(json.JSONDecodeError):
+            ReplayTransport(cassette)
+
+    def test_replay_speed(self, cassette):
+        exchange = {
+            'request': 'GET /stores/{store_hash}/v3/test? ',
+            'elapsed': 0.1,
+            'status': 200,
+            'headers': {},
+            'body': '{"data": 1}',
+        }
+        cassette.write_text(json.dumps(exchange) + '\n' + json.dumps(exchange) + '\n')
+        replay = ReplayTransport(cassette, speed=10)
+
+        with BigCommerceAPI('abc123', 'token', transport=replay) as api:
+            start = time.monotonic()
+            assert api.api_v3.get('/test') == 1
+            assert 0.01 <= time.monotonic() - start < 0.1
+
+            replay.speed = 1
+            start = time.monotonic()
+            api.api_v3.get('/test')
+            assert time.monotonic() - start >= 0.1
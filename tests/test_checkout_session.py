@@ -0,0 +1,131 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.checkout_session import CheckoutSession, cheapest_shipping_option
+from bigc.exceptions import InvalidDataError
+
+CONSIGNMENT = {
+    'id': 'c1',
+    'available_shipping_options': [
+        {'id': 'express', 'cost': 20},
+        {'id': 'ground', 'cost': 5.5},
+    ],
+}
+
+
+@pytest.fixture
+def checkouts():
+    checkouts = MagicMock()
+    checkouts.add_billing_address.return_value = {
+        'id': 'checkout',
+        'billing_address': {'id': 'b1'},
+    }
+    checkouts.add_consignments.return_value = {
+        'id': 'checkout',
+        'consignments': [CONSIGNMENT],
+    }
+    checkouts.add_coupon.return_value = {
+        'id': 'checkout',
+        'coupons': [{'code': 'SAVE'}],
+    }
+    checkouts.update_consignment.return_value = {
+        'id': 'checkout',
+        'billing_address': {'id': 'b1'},
+        'consignments': [{'id': 'c1', 'selected_shipping_option': {'id': 'ground'}}],
+        'coupons': [{'code': 'SAVE'}],
+    }
+    checkouts.create_order.return_value = {'id': 101}
+    return checkouts
+
+
+def test_cheapest_shipping_option():
+    assert cheapest_shipping_option(CONSIGNMENT) == 'ground'
+
+    with pytest.raises(InvalidDataError):
+        cheapest_shipping_option({'id': 'c1', 'available_shipping_options': []})
+
+
+class TestCheckoutSession:
+    def test_complete(self, checkouts):
+        session = CheckoutSession(checkouts, 'checkout')
+
+        order = session.complete(
+            billing_address={'email': 'test@example.com'},
+            consignments=[{'line_items': []}],
+            coupon_code='SAVE',
+        )
+
+        assert order == {'id': 101}
+        checkouts.update_consignment.assert_called_once_with(
+            'checkout', 'c1', {'shipping_option_id': 'ground'}, timeout=None
+        )
+        checkouts.get.assert_not_called()
+        assert session.checkout == checkouts.update_consignment.return_value
+        assert session.timings.keys() == {
+            'add_billing_address',
+            'add_consignments',
+            'add_coupon',
+            'select_shipping_option:c1',
+            'create_order',
+            'complete',
+        }
+
+    def test_checkout_is_fetched_after_concurrent_steps(self, checkouts):
+        checkouts.get.return_value = {
+            'id': 'checkout',
+            'billing_address': {'id': 'b1'},
+            'coupons': [{'code': 'SAVE'}],
+            'grand_total': 90,
+        }
+        session = CheckoutSession(checkouts, 'checkout')
+
+        checkout = session.complete(
+            billing_address={'email': 'test@example.com'},
+            coupon_code='SAVE',
+            create_order=False,
+        )
+
+        assert checkout == checkouts.get.return_value
+        checkouts.get.assert_called_once()
+        checkouts.create_order.assert_not_called()
+
+    def test_checkout_is_fetched_when_shipping_is_already_selected(self, checkouts):
+        checkouts.add_consignments.return_value = {
+            'id': 'checkout',
+            'consignments': [{**CONSIGNMENT, 'selected_shipping_option': {'id': 'x'}}],
+        }
+        checkouts.get.return_value = {'id': 'checkout', 'coupons': [{'code': 'SAVE'}]}
+        session = CheckoutSession(checkouts, 'checkout')
+
+        checkout = session.complete(
+            consignments=[{'line_items': []}],
+            coupon_code='SAVE',
+            create_order=False,
+        )
+
+        assert checkout == checkouts.get.return_value
+        checkouts.update_consignment.assert_not_called()
+
+    def test_select_many_shipping_options(self, checkouts):
+        checkouts.get.return_value = {'id': 'checkout', 'grand_total': 90}
+        session = CheckoutSession(
+            checkouts,
+            'checkout',
+            checkout={'consignments': [CONSIGNMENT, {**CONSIGNMENT, 'id': 'c2'}]},
+        )
+
+        assert session.select_shipping_options() == checkouts.get.return_value
+        assert checkouts.update_consignment.call_count == 2
+
+    def test_failed_step_raises(self, checkouts):
+        checkouts.add_coupon.side_effect = InvalidDataError()
+        session = CheckoutSession(checkouts, 'checkout')
+
+        with pytest.raises(InvalidDataError):
+            session.complete(
+                billing_address={'email': 'test@example.com'}, coupon_code='BAD'
+            )
+
+        checkouts.add_billing_address.assert_called_once()
+        checkouts.create_order.assert_not_called()
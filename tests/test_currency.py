@@ -0,0 +1,124 @@
+import threading
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.currency import Currency, CurrencyTable
+from bigc.exceptions import DoesNotExistError, InternalServerError
+
+CURRENCIES = [
+    {
+        'currency_code': 'USD',
+        'currency_exchange_rate': '1.0000000000',
+        'decimal_places': 2,
+        'token': '$',
+        'token_location': 'left',
+        'decimal_token': '.',
+        'thousands_token': ',',
+        'is_default': True,
+    },
+    {
+        'currency_code': 'EUR',
+        'currency_exchange_rate': '0.9150000000',
+        'decimal_places': 2,
+        'token': ' €',
+        'token_location': 'right',
+        'decimal_token': ',',
+        'thousands_token': '.',
+        'is_default': False,
+    },
+    {
+        'currency_code': 'JPY',
+        'currency_exchange_rate': '149.3500000000',
+        'decimal_places': 0,
+        'token': '¥',
+        'token_location': 'left',
+        'decimal_token': '.',
+        'thousands_token': ',',
+        'is_default': False,
+    },
+]
+
+
+@pytest.fixture
+def currencies():
+    return MagicMock(all=MagicMock(return_value=CURRENCIES))
+
+
+class TestCurrency:
+    def test_round(self):
+        currency = Currency('USD', Decimal(1))
+
+        assert currency.round('2.345') == Decimal('2.35')
+        assert currency.round('-2.345') == Decimal('-2.35')
+
+    def test_format(self):
+        usd, eur, jpy = (Currency.from_api(data) for data in CURRENCIES)
+
+        assert usd.format('1234567.891') == '$1,234,567.89'
+        assert usd.format('-5') == '-$5.00'
+        assert eur.format('1234.5') == '1.234,50 €'
+        assert jpy.format('999.5') == '¥1,000'
+
+    def test_missing_tokens(self):
+        currency = Currency.from_api(
+            {
+                'currency_code': 'USD',
+                'currency_exchange_rate': '1',
+                'decimal_places': None,
+                'thousands_token': None,
+            }
+        )
+
+        assert currency.format('1234.5') == '1,234.50'
+
+
+class TestCurrencyTable:
+    def test_convert(self, currencies):
+        table = CurrencyTable(currencies, refresh_interval=None)
+
+        assert table.default.code == 'USD'
+        assert table.convert('10', 'USD', 'EUR') == Decimal('9.15')
+        assert table.convert('9.15', 'EUR', 'USD') == Decimal('10.00')
+        assert table.convert_many(['1.00', 10, Decimal('0.005')], 'USD', 'JPY') == [
+            Decimal(149),
+            Decimal(1494),
+            Decimal(1),
+        ]
+
+    def test_unknown_currency(self, currencies):
+        table = CurrencyTable(currencies, refresh_interval=None)
+
+        with pytest.raises(DoesNotExistError):
+            table.convert('1', 'USD', 'GBP')
+        with pytest.raises(DoesNotExistError):
+            table.get('GBP')
+
+    def test_background_refresh(self, currencies):
+        refreshed = threading.Event()
+        responses = [
+            InternalServerError(),
+            # Malformed, without an exchange rate
+            [{'currency_code': 'USD'}],
+            [{**CURRENCIES[0]}, {**CURRENCIES[1], 'currency_exchange_rate': '0.5'}],
+        ]
+
+        def all_currencies(**kwargs):
+            if len(responses) == 3 and currencies.all.call_count == 1:
+                return CURRENCIES
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            if not responses:
+                refreshed.set()
+            return response
+
+        currencies.all.side_effect = all_currencies
+
+        table = CurrencyTable(currencies, refresh_interval=0.01)
+        assert refreshed.wait(1)
+        table.close()
+
+        assert table.convert('10', 'USD', 'EUR') == Decimal('5.00')
+        assert 'JPY' not in table.currencies
@@ -0,0 +1,42 @@
+import pytest
+
+from bigc.deadlines import Deadline, current_deadline, deadline
+from bigc.exceptions import DeadlineExceededError
+
+
+class TestDeadline:
+    def test_remaining(self):
+        assert 0.9 < Deadline(1).remaining() <= 1
+        assert Deadline(-1).expired
+
+    def test_cap_timeout(self):
+        assert Deadline(10).cap_timeout(1) == 1
+        assert Deadline(1).cap_timeout(10) <= 1
+        assert Deadline(1).cap_timeout(None) <= 1
+
+        with pytest.raises(DeadlineExceededError):
+            Deadline(0).cap_timeout(1)
+
+    def test_resolve(self):
+        existing = Deadline(1)
+
+        assert Deadline.resolve(existing) is existing
+        assert isinstance(Deadline.resolve(5), Deadline)
+        assert Deadline.resolve(None) is None
+
+
+def test_deadline_context():
+    assert current_deadline() is None
+
+    with deadline(10) as outer:
+        assert current_deadline() is outer
+        assert Deadline.resolve(None) is outer
+
+        with deadline(1) as inner:
+            assert inner is not outer
+            assert current_deadline() is inner
+
+        with deadline(100) as longer:
+            assert longer is outer
+
+    assert current_deadline() is None
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import pytest
 
 from bigc.exceptions import *
@@ -111,3 +113,13 @@ class TestBigCommerceExceptionExtractErrorMessage:
 
         assert message == "The required field 'name' was not supplied."
         assert errors is None
+
+
+class TestTooManyRequestsError:
+    def test_retry_after(self):
+        response = MagicMock(headers={'X-Rate-Limit-Time-Reset-Ms': '1500'})
+
+        assert TooManyRequestsError(response=response).retry_after == 1.5
+
+    def test_retry_after_unknown(self):
+        assert TooManyRequestsError().retry_after is None
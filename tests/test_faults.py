@@ -0,0 +1,112 @@
+import json
+import time
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from bigc import BigCommerceAPI
+from bigc.exceptions import (
+    BigCommerceNetworkError,
+    BigCommerceServerError,
+    GatewayTimeoutError,
+    TooManyRequestsError,
+)
+from bigc.faults import FaultInjectionTransport
+
+
+class OkTransport(BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.num_sent = 0
+
+    def send(self, request, **kwargs):
+        self.num_sent += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({'data': {'id': 1}}).encode()
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self):
+        pass
+
+
+def make_api(**kwargs):
+    inner = OkTransport()
+    transport = FaultInjectionTransport(inner, seed=1, **kwargs)
+    return BigCommerceAPI('store_hash', 'token', transport=transport), transport, inner
+
+
+class TestFaultInjectionTransport:
+    def test_no_faults(self):
+        api, transport, inner = make_api()
+
+        assert api.api_v3.get('/test') == {'id': 1}
+        assert inner.num_sent == 1
+        assert not transport.faults
+
+    def test_latency(self):
+        api, _, _ = make_api(latency=lambda r: r.uniform(0.02, 0.03))
+
+        start = time.monotonic()
+        api.api_v3.get('/test')
+
+        assert time.monotonic() - start >= 0.02
+
+    def test_rate_limit(self):
+        api, transport, _ = make_api(rate_limit_rate=1.0, rate_limit_reset=2.5)
+
+        with pytest.raises(TooManyRequestsError) as exc_info:
+            api.api_v3.get('/test')
+
+        assert exc_info.value.retry_after == 2.5
+        assert api.rate_limit.requests_left == 0
+        assert transport.faults['rate_limit'] == 1
+
+    def test_server_error_bursts_are_retried(self):
+        api, transport, inner = make_api(server_error_rate=1.0, server_error_burst=3)
+
+        with pytest.raises(BigCommerceServerError):
+            api.api_v3.get('/test', retries=2)
+
+        transport.server_error_rate = 0.0
+        assert api.api_v3.get('/test', retries=2) == {'id': 1}
+        assert transport.faults['server_error'] == 3
+        assert inner.num_sent == 1
+
+    def test_connection_reset(self):
+        api, transport, _ = make_api(reset_rate=1.0)
+
+        with pytest.raises(BigCommerceNetworkError):
+            api.api_v3.get('/test')
+
+        assert transport.faults['reset'] == 1
+
+    def test_slow_body_times_out(self):
+        api, _, inner = make_api(slow_body_rate=1.0, slow_body_delay=10)
+
+        start = time.monotonic()
+        with pytest.raises(GatewayTimeoutError):
+            api.api_v3.get('/test', timeout=0.02)
+
+        assert time.monotonic() - start < 1
+        assert inner.num_sent == 0
+
+    def test_seeded_faults_repeat(self):
+        def run():
+            api, _, _ = make_api(reset_rate=0.3, server_error_rate=0.3)
+            outcomes = []
+            for _ in range(20):
+                try:
+                    api.api_v3.get('/test')
+                    outcomes.append('ok')
+                except BigCommerceNetworkError:
+                    outcomes.append('reset')
+                except BigCommerceServerError:
+                    outcomes.append('error')
+            return outcomes
+
+        outcomes = run()
+        assert outcomes == run()
+        assert set(outcomes) == {'ok', 'reset', 'error'}
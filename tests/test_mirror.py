@@ -0,0 +1,132 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.exceptions import DoesNotExistError
+from bigc.mirror import BigCommerceMirror
+
+ORDERS = [
+    {
+        'id': 1,
+        'customer_id': 10,
+        'status_id': 11,
+        'billing_address': {'email': 'Someone@Example.com'},
+        'date_created': 'Mon, 01 Jan 2024 00:00:00 +0000',
+        'date_modified': 'Mon, 01 Jan 2024 00:00:00 +0000',
+    },
+    {
+        'id': 2,
+        'customer_id': 20,
+        'status_id': 2,
+        'billing_address': {'email': 'other@example.com'},
+        'date_created': 'Tue, 02 Jan 2024 00:00:00 +0000',
+        'date_modified': 'Wed, 03 Jan 2024 00:00:00 +0000',
+    },
+]
+PRODUCTS = [
+    {
+        'id': 1,
+        'sku': 'ABC',
+        'is_visible': True,
+        'date_modified': '2024-01-01T00:00:00+00:00',
+    },
+    {
+        'id': 2,
+        'sku': 'DEF',
+        'is_visible': False,
+        'date_modified': '2024-01-02T00:00:00+00:00',
+    },
+]
+CUSTOMERS = [
+    {
+        'id': 10,
+        'email': 'someone@example.com',
+        'customer_group_id': 1,
+        'date_created': '2024-01-01T00:00:00Z',
+        'date_modified': '2024-01-01T00:00:00Z',
+    },
+]
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.orders_v2.all.return_value = ORDERS
+    api.products_v3.all.return_value = PRODUCTS
+    api.customers_v3.all.return_value = CUSTOMERS
+    return api
+
+
+@pytest.fixture
+def mirror(api):
+    mirror = BigCommerceMirror(api)
+    mirror.sync()
+    yield mirror
+    mirror.close()
+
+
+class TestBigCommerceMirror:
+    def test_sync(self, api):
+        mirror = BigCommerceMirror(api)
+
+        assert mirror.sync() == {'orders': 2, 'products': 2, 'customers': 1}
+        api.orders_v2.all.assert_called_once_with(params=None, timeout=None)
+
+    def test_incremental_sync(self, api, mirror):
+        api.orders_v2.all.return_value = [{**ORDERS[0], 'status_id': 2}]
+        api.products_v3.all.return_value = []
+
+        mirror.sync()
+
+        api.orders_v2.all.assert_called_with(
+            params={'min_date_modified': 'Wed, 03 Jan 2024 00:00:00 +0000'},
+            timeout=None,
+        )
+        api.products_v3.all.assert_called_with(
+            params={'date_modified:min': '2024-01-02T00:00:00+00:00'}, timeout=None
+        )
+        assert mirror.orders_v2.count(params={'status_id': 2}) == 2
+        assert mirror.products_v3.count() == 2
+
+    def test_full_sync_removes_deleted_records(self, api, mirror):
+        api.products_v3.all.return_value = PRODUCTS[:1]
+
+        mirror.sync(full=True)
+
+        assert [product['id'] for product in mirror.products_v3.all()] == [1]
+
+    def test_get(self, mirror):
+        assert mirror.orders_v2.get(2) == ORDERS[1]
+
+        with pytest.raises(DoesNotExistError):
+            mirror.orders_v2.get(3)
+
+    def test_filters(self, mirror):
+        def order_ids(params):
+            return [order['id'] for order in mirror.orders_v2.all(params=params)]
+
+        assert order_ids({'customer_id': 20}) == [2]
+        assert order_ids({'email': 'someone@example.com'}) == [1]
+        assert order_ids({'min_date_created': 'Tue, 02 Jan 2024 00:00:00 +0000'}) == [2]
+        assert order_ids({'min_id': 1, 'status_id': 11}) == [1]
+
+        assert mirror.products_v3.get(1) == PRODUCTS[0]
+        assert [
+            p['id'] for p in mirror.products_v3.all(params={'sku:in': 'ABC,DEF'})
+        ] == [
+            1,
+            2,
+        ]
+        assert list(
+            mirror.customers_v3.all(params={'email:in': ['SOMEONE@example.com']})
+        ) == (CUSTOMERS)
+
+    def test_unsupported_filter(self, mirror):
+        with pytest.raises(ValueError):
+            list(mirror.orders_v2.all(params={'sort': 'id:desc'}))
+
+    def test_upsert_and_delete(self, mirror):
+        mirror.products_v3.upsert([{'id': 3, 'sku': 'GHI', 'date_modified': None}])
+        mirror.products_v3.delete([1])
+
+        assert [p['id'] for p in mirror.products_v3.all()] == [2, 3]
@@ -0,0 +1,127 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.data import BigCommerceOrderStatus
+from bigc.order_stats import OrderGroup, OrderStats, fetch_order_stats
+
+pytest.importorskip('numpy')
+
+ORDERS = [
+    {
+        'id': 1,
+        'status_id': 11,
+        'channel_id': 1,
+        'total_inc_tax': '10.0000',
+        'date_created': 'Mon, 01 Jan 2024 10:00:00 +0000',
+        'date_modified': 'Mon, 01 Jan 2024 10:00:00 +0000',
+    },
+    {
+        'id': 2,
+        'status_id': 11,
+        'channel_id': 2,
+        'total_inc_tax': '0.1000',
+        'date_created': 'Mon, 01 Jan 2024 12:00:00 +0000',
+        'date_modified': 'Tue, 02 Jan 2024 12:00:00 +0000',
+    },
+    {
+        'id': 3,
+        'status_id': 2,
+        'channel_id': 1,
+        'total_inc_tax': '5.2500',
+        'date_created': 'Tue, 02 Jan 2024 12:00:00 +0000',
+        'date_modified': 'Tue, 02 Jan 2024 12:00:00 +0000',
+    },
+]
+
+
+class TestOrderStats:
+    def test_from_orders(self):
+        stats = OrderStats.from_orders(ORDERS, chunk_size=2)
+
+        assert len(stats) == 3
+        assert stats.ids.tolist() == [1, 2, 3]
+        assert stats.totals.tolist() == [1000, 10, 525]
+        assert stats.dates_created[0] == 1704103200
+        assert stats.total() == Decimal('15.35')
+
+    def test_totals_round_half_up(self):
+        orders = [
+            {**ORDERS[0], 'total_inc_tax': total}
+            for total in ('10.1250', '10.1350', '-0.0050', None)
+        ]
+
+        stats = OrderStats.from_orders(orders)
+
+        assert stats.totals.tolist() == [1013, 1014, -1, 0]
+
+    def test_group_by(self):
+        stats = OrderStats.from_orders(ORDERS)
+
+        assert stats.group_by('status') == [
+            OrderGroup(BigCommerceOrderStatus.SHIPPED, 1, Decimal('5.25')),
+            OrderGroup(BigCommerceOrderStatus.AWAITING_FULFILLMENT, 2, Decimal('10.1')),
+        ]
+        assert stats.group_by('channel') == [
+            OrderGroup(1, 2, Decimal('15.25')),
+            OrderGroup(2, 1, Decimal('0.1')),
+        ]
+        assert [group.key for group in stats.group_by('day')] == [
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 2),
+        ]
+
+        with pytest.raises(ValueError):
+            stats.group_by('customer')
+
+    def test_filter(self):
+        stats = OrderStats.from_orders(ORDERS)
+
+        filtered = stats.filter(
+            status_ids=[11],
+            created_min=datetime.datetime(2024, 1, 1, 11, tzinfo=datetime.timezone.utc),
+        )
+
+        assert filtered.ids.tolist() == [2]
+
+    def test_status_transitions(self):
+        previous = OrderStats.from_orders(ORDERS)
+        current = OrderStats.from_orders(
+            [{**ORDERS[0], 'status_id': 2}, ORDERS[2], {**ORDERS[1], 'id': 4}]
+        )
+
+        assert current.status_transitions(previous) == {
+            (
+                BigCommerceOrderStatus.AWAITING_FULFILLMENT,
+                BigCommerceOrderStatus.SHIPPED,
+            ): 1
+        }
+
+    def test_empty(self):
+        stats = OrderStats.from_orders([])
+
+        assert len(stats) == 0
+        assert stats.group_by('status') == []
+        assert stats.count_by_status() == {}
+
+
+def test_fetch_order_stats():
+    api = MagicMock()
+    api.orders_v2.all.side_effect = lambda params, **kwargs: [
+        order for order in ORDERS if order['status_id'] == params['status_id']
+    ]
+
+    stats = fetch_order_stats(
+        api, status_ids=[2, 11], params={'min_date_created': '2024-01-01'}
+    )
+
+    assert sorted(stats.ids.tolist()) == [1, 2, 3]
+    api.orders_v2.all.assert_any_call(
+        params={'min_date_created': '2024-01-01', 'status_id': 11}, timeout=None
+    )
+    assert stats.count_by_status() == {
+        BigCommerceOrderStatus.SHIPPED: 1,
+        BigCommerceOrderStatus.AWAITING_FULFILLMENT: 2,
+    }
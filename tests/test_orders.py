@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.resources.orders_v2 import BigCommerceOrdersV2API
+from bigc.resources.orders_v3 import BigCommerceOrdersV3API
+
+NOW = datetime.now(timezone.utc)
+PAYMENTS = [{'provider_id': 'storecredit', 'amount': 10, 'offline': False}]
+
+
+def make_refund(refund_id, items, *, created=NOW, payments=PAYMENTS):
+    return {
+        'id': refund_id,
+        'items': items,
+        'payments': [
+            {'provider_id': p['provider_id'], 'amount': str(p['amount'])}
+            for p in payments
+        ],
+        'created': format_datetime(created),
+    }
+
+
+class TestRetryableCreates:
+    def test_order_retries_need_external_id(self):
+        api = MagicMock()
+        orders = BigCommerceOrdersV2API(api)
+
+        with pytest.raises(ValueError):
+            orders.create({'products': []}, retries=2)
+        api.post.assert_not_called()
+
+        orders.create({'external_id': 'abc', 'products': []}, retries=2)
+        assert api.post.call_args.kwargs['data'] == {
+            'external_id': 'abc',
+            'products': [],
+        }
+
+        # Orders aren't changed when they aren't retried
+        orders.create({'products': []})
+        assert api.post.call_args.kwargs['data'] == {'products': []}
+
+    def test_shipment_retries_need_tracking_number(self):
+        api = MagicMock()
+        api.get_many.return_value = [
+            {'id': 1, 'date_created': format_datetime(NOW)},
+            {
+                'id': 2,
+                'tracking_number': 'TRACK',
+                'date_created': format_datetime(NOW - timedelta(days=1)),
+            },
+            {
+                'id': 3,
+                'tracking_number': 'TRACK',
+                'date_created': format_datetime(NOW),
+            },
+        ]
+        orders = BigCommerceOrdersV2API(api)
+
+        with pytest.raises(ValueError):
+            orders.create_shipment(101, {'order_address_id': 1}, retries=2)
+
+        orders.create_shipment(101, {'tracking_number': 'TRACK'}, retries=2)
+        find_existing = api.post.call_args.kwargs['find_existing']
+        assert find_existing()['id'] == 3
+
+
+class TestFindRefund:
+    def find(self, refunds, data, created_after=NOW - timedelta(minutes=1)):
+        api = MagicMock()
+        api.get_many.return_value = refunds
+        return BigCommerceOrdersV3API(api).find_refund(
+            101, data, created_after=created_after
+        )
+
+    def test_amounts_must_match(self):
+        data = {
+            'items': [{'item_type': 'ORDER', 'item_id': 101, 'amount': 10}],
+            'payments': PAYMENTS,
+        }
+        refunds = [
+            make_refund(
+                1, [{'item_type': 'ORDER', 'item_id': 101, 'requested_amount': '5'}]
+            ),
+            make_refund(
+                2,
+                [{'item_type': 'ORDER', 'item_id': 101, 'requested_amount': '10.00'}],
+            ),
+        ]
+
+        assert self.find(refunds, data)['id'] == 2
+
+    def test_payments_must_match(self):
+        items = [{'item_type': 'PRODUCT', 'item_id': 1, 'quantity': 1}]
+        refunds = [
+            make_refund(1, items, payments=[{'provider_id': 'other', 'amount': 10}])
+        ]
+
+        assert self.find(refunds, {'items': items, 'payments': PAYMENTS}) is None
+        # Without payments, e.g. when resuming, only the items are compared
+        assert self.find(refunds, {'items': items})['id'] == 1
+
+    def test_earlier_refunds_are_ignored(self):
+        items = [{'item_type': 'PRODUCT', 'item_id': 1, 'quantity': 1}]
+        refunds = [make_refund(1, items, created=NOW - timedelta(minutes=2))]
+
+        assert self.find(refunds, {'items': items}) is None
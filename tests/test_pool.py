@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from bigc.exceptions import BigCommerceNetworkError
+from bigc.pool import SessionPool
+
+
+class TestSessionPool:
+    def test_sessions_are_reused(self):
+        pool = SessionPool()
+
+        with pool.session() as first:
+            pass
+        with pool.session() as second:
+            pass
+
+        assert first is second
+        assert pool.stats().num_created == 1
+
+    def test_grows_with_concurrency(self):
+        pool = SessionPool()
+
+        with pool.session() as first, pool.session() as second:
+            assert first is not second
+            assert pool.stats().in_use == 2
+            assert pool.stats().utilization == 2 / 16
+
+        assert pool.stats().idle == 2
+
+    def test_bounded(self):
+        pool = SessionPool(1)
+        borrowed = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pool.session():
+                borrowed.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        borrowed.wait()
+
+        with pytest.raises(TimeoutError), pool.session(timeout=0.01):
+            pass
+
+        threading.Timer(0.02, release.set).start()
+        with pool.session():
+            pass
+        thread.join()
+
+        stats = pool.stats()
+        assert stats.num_created == 1
+        assert stats.num_waits == 2
+
+    def test_reap(self):
+        pool = SessionPool(idle_timeout=0.01)
+
+        with pool.session() as first:
+            pass
+        time.sleep(0.02)
+
+        with pool.session() as second:
+            pass
+
+        assert first is not second
+        assert pool.stats().num_reaped == 1
+
+    def test_reap_races_with_requests(self):
+        class TakenWhileChecking(deque):
+            def __getitem__(self, index):
+                # Another thread takes the last idle session
+                self.clear()
+                return super().__getitem__(index)
+
+        pool = SessionPool(idle_timeout=0.01)
+        with pool.session():
+            pass
+        pool._idle = TakenWhileChecking(pool._idle)
+
+        assert pool.reap() == 0
+
+    def test_close_waits_for_sessions_in_use(self):
+        pool = SessionPool()
+
+        with pool.session():
+            pool.close()
+            assert pool.closed
+
+        assert pool.stats().idle == 0
+        with pytest.raises(RuntimeError), pool.session():
+            pass
+
+    def test_warmup(self):
+        pool = SessionPool()
+        probed = []
+
+        def probe(session):
+            time.sleep(0.01)
+            probed.append(session)
+
+        pool.warmup(probe, 3)
+
+        assert len(set(probed)) == 3
+        assert pool.stats().idle == 3
+
+        with pytest.raises(ValueError):
+            pool.warmup(probe, 17)
+
+    def test_warmup_raises(self):
+        pool = SessionPool()
+
+        def probe(session):
+            raise BigCommerceNetworkError()
+
+        with pytest.raises(BigCommerceNetworkError):
+            pool.warmup(probe, 2)
+
+        assert pool.stats().in_use == 0
+
+    def test_keep_alive(self):
+        pool = SessionPool()
+        probed = []
+
+        def probe(session):
+            probed.append(session)
+            if len(probed) == 1:
+                raise BigCommerceNetworkError()
+
+        with pool.session() as first, pool.session() as second:
+            pass
+
+        pool.start_keep_alive(probe, 0.02)
+        time.sleep(0.09)
+        pool.close()
+
+        # The session that failed its check was closed
+        assert probed[0] in (first, second)
+        assert set(probed[1:]) == {first, second} - {probed[0]}
+        stats = pool.stats()
+        assert stats.num_probe_failures == 1
+        assert stats.in_use == 0
+
+    def test_close_doesnt_wait_for_hung_checks(self):
+        pool = SessionPool()
+        probing = threading.Event()
+        hung = threading.Event()
+
+        def probe(session):
+            probing.set()
+            hung.wait()
+
+        with pool.session(), pool.session():
+            pass
+
+        pool.start_keep_alive(probe, 0.01, timeout=0.05)
+        assert probing.wait(1)
+        start = time.monotonic()
+        pool.close()
+
+        assert time.monotonic() - start < 0.5
+        hung.set()
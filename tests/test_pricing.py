@@ -0,0 +1,97 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.exceptions import BadRequestError
+from bigc.pricing import PricingService
+
+
+def get_pricing(data, **kwargs):
+    return [
+        {**item, 'calculated_price': {'as_entered': item['product_id'] * 10}}
+        for item in data['items']
+    ]
+
+
+@pytest.fixture
+def pricing():
+    return MagicMock(get_pricing=MagicMock(side_effect=get_pricing))
+
+
+class TestPricingService:
+    def test_get_prices(self, pricing):
+        service = PricingService(pricing, batch_delay=0)
+
+        prices = service.get_prices([(1, 10), (2, 20)], currency_code='CAD')
+
+        assert prices[1, 10]['calculated_price'] == {'as_entered': 10}
+        assert prices[2, 20]['calculated_price'] == {'as_entered': 20}
+        data = pricing.get_pricing.call_args.args[0]
+        assert data['currency_code'] == 'CAD'
+        assert sorted(item['product_id'] for item in data['items']) == [1, 2]
+
+    def test_prices_are_cached(self, pricing):
+        service = PricingService(pricing, batch_delay=0)
+
+        service.get_prices([(1, 10), (2, 20)])
+        service.get_prices([(1, 10)])
+        service.get_prices([(1, 10)], customer_group_id=2)
+
+        assert pricing.get_pricing.call_count == 2
+
+    def test_invalidate(self, pricing):
+        service = PricingService(pricing, batch_delay=0)
+
+        service.get_prices([(1, 10), (2, 20)])
+        service.invalidate(1)
+        service.get_prices([(1, 10), (2, 20)])
+
+        assert pricing.get_pricing.call_count == 2
+        assert pricing.get_pricing.call_args.args[0]['items'] == [
+            {'product_id': 1, 'variant_id': 10}
+        ]
+
+    def test_batch_size(self, pricing):
+        service = PricingService(pricing, batch_delay=0, max_batch_size=2)
+
+        prices = service.get_prices([(i, i) for i in range(5)])
+
+        assert len(prices) == 5
+        assert pricing.get_pricing.call_count == 3
+
+    def test_missing_price(self, pricing):
+        pricing.get_pricing.side_effect = None
+        pricing.get_pricing.return_value = []
+        service = PricingService(pricing, batch_delay=0)
+
+        assert service.get_price(1, 10) is None
+
+    def test_concurrent_callers_share_requests(self, pricing):
+        service = PricingService(pricing, batch_delay=0.05)
+        results = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(service.get_prices([(1, 10), (2, 20)]))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8
+        assert pricing.get_pricing.call_count == 1
+
+    def test_errors_are_raised(self, pricing):
+        pricing.get_pricing.side_effect = BadRequestError()
+        service = PricingService(pricing, batch_delay=0)
+
+        with pytest.raises(BadRequestError):
+            service.get_prices([(1, 10)])
+
+        # Nothing is left waiting on the failed request
+        pricing.get_pricing.side_effect = get_pricing
+        assert service.get_price(1, 10) is not None
@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from bigc.deadlines import Deadline
+from bigc.priority import Priority, RequestScheduler, current_priority, priority
+
+
+def make_scheduler(headroom=None, **kwargs):
+    return RequestScheduler(MagicMock(headroom=headroom), **kwargs)
+
+
+class TestRequestScheduler:
+    def test_resolve(self):
+        scheduler = make_scheduler()
+
+        assert scheduler.resolve(None) == Priority.HIGH
+        assert scheduler.resolve(Priority.LOW) == Priority.LOW
+
+        with priority(Priority.LOW):
+            assert scheduler.resolve(None) == Priority.LOW
+            assert scheduler.resolve(Priority.HIGH) == Priority.HIGH
+
+    def test_high_priority_block_under_low_default(self):
+        scheduler = make_scheduler(default_priority=Priority.LOW)
+
+        assert scheduler.resolve(None) == Priority.LOW
+        with priority(Priority.HIGH):
+            assert scheduler.resolve(None) == Priority.HIGH
+
+    def test_low_priority_waits_for_high_priority(self):
+        scheduler = make_scheduler(poll_interval=1)
+        high_started = threading.Event()
+        release_high = threading.Event()
+
+        def high():
+            with scheduler.slot(Priority.HIGH):
+                high_started.set()
+                release_high.wait()
+
+        thread = threading.Thread(target=high)
+        thread.start()
+        high_started.wait()
+
+        threading.Timer(0.05, release_high.set).start()
+        start = time.monotonic()
+        with scheduler.slot(Priority.LOW):
+            elapsed = time.monotonic() - start
+        thread.join()
+
+        # Woken as soon as the high priority request finished
+        assert 0.04 < elapsed < 0.5
+        assert scheduler.num_delayed == 1
+        assert scheduler.num_high_in_progress == 0
+
+    def test_high_priority_never_waits(self):
+        scheduler = make_scheduler(headroom=0.0)
+
+        start = time.monotonic()
+        with scheduler.slot(Priority.HIGH), scheduler.slot(Priority.HIGH):
+            pass
+
+        assert time.monotonic() - start < 0.05
+        assert scheduler.num_delayed == 0
+
+    def test_headroom_is_reserved(self):
+        rate_limit = MagicMock(headroom=0.1)
+        scheduler = RequestScheduler(
+            rate_limit, reserved_headroom=0.2, poll_interval=0.01
+        )
+
+        def reset():
+            rate_limit.headroom = 1.0
+
+        threading.Timer(0.05, reset).start()
+        start = time.monotonic()
+        with scheduler.slot(Priority.LOW):
+            pass
+
+        assert time.monotonic() - start >= 0.04
+        assert scheduler.num_delayed == 1
+
+    def test_max_delay(self):
+        scheduler = make_scheduler(headroom=0.0, max_delay=0.05, poll_interval=0.01)
+
+        start = time.monotonic()
+        with scheduler.slot(Priority.LOW):
+            pass
+
+        assert 0.04 < time.monotonic() - start < 0.5
+
+    def test_waiting_stops_at_deadline(self):
+        scheduler = make_scheduler(headroom=0.0, poll_interval=0.01)
+
+        start = time.monotonic()
+        with scheduler.slot(Priority.LOW, deadline=Deadline(0.05)):
+            pass
+
+        assert time.monotonic() - start < 0.5
+
+
+def test_priority_context():
+    assert current_priority() is None
+
+    with priority(Priority.LOW):
+        assert current_priority() == Priority.LOW
+
+        with priority(Priority.HIGH):
+            assert current_priority() == Priority.HIGH
+
+        assert current_priority() == Priority.LOW
+
+    assert current_priority() is None
@@ -0,0 +1,165 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.exceptions import (
+    ConflictError,
+    InvalidDataError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
+)
+from bigc.priority import Priority, current_priority, priority
+from bigc.resources.products_v3 import BigCommerceProductsV3API, ProductBatchError
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.rate_limit.time_until_reset = 0.01
+    return api
+
+
+def updated(path, *, data, **kwargs):
+    if any(product.get('price', 0) < 0 for product in data):
+        raise InvalidDataError('Invalid price.')
+    return {'data': [{**product, 'updated': True} for product in data]}
+
+
+class TestBatches:
+    def test_update_many_chunks(self, api):
+        api.put.side_effect = updated
+        products = [{'id': i, 'price': 1} for i in range(25)]
+
+        result = BigCommerceProductsV3API(api).update_many(products)
+
+        assert [product['id'] for product in result.succeeded] == list(range(25))
+        assert result.failed == []
+        batch_sizes = [len(call.kwargs['data']) for call in api.put.call_args_list]
+        assert sorted(batch_sizes) == [5, 10, 10]
+
+    def test_invalid_products_are_isolated(self, api):
+        api.put.side_effect = updated
+        products = [{'id': i, 'price': -1 if i == 3 else 1} for i in range(10)]
+
+        result = BigCommerceProductsV3API(api).update_many(products)
+
+        succeeded_ids = [product['id'] for product in result.succeeded]
+        assert succeeded_ids == [i for i in range(10) if i != 3]
+        assert len(result.failed) == 1
+        assert result.failed[0].product == {'id': 3, 'price': -1}
+        assert isinstance(result.failed[0].error, InvalidDataError)
+        # The batch, then each product on its own
+        assert api.put.call_count == 11
+
+    def test_server_errors_fail_the_batch(self, api):
+        error = ServiceUnavailableError()
+        api.put.side_effect = error
+
+        result = BigCommerceProductsV3API(api).update_many(
+            [{'id': 1}, {'id': 2}], retries=1
+        )
+
+        assert result.succeeded == []
+        assert result.failed == [
+            ProductBatchError({'id': 1}, error),
+            ProductBatchError({'id': 2}, error),
+        ]
+        api.put.assert_called_once()
+        assert api.put.call_args.kwargs['retries'] == 1
+
+    def test_partial_success(self, api):
+        api.put.return_value = {
+            'data': [{'id': 1}, {'id': 3}],
+            'errors': [
+                {'status': 409, 'title': 'The product name is a duplicate'},
+                {'status': 422, 'title': 'The price is invalid'},
+            ],
+        }
+        products = [{'id': i} for i in range(1, 5)]
+
+        result = BigCommerceProductsV3API(api).update_many(products)
+
+        assert result.succeeded == [{'id': 1}, {'id': 3}]
+        assert [error.product for error in result.failed] == [{'id': 2}, {'id': 4}]
+        assert isinstance(result.failed[0].error, ConflictError)
+        assert result.failed[0].error.message == 'The product name is a duplicate'
+        assert isinstance(result.failed[1].error, InvalidDataError)
+        # Failures that were reported aren't sent again
+        api.put.assert_called_once()
+
+    def test_unmatched_partial_failures(self, api):
+        api.put.return_value = {
+            'data': [{'id': 1}],
+            'errors': [{'status': 422, 'title': 'Something was invalid'}],
+        }
+
+        result = BigCommerceProductsV3API(api).update_many(
+            [{'id': 1}, {'id': 2}, {'id': 3}]
+        )
+
+        assert result.succeeded == [{'id': 1}]
+        assert [error.product for error in result.failed] == [{'id': 2}, {'id': 3}]
+        assert result.failed[0].error.message == 'Something was invalid'
+
+    def test_rate_limited_batches_are_retried(self, api):
+        api.put.side_effect = [TooManyRequestsError(), {'data': [{'id': 1}]}]
+
+        result = BigCommerceProductsV3API(api).update_many([{'id': 1}])
+
+        assert result.succeeded == [{'id': 1}]
+        assert api.put.call_count == 2
+
+    def test_batches_keep_the_callers_context(self, api):
+        priorities = []
+
+        def put(path, *, data, **kwargs):
+            priorities.append(current_priority())
+            return {'data': data}
+
+        api.put.side_effect = put
+
+        with priority(Priority.LOW):
+            BigCommerceProductsV3API(api).update_many([{'id': i} for i in range(30)])
+
+        assert priorities == [Priority.LOW] * 3
+
+    def test_create_many(self, api):
+        api.post.side_effect = lambda path, *, data, **kwargs: {'id': 1, **data}
+        products = [{'name': 'Hat'}, {'name': 'Scarf', 'sku': 'SCARF'}]
+
+        result = BigCommerceProductsV3API(api).create_many(
+            products, max_workers=1, timeout=5
+        )
+
+        assert result.succeeded == [
+            {'id': 1, 'name': 'Hat'},
+            {'id': 1, 'name': 'Scarf', 'sku': 'SCARF'},
+        ]
+        assert api.post.call_count == 2
+
+        # Retries look for a product created by the failed attempt
+        find_existing = api.post.call_args.kwargs['find_existing']
+        api.get.return_value = [
+            {'id': 2, 'sku': 'SCARF', 'date_created': '2020-01-01T00:00:00+00:00'},
+            {'id': 3, 'sku': 'OTHER', 'date_created': NOW.isoformat()},
+            {'id': 4, 'sku': 'SCARF', 'date_created': NOW.isoformat()},
+        ]
+        assert find_existing()['id'] == 4
+        api.get.assert_called_once_with(
+            '/catalog/products', params={'name': 'Scarf'}, timeout=5
+        )
+
+        # A product that already had the name wasn't created by this
+        api.get.return_value = api.get.return_value[:1]
+        assert find_existing() is None
+
+    def test_delete_many(self, api):
+        result = BigCommerceProductsV3API(api).delete_many(range(300))
+
+        assert result.succeeded == list(range(300))
+        assert sorted(
+            len(call.kwargs['params']['id:in']) for call in api.delete.call_args_list
+        ) == [50, 250]
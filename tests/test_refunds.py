@@ -0,0 +1,216 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.exceptions import BadRequestError, DoesNotExistError, GatewayTimeoutError
+from bigc.refunds import BulkRefundRunner, RefundIndex, RefundResult, export_refunds
+
+ITEMS = [{'item_type': 'PRODUCT', 'item_id': 1, 'quantity': 1}]
+QUOTE = {
+    'total_refund_amount': 10.5,
+    'refund_methods': [[{'provider_id': 'storecredit', 'amount': 10.5}]],
+}
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+REFUNDS = [
+    {'id': 1, 'order_id': 10, 'created_at': START + timedelta(hours=1)},
+    # On the boundary between two windows
+    {'id': 2, 'order_id': 20, 'created_at': START + timedelta(days=1)},
+    {'id': 3, 'order_id': 30, 'created_at': START + timedelta(days=1, hours=1)},
+    {'id': 4, 'order_id': 40, 'created_at': START + timedelta(days=3, hours=1)},
+]
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.orders_v3.get_refund_quote.return_value = QUOTE
+    api.orders_v3.create_refund.side_effect = lambda order_id, *args, **kwargs: {
+        'id': order_id * 100
+    }
+    api.orders_v3.find_refund.return_value = None
+    return api
+
+
+def run(runner, order_ids):
+    results = runner.run((order_id, ITEMS) for order_id in order_ids)
+    return {result.order_id: result for result in results}
+
+
+class TestBulkRefundRunner:
+    def test_run(self, api):
+        results = run(BulkRefundRunner(api), [1, 2, 3])
+
+        assert {result.status for result in results.values()} == {'refunded'}
+        assert results[2].refund == {'id': 200}
+        assert api.orders_v3.create_refund.call_count == 3
+        api.orders_v3.create_refund.assert_any_call(
+            1,
+            {
+                'items': ITEMS,
+                'payments': [
+                    {'provider_id': 'storecredit', 'amount': 10.5, 'offline': False}
+                ],
+            },
+            timeout=None,
+            retries=2,
+        )
+
+    def test_dry_run(self, api):
+        results = run(BulkRefundRunner(api, dry_run=True), [1, 2])
+
+        assert {result.status for result in results.values()} == {'dry_run'}
+        assert results[1].quote == QUOTE
+        api.orders_v3.create_refund.assert_not_called()
+
+    def test_invalid_quote(self, api):
+        runner = BulkRefundRunner(
+            api,
+            max_refund_amount='10',
+            validate_quote=lambda order_id, quote: None,
+        )
+
+        result = run(runner, [1])[1]
+
+        assert result.status == 'invalid'
+        assert result.error == 'Refund of 10.5 is over the limit of 10.'
+        api.orders_v3.create_refund.assert_not_called()
+
+    def test_failed_quote(self, api):
+        api.orders_v3.get_refund_quote.side_effect = BadRequestError()
+
+        results = run(BulkRefundRunner(api), [1, 2])
+
+        assert {result.status for result in results.values()} == {'failed'}
+        api.orders_v3.create_refund.assert_not_called()
+
+    def test_failed_refund_is_unknown(self, api, tmp_path):
+        journal_path = tmp_path / 'refunds.jsonl'
+        api.orders_v3.create_refund.side_effect = GatewayTimeoutError()
+
+        results = run(BulkRefundRunner(api, journal_path=journal_path), [1])
+
+        assert results[1].status == 'unknown'
+
+        # The refund went through after all
+        api.reset_mock()
+        api.orders_v3.find_refund.return_value = {'id': 123}
+        results = run(BulkRefundRunner(api, journal_path=journal_path), [1])
+
+        assert results[1].status == 'refunded'
+        assert api.orders_v3.find_refund.call_args.args[1] == {
+            'items': ITEMS,
+            'payments': [
+                {'provider_id': 'storecredit', 'amount': 10.5, 'offline': False}
+            ],
+        }
+        api.orders_v3.create_refund.assert_not_called()
+
+    def test_submitted_refund_is_looked_up_after_later_failures(self, api, tmp_path):
+        journal_path = tmp_path / 'refunds.jsonl'
+        api.orders_v3.create_refund.side_effect = GatewayTimeoutError()
+        run(BulkRefundRunner(api, journal_path=journal_path), [1])
+
+        # Fails before submitting, so the last entry is failed
+        api.orders_v3.find_refund.side_effect = GatewayTimeoutError()
+        results = run(BulkRefundRunner(api, journal_path=journal_path), [1])
+        assert results[1].status == 'failed'
+
+        api.reset_mock()
+        api.orders_v3.find_refund.side_effect = None
+        api.orders_v3.find_refund.return_value = {'id': 123}
+        results = run(BulkRefundRunner(api, journal_path=journal_path), [1])
+
+        assert results[1].status == 'refunded'
+        api.orders_v3.create_refund.assert_not_called()
+
+    def test_resume_skips_refunded_orders(self, api, tmp_path):
+        journal_path = tmp_path / 'refunds.jsonl'
+
+        run(BulkRefundRunner(api, journal_path=journal_path), [1, 2])
+        api.reset_mock()
+        results = run(BulkRefundRunner(api, journal_path=journal_path), [1, 2, 3])
+
+        assert results[1] == RefundResult(1, 'skipped')
+        assert results[3].status == 'refunded'
+        api.orders_v3.create_refund.assert_called_once()
+
+        entries = [json.loads(line) for line in journal_path.read_text().splitlines()]
+        assert [entry['status'] for entry in entries if entry['order_id'] == 1] == [
+            'submitting',
+            'refunded',
+        ]
+
+    def test_resume_finds_interrupted_refund(self, api, tmp_path):
+        journal_path = tmp_path / 'refunds.jsonl'
+        journal_path.write_text(
+            json.dumps(
+                {
+                    'order_id': 1,
+                    'status': 'submitting',
+                    'at': '2024-01-01T00:00:00+00:00',
+                }
+            )
+            + '\n{"order_id": 2, "stat'
+        )
+        api.orders_v3.find_refund.return_value = {'id': 123}
+
+        results = run(BulkRefundRunner(api, journal_path=journal_path), [1])
+
+        assert results[1].status == 'refunded'
+        assert results[1].refund == {'id': 123}
+        api.orders_v3.get_refund_quote.assert_not_called()
+        api.orders_v3.create_refund.assert_not_called()
+
+
+class TestExportRefunds:
+    @pytest.fixture
+    def refunds_api(self):
+        api = MagicMock()
+
+        def all_refunds(params, **kwargs):
+            created_min = datetime.fromisoformat(params['created:min'])
+            return [
+                refund
+                for refund in REFUNDS
+                if created_min
+                <= refund['created_at']
+                <= datetime.fromisoformat(params['created:max'])
+            ]
+
+        api.orders_v3.all_refunds.side_effect = all_refunds
+        return api
+
+    def test_export_refunds(self, refunds_api):
+        index = RefundIndex()
+
+        refunds = list(
+            export_refunds(
+                refunds_api,
+                START,
+                START + timedelta(days=4),
+                window=timedelta(days=1),
+                index=index,
+            )
+        )
+
+        assert [refund['id'] for refund in refunds] == [1, 2, 3, 4]
+        assert refunds_api.orders_v3.all_refunds.call_count == 4
+        assert index.get_order_id(3) == 30
+
+    def test_index_falls_back_to_api(self):
+        orders_v3 = MagicMock()
+        orders_v3.get_refund.return_value = {'id': 5, 'order_id': 50}
+        index = RefundIndex(orders_v3)
+        index.add({'id': 1, 'order_id': 10})
+
+        assert index.get_refund(1) == {'id': 1, 'order_id': 10}
+        assert index.get_order_id(5) == 50
+        assert 5 in index
+        orders_v3.get_refund.assert_called_once_with(5)
+
+    def test_index_without_api(self):
+        with pytest.raises(DoesNotExistError):
+            RefundIndex().get_refund(1)
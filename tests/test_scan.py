@@ -0,0 +1,114 @@
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.exceptions import GatewayTimeoutError
+from bigc.scan import date_partitions, id_partitions, partitioned_scan, value_partitions
+
+RECORDS = [{'id': i, 'status_id': i % 3} for i in range(1, 101)]
+
+
+class FakeResource:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def all(self, *, params=None, timeout=None):
+        self.calls.append(params)
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            for record in RECORDS:
+                if params['min_id'] <= record['id'] <= params['max_id']:
+                    yield record
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_id_partitions():
+    assert id_partitions(1, 10, 3) == [
+        {'min_id': 1, 'max_id': 4},
+        {'min_id': 5, 'max_id': 8},
+        {'min_id': 9, 'max_id': 10},
+    ]
+    assert id_partitions(1, 2, 5, min_param='id:min', max_param='id:max') == [
+        {'id:min': 1, 'id:max': 1},
+        {'id:min': 2, 'id:max': 2},
+    ]
+
+
+def test_date_partitions():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 3, tzinfo=timezone.utc)
+
+    assert date_partitions(
+        start, end, 2, min_param='date_created:min', max_param='date_created:max'
+    ) == [
+        {
+            'date_created:min': '2024-01-01T00:00:00+00:00',
+            'date_created:max': '2024-01-01T23:59:59+00:00',
+        },
+        {
+            'date_created:min': '2024-01-02T00:00:00+00:00',
+            'date_created:max': '2024-01-03T00:00:00+00:00',
+        },
+    ]
+
+
+def test_value_partitions():
+    assert value_partitions('status_id', [1, 2]) == [{'status_id': 1}, {'status_id': 2}]
+
+
+class TestPartitionedScan:
+    def test_scan(self):
+        resource = FakeResource()
+
+        records = list(
+            partitioned_scan(
+                resource.all,
+                id_partitions(1, 100, 7),
+                params={'sort': 'id'},
+                timeout=5,
+            )
+        )
+
+        assert sorted(record['id'] for record in records) == list(range(1, 101))
+        assert len(resource.calls) == 7
+        assert resource.calls[0] == {'sort': 'id', 'min_id': 1, 'max_id': 15}
+
+    def test_concurrency_adapts_to_headroom(self):
+        resource = FakeResource(delay=0.02)
+        rate_limit = MagicMock(headroom=0.1)
+
+        records = list(
+            partitioned_scan(
+                resource.all,
+                id_partitions(1, 100, 6),
+                rate_limit=rate_limit,
+                max_workers=4,
+            )
+        )
+
+        assert len(records) == 100
+        assert resource.max_active == 1
+
+    def test_error_is_raised(self):
+        def all_records(params):
+            if params['min_id'] > 1:
+                raise GatewayTimeoutError()
+            return iter(RECORDS[:1])
+
+        with pytest.raises(GatewayTimeoutError):
+            list(partitioned_scan(all_records, id_partitions(1, 100, 4)))
+
+    def test_no_partitions(self):
+        assert list(partitioned_scan(FakeResource().all, [])) == []
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from bigc.utils import parse_rfc2822_date
+from bigc.utils import parse_rfc2822_date, parse_rfc2822_dates
 
 TZ_UTC = timezone.utc
 
@@ -43,3 +43,53 @@ class TestParseRfc2822Date:
     def test_parse_tz(self, test_input, expected):
         assert parse_rfc2822_date(test_input) == expected
         assert parse_rfc2822_date(test_input).tzinfo == TZ_UTC
+
+
+class TestParseRfc2822Dates:
+    def test_parse_many(self):
+        assert parse_rfc2822_dates(
+            [
+                'Tue, 20 Nov 2012 00:00:00 +0000',
+                'Sat, 01 Jan 2000 0:00:00 -0400',
+                'Tue, 20 Nov 2012 00:00:00 +0000',
+            ]
+        ) == [
+            datetime(2012, 11, 20, tzinfo=TZ_UTC),
+            datetime(2000, 1, 1, 4, tzinfo=TZ_UTC),
+            datetime(2012, 11, 20, tzinfo=TZ_UTC),
+        ]
+
+    def test_empty_values(self):
+        assert parse_rfc2822_dates(['', None]) == [None, None]
+
+    @pytest.mark.parametrize(
+        'test_input,expected',
+        [
+            # Falls back to email.utils for unusual formatting
+            ('1 Jan 1900 00:00 +0000', datetime(1900, 1, 1, tzinfo=TZ_UTC)),
+            ('Mon,  1 Jan 1900 00:00:00 GMT', datetime(1900, 1, 1, tzinfo=TZ_UTC)),
+            # ISO-8601, as used by v3 endpoints
+            ('2019-03-05T21:40:11Z', datetime(2019, 3, 5, 21, 40, 11, tzinfo=TZ_UTC)),
+            (
+                '2019-03-05T21:40:11+09:00',
+                datetime(2019, 3, 5, 12, 40, 11, tzinfo=TZ_UTC),
+            ),
+        ],
+    )
+    def test_fallback(self, test_input, expected):
+        assert parse_rfc2822_dates([test_input]) == [expected]
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_rfc2822_dates(['not a date'])
+
+    def test_as_numpy(self):
+        numpy = pytest.importorskip('numpy')
+
+        result = parse_rfc2822_dates(
+            ['Tue, 20 Nov 2012 00:00:00 +0000', ''], as_numpy=True
+        )
+
+        assert result.dtype == numpy.dtype('datetime64[s]')
+        assert result[0] == numpy.datetime64('2012-11-20T00:00:00')
+        assert numpy.isnat(result[1])
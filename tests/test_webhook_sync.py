@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.exceptions import InvalidDataError, TooManyRequestsError
+from bigc.webhook_sync import DesiredWebhook, plan_webhook_changes, sync_webhooks
+
+DESTINATION = 'https://example.com/webhooks'
+
+
+def make_webhook(webhook_id, scope, *, headers=None, is_active=True):
+    return {
+        'id': webhook_id,
+        'scope': scope,
+        'destination': DESTINATION,
+        'headers': headers,
+        'is_active': is_active,
+    }
+
+
+class TestPlanWebhookChanges:
+    def test_no_changes(self):
+        desired = [DesiredWebhook('store/order/*', DESTINATION)]
+        existing = [make_webhook(1, 'store/order/*')]
+
+        assert plan_webhook_changes(desired, existing) == []
+
+    def test_create_update_delete(self):
+        desired = [
+            DesiredWebhook('store/order/*', DESTINATION),
+            DesiredWebhook('store/product/*', DESTINATION, headers={'X-Secret': 's'}),
+        ]
+        existing = [
+            make_webhook(1, 'store/product/*'),
+            make_webhook(2, 'store/customer/*'),
+        ]
+
+        changes = plan_webhook_changes(desired, existing)
+
+        assert [(change.action, str(change)) for change in changes] == [
+            ('create', f'create store/order/* -> {DESTINATION}'),
+            ('update', f'update store/product/* -> {DESTINATION}'),
+            ('delete', f'delete store/customer/* -> {DESTINATION} (#2)'),
+        ]
+
+    def test_no_prune(self):
+        existing = [make_webhook(2, 'store/customer/*')]
+
+        assert plan_webhook_changes([], existing, prune=False) == []
+
+    def test_duplicates_keep_matching_webhook(self):
+        desired = [DesiredWebhook('store/order/*', DESTINATION)]
+        existing = [
+            make_webhook(1, 'store/order/*', is_active=False),
+            make_webhook(2, 'store/order/*'),
+        ]
+
+        changes = plan_webhook_changes(desired, existing)
+
+        assert [(change.action, change.existing['id']) for change in changes] == [
+            ('delete', 1)
+        ]
+
+
+class TestSyncWebhooks:
+    def test_applies_changes_per_store(self):
+        api_a, api_b = MagicMock(), MagicMock()
+        api_a.webhooks_v3.all.return_value = []
+        api_b.webhooks_v3.all.return_value = [make_webhook(1, 'store/order/*')]
+        desired = [DesiredWebhook('store/order/*', DESTINATION)]
+
+        results = sync_webhooks({'a': api_a, 'b': api_b}, desired)
+
+        api_a.webhooks_v3.create.assert_called_once_with(
+            {
+                'scope': 'store/order/*',
+                'destination': DESTINATION,
+                'headers': {},
+                'is_active': True,
+            }
+        )
+        api_b.webhooks_v3.create.assert_not_called()
+        assert results['a'].summary() == (
+            'a: 1 to create, 0 to update, 0 to delete; 1 applied, 0 failed'
+        )
+        assert results['b'].ok
+
+    def test_desired_by_store(self):
+        api_a, api_b = MagicMock(), MagicMock()
+        api_a.webhooks_v3.all.return_value = []
+        desired = {'a': [DesiredWebhook('store/order/*', DESTINATION)]}
+
+        with pytest.raises(ValueError, match='for b'):
+            sync_webhooks({'a': api_a, 'b': api_b}, desired)
+        api_b.webhooks_v3.all.assert_not_called()
+
+        results = sync_webhooks({'a': api_a}, desired)
+
+        assert len(results['a'].applied) == 1
+
+    def test_dry_run(self):
+        api = MagicMock()
+        api.webhooks_v3.all.return_value = [make_webhook(1, 'store/order/*')]
+
+        results = sync_webhooks({'a': api}, [], dry_run=True)
+
+        api.webhooks_v3.delete.assert_not_called()
+        assert results['a'].summary() == (
+            'a: 0 to create, 0 to update, 1 to delete (dry run)'
+        )
+
+    def test_errors_are_reported(self):
+        api = MagicMock()
+        api.webhooks_v3.all.return_value = []
+        api.webhooks_v3.create.side_effect = InvalidDataError()
+
+        results = sync_webhooks({'a': api}, [DesiredWebhook('bad', DESTINATION)])
+
+        assert not results['a'].ok
+        assert isinstance(results['a'].errors[0][1], InvalidDataError)
+
+    def test_waits_out_rate_limit(self):
+        api = MagicMock()
+        api.webhooks_v3.all.return_value = []
+        api.webhooks_v3.create.side_effect = [
+            TooManyRequestsError(
+                response=MagicMock(headers={'X-Rate-Limit-Time-Reset-Ms': '0'})
+            ),
+            None,
+        ]
+
+        results = sync_webhooks({'a': api}, [DesiredWebhook('store/*', DESTINATION)])
+
+        assert results['a'].ok
+        assert api.webhooks_v3.create.call_count == 2
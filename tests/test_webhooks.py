@@ -0,0 +1,165 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from bigc.webhooks import (
+    InvalidWebhookError,
+    WebhookDeduplicator,
+    WebhookEvent,
+    WebhookReceiver,
+    WebhookVerificationError,
+    coalesce_webhook_events,
+    fetch_webhook_entities,
+    parse_webhook_payload,
+)
+
+
+def make_payload(scope='store/order/created', entity_id=101, created_at=1561482670):
+    return json.dumps(
+        {
+            'scope': scope,
+            'store_id': 1025646,
+            'data': {'type': scope.split('/')[1], 'id': entity_id},
+            'hash': f'{scope}:{entity_id}:{created_at}',
+            'created_at': created_at,
+            'producer': 'stores/store_hash',
+        }
+    )
+
+
+class TestParseWebhookPayload:
+    def test_parse(self):
+        event = parse_webhook_payload(make_payload())
+
+        assert event.scope == 'store/order/created'
+        assert event.resource == 'order'
+        assert event.action == 'created'
+        assert event.entity_id == 101
+        assert event.store_id == '1025646'
+        assert event.created_at == 1561482670
+
+    @pytest.mark.parametrize(
+        'payload', ['not json', '[]', '{"scope": "store"}', '{"data": {}}']
+    )
+    def test_invalid(self, payload):
+        with pytest.raises(InvalidWebhookError):
+            parse_webhook_payload(payload)
+
+
+class TestWebhookDeduplicator:
+    def test_repeat_delivery(self):
+        deduplicator = WebhookDeduplicator()
+        event = parse_webhook_payload(make_payload())
+
+        assert not deduplicator.seen(event)
+        assert deduplicator.seen(event)
+
+        deduplicator.forget(event)
+        assert not deduplicator.seen(event)
+
+    def test_window_expiry(self):
+        deduplicator = WebhookDeduplicator(window=0)
+        event = parse_webhook_payload(make_payload())
+
+        assert not deduplicator.seen(event)
+        assert not deduplicator.seen(event)
+
+
+def test_coalesce_webhook_events():
+    events = [
+        WebhookEvent('store/product/updated', {'id': 1}, created_at=1),
+        WebhookEvent('store/product/updated', {'id': 2}, created_at=2),
+        WebhookEvent('store/product/updated', {'id': 1}, created_at=3),
+        WebhookEvent('store/product/deleted', {'id': 1}, created_at=4),
+    ]
+
+    assert coalesce_webhook_events(events) == [events[2], events[1], events[3]]
+
+
+class TestWebhookReceiver:
+    def test_batches_and_dedupes(self):
+        handler = MagicMock()
+        receiver = WebhookReceiver(handler, max_batch_size=2, max_batch_delay=60)
+
+        assert receiver.receive(make_payload(entity_id=1)) is not None
+        assert receiver.receive(make_payload(entity_id=1)) is None
+        handler.assert_not_called()
+
+        receiver.receive(make_payload(entity_id=2))
+        handler.assert_called_once()
+        assert [event.entity_id for event in handler.call_args.args[0]] == [1, 2]
+
+    def test_flush_if_due(self):
+        handler = MagicMock()
+        receiver = WebhookReceiver(handler, max_batch_delay=0)
+
+        receiver.receive(make_payload())
+
+        handler.assert_called_once()
+        assert receiver.flush_if_due() == []
+
+    def test_scope_filter(self):
+        receiver = WebhookReceiver(MagicMock(), scopes=['store/product/*'])
+
+        assert receiver.receive(make_payload('store/order/created')) is None
+        assert receiver.receive(make_payload('store/product/updated')) is not None
+
+    def test_verify_headers(self):
+        receiver = WebhookReceiver(
+            MagicMock(), expected_headers={'X-Webhook-Secret': 'secret'}
+        )
+
+        with pytest.raises(WebhookVerificationError):
+            receiver.receive(make_payload(), {'X-Webhook-Secret': 'wrong'})
+
+        assert receiver.receive(make_payload(), {'x-webhook-secret': 'secret'})
+
+    def test_failed_batch_is_buffered_again(self):
+        handler = MagicMock(side_effect=[RuntimeError, None])
+        receiver = WebhookReceiver(handler, max_batch_size=1, coalesce=False)
+
+        assert receiver.receive(make_payload(entity_id=1)) is not None
+        # Repeat deliveries of buffered events are still dropped
+        assert receiver.receive(make_payload(entity_id=1)) is None
+
+        receiver.receive(make_payload(entity_id=2))
+        assert handler.call_count == 2
+        assert [event.entity_id for event in handler.call_args.args[0]] == [1, 2]
+
+    def test_failed_batch_is_dead_lettered(self):
+        error = RuntimeError()
+        on_error = MagicMock()
+        receiver = WebhookReceiver(
+            MagicMock(side_effect=error), max_batch_size=1, on_error=on_error
+        )
+
+        event = receiver.receive(make_payload())
+
+        on_error.assert_called_once_with([event], error)
+        assert receiver.flush() == []
+
+
+def test_fetch_webhook_entities():
+    api = MagicMock()
+    api.products_v3.all.return_value = [{'id': 1}, {'id': 2}]
+    api.orders_v2.all.return_value = [{'id': 100}, {'id': 101}, {'id': 102}]
+
+    events = [
+        WebhookEvent('store/product/updated', {'id': 1}, created_at=1),
+        WebhookEvent('store/product/updated', {'id': 2}, created_at=1),
+        WebhookEvent('store/product/deleted', {'id': 3}, created_at=1),
+        WebhookEvent('store/order/created', {'id': 100}, created_at=1),
+        WebhookEvent('store/order/created', {'id': 102}, created_at=1),
+    ]
+
+    entities = fetch_webhook_entities(api, events)
+
+    api.products_v3.all.assert_called_once_with(params={'id:in': [1, 2]})
+    api.orders_v2.all.assert_called_once_with(params={'min_id': 100, 'max_id': 102})
+    assert entities.keys() == {
+        ('product', 1),
+        ('product', 2),
+        ('order', 100),
+        ('order', 102),
+    }